@@ -1,3 +1,4 @@
+import os
 import pathlib
 
 from dagster import DailyPartitionsDefinition
@@ -16,6 +17,12 @@ dlt_dir.mkdir(parents=True, exist_ok=True)
 DLT_STATE_LOCATION_ABS_PATH = str(dlt_dir.resolve())
 
 dbt_project_dir = pathlib.Path(__file__).absolute().parents[3] / "call_center"
+
+# Parquet dimension files read by the dbt `dimensions` source (see call_center/models/sources/sources.yml), which
+# takes their directory from the environment of the dbt parse and of every dbt command Dagster runs
+DIMENSIONS_DIR_ABS_PATH = str((dbt_project_dir / "seeds").resolve())
+os.environ.setdefault("MDS_DIMENSIONS_DIR", DIMENSIONS_DIR_ABS_PATH)
+
 dbt_project = DbtProject(project_dir=dbt_project_dir)
 dbt_project.prepare_if_dev()  # Had to put it here to make sure it wasn't refreshing/rebuilding dbt too often
 
@@ -23,6 +30,12 @@ INGEST_CALLS_ABS_PATH = str((warehouse_dir / "ingest_calls.duckdb").resolve())
 INGEST_CRM_ABS_PATH = str((warehouse_dir / "ingest_crm.duckdb").resolve())
 INGEST_SURVEYS_ABS_PATH = str((warehouse_dir / "ingest_surveys.duckdb").resolve())
 
+# Loader of each raw dataset: "dlt" (the dlt pipelines in loads.py) or "duckdb" (native DuckDB bulk loads in
+# bulk_loads.py), set per dataset in .env, e.g. MDS_INGEST_LOADER_CALLS=duckdb
+INGEST_LOADERS = {
+    dataset: os.environ.get(f"MDS_INGEST_LOADER_{dataset.upper()}", "dlt") for dataset in ("calls", "crm", "surveys")
+}
+
 WAREHOUSE_FILE_ABS_PATH = str((warehouse_dir / "warehouse_dev.duckdb").resolve())
 
 SOURCE_DATA_DIR_PATH = pathlib.Path(__file__).parents[3].resolve() / "data"
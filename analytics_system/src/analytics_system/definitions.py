@@ -2,19 +2,39 @@ import dagster as dg
 from dagster_dbt import DbtCliResource
 from dagster_dlt import DagsterDltResource
 
-from analytics_system.constants import dbt_project_dir
+from analytics_system.constants import INGEST_LOADERS, dbt_project_dir
 from analytics_system.defs.dbt_assets.assets import dbt_analytics, dbt_seeds
+from analytics_system.defs.filesystem_duckdb_ingest.bulk_loads import (
+    calls_bulk_ingestion,
+    crm_bulk_ingestion,
+    surveys_bulk_ingestion,
+)
 from analytics_system.defs.filesystem_duckdb_ingest.loads import calls_ingestion, crm_ingestion, surveys_ingestion
 
+# Both loaders of a dataset materialize the same asset key, so only the one picked in INGEST_LOADERS is defined
+INGESTION_ASSETS = {
+    "calls": {"dlt": calls_ingestion, "duckdb": calls_bulk_ingestion},
+    "crm": {"dlt": crm_ingestion, "duckdb": crm_bulk_ingestion},
+    "surveys": {"dlt": surveys_ingestion, "duckdb": surveys_bulk_ingestion},
+}
+
+
+def ingestion_assets() -> list[dg.AssetsDefinition]:
+    assets = []
+    for dataset, loader in INGEST_LOADERS.items():
+        loaders = INGESTION_ASSETS[dataset]
+        if loader not in loaders:
+            raise ValueError(f"Unknown ingestion loader {loader!r} for {dataset}; expected one of {sorted(loaders)}")
+        assets.append(loaders[loader])
+    return assets
+
 
 @dg.definitions
 def defs():
     return dg.Definitions(
         assets=[
-            # dlt assets
-            calls_ingestion,
-            crm_ingestion,
-            surveys_ingestion,
+            # ingestion assets (dlt or native DuckDB bulk loads)
+            *ingestion_assets(),
             # dbt assets
             dbt_analytics,
             dbt_seeds,
@@ -0,0 +1,249 @@
+"""Native DuckDB bulk loads of the parquet datasets, an alternative to the dlt ingestion assets in ``loads.py``.
+
+For local parquet into a local DuckDB, dlt's extract -> normalize -> load stages (with their job files under
+``.dlt``) cost more than the load itself. Here DuckDB reads the files directly, with one
+``INSERT INTO raw_<dataset>.<dataset> BY NAME SELECT ... FROM read_parquet([...])`` per run.
+
+The tables are the ones the dlt pipelines write, so the ``stg_*`` models and the asset keys are unchanged, and a
+dataset can be switched between the two loaders (see ``INGEST_LOADERS``) without reloading it:
+    * ``<dataset>`` gets the parquet columns plus ``_file_url`` (``SOURCE_FILE_COLUMN``) and ``_dlt_load_id``;
+    * ``_ingested_files`` (``MANIFEST_TABLE``) gets the same rows as with dlt, so each loader skips the files the
+      other one already loaded;
+    * ``_dlt_loads`` gets one row per load (status 0 = loaded), whose ``load_id`` and ``inserted_at`` are what the
+      staging models join and de-duplicate on.
+"""
+
+import hashlib
+import time
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from typing import Any
+
+import dagster as dg
+import dlt
+import duckdb
+import pyarrow.parquet as pq
+
+from analytics_system.constants import (
+    DAILY_PARTITION,
+    INGEST_CALLS_ABS_PATH,
+    INGEST_CRM_ABS_PATH,
+    INGEST_SURVEYS_ABS_PATH,
+)
+from analytics_system.defs.filesystem_duckdb_ingest.loads import (
+    MANIFEST_QUERY,
+    MANIFEST_TABLE,
+    SOURCE_FILE_COLUMN,
+    IngestPlan,
+    IngestReport,
+    ManifestEntry,
+    check_file_manifest,
+    footer_digest,
+    list_partition_files,
+    manifest_row,
+)
+
+# Columns of MANIFEST_TABLE as dlt creates them from the manifest rows of ``read_parquet_files``
+MANIFEST_COLUMNS = {
+    "file_url": "VARCHAR",
+    "partition_date": "VARCHAR",
+    "size_in_bytes": "BIGINT",
+    "modification_date": "TIMESTAMP WITH TIME ZONE",
+    "num_rows": "BIGINT",
+    "footer_digest": "VARCHAR",
+    "checksum": "VARCHAR",
+    "duplicate_of": "VARCHAR",
+    "_dlt_load_id": "VARCHAR",
+    "_dlt_id": "VARCHAR",
+}
+
+_DLT_LOADS_DDL = """
+CREATE TABLE IF NOT EXISTS {dataset}._dlt_loads (
+    load_id VARCHAR NOT NULL,
+    schema_name VARCHAR,
+    status BIGINT NOT NULL,
+    inserted_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    schema_version_hash VARCHAR
+)
+"""
+
+
+def _ensure_table(con: duckdb.DuckDBPyConnection, dataset: str, table: str, columns: dict[str, str]) -> None:
+    """Creates the table, or adds the columns it lacks (as dlt's schema evolution does)."""
+    column_defs = ", ".join(f'"{name}" {column_type}' for name, column_type in columns.items())
+    con.execute(f"CREATE TABLE IF NOT EXISTS {dataset}.{table} ({column_defs})")
+    for name, column_type in columns.items():
+        con.execute(f'ALTER TABLE {dataset}.{table} ADD COLUMN IF NOT EXISTS "{name}" {column_type}')
+
+
+def read_file_manifest(con: duckdb.DuckDBPyConnection, dataset: str) -> dict[str, ManifestEntry]:
+    """file_url -> manifest entry of every file already ingested (or skipped) into ``raw_<dataset>``."""
+    schema = f"raw_{dataset}"
+    tables = con.execute("SELECT table_name FROM information_schema.tables WHERE table_schema = ?", [schema])
+    check_file_manifest({name for (name,) in tables.fetchall()}, dataset)
+    try:
+        rows = con.execute(MANIFEST_QUERY.format(table=f"{schema}.{MANIFEST_TABLE}")).fetchall()
+    except duckdb.CatalogException:  # nothing loaded yet
+        return {}
+    return {file_url: ManifestEntry(*entry) for file_url, *entry in rows}
+
+
+def bulk_load_partitions(
+    database: str,
+    dataset: str,
+    start_date: str,
+    end_date: str,
+    skip_duplicate_files: bool = False,
+    report: IngestReport | None = None,
+) -> dict[str, Any]:
+    """Loads the parquet files of the day partitions from start_date to end_date that have not been loaded yet.
+
+    Files are selected as in ``parquet_files`` (see ``IngestPlan``): one listing for the whole window, the manifest's
+    path, size and mtime, and files rewritten in place or removed replacing the rows of their previous version;
+    ``skip_duplicate_files`` leaves out byte-identical copies of files already ingested. The deletes, the rows, the
+    manifest rows and the ``_dlt_loads`` row are committed in one transaction, so a failed load leaves the database
+    unchanged.
+
+    ``read_parquet`` runs with ``hive_partitioning=false``: DuckDB would otherwise add the ``day=`` directory as a
+    ``day`` column, which the dlt pipelines do not load. Its ``filename`` column is mapped to each file's file_url
+    for ``SOURCE_FILE_COLUMN``.
+
+    Files are only hashed when the plan needs their checksum (``IngestPlan.needs_checksum``), so their manifest rows
+    have none unless ``skip_duplicate_files`` is on: unlike the dlt loader, which hashes the bytes it reads anyway,
+    hashing here would read every file twice. A file loaded without one cannot
+    be recognised as the original of a later duplicate, and is replaced even if it is rewritten unchanged.
+
+    ``report`` gets each file's partition, size, rows and read time, and the seconds of the two stages: extract
+    (listing the files, then reading their footers and hashing those that need it) and load (the transaction).
+
+    Returns:
+        Dagster metadata for the load (``rows_loaded`` is the total over all the partitions).
+    """
+    schema = f"raw_{dataset}"
+    started = time.perf_counter()
+    with duckdb.connect(database) as con:
+        plan = IngestPlan.for_window(
+            read_file_manifest(con, dataset),
+            list_partition_files(dataset, start_date, end_date),
+            start_date,
+            end_date,
+            skip_duplicate_files,
+        )
+
+        load_files: dict[str, str] = {}  # path -> file_url
+        manifest_rows: list[dict[str, Any]] = []
+        rows_loaded = 0
+        for file in plan.files:
+            file_started = time.perf_counter()
+            # DuckDB reads the files itself, so hashing one is an extra full read: only done when the plan needs it
+            checksum = None
+            with file.path.open("rb") as f:
+                if plan.needs_checksum(file):
+                    checksum = hashlib.file_digest(f, "sha256").hexdigest()
+                    f.seek(0)
+                parquet_file = pq.ParquetFile(f)
+                footer, num_rows = footer_digest(parquet_file), parquet_file.metadata.num_rows
+            load, duplicate_of = plan.admit(file, footer, checksum)
+            if load:
+                load_files[str(file.path)] = file.file_url
+                rows_loaded += num_rows
+            elif duplicate_of is not None and report is not None:
+                report.skipped_duplicates.append({"file": file.file_url, "duplicate_of": duplicate_of})
+            if report is not None:
+                seconds = time.perf_counter() - file_started
+                report.add_file(file.partition_date, file.size_in_bytes, num_rows, seconds, loaded=load)
+            manifest_rows.append(manifest_row(file, num_rows, footer, checksum, duplicate_of))
+
+        metadata: dict[str, Any] = {"dataset_name": schema, "rows_loaded": rows_loaded, "files_loaded": len(load_files)}
+        load_started = time.perf_counter()
+        if report is not None:
+            report.stage_seconds["extract"] = load_started - started
+        if not manifest_rows and not plan.replaced:
+            return metadata
+
+        # same format as dlt load ids: the load's unix timestamp as a string
+        load_id = str(time.time())
+        con.begin()
+        try:
+            con.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+            con.execute(_DLT_LOADS_DDL.format(dataset=schema))
+            _ensure_table(con, schema, MANIFEST_TABLE, MANIFEST_COLUMNS)
+            if plan.replaced:
+                delete = f"DELETE FROM {schema}.{{table}} WHERE {{column}} IN (SELECT unnest(?))"
+                if con.execute(
+                    "SELECT count(*) FROM information_schema.tables WHERE table_schema = ? AND table_name = ?",
+                    [schema, dataset],
+                ).fetchone()[0]:
+                    con.execute(delete.format(table=dataset, column=SOURCE_FILE_COLUMN), [plan.replaced])
+                con.execute(delete.format(table=MANIFEST_TABLE, column="file_url"), [plan.replaced])
+            if load_files:
+                read_files = "read_parquet(?, hive_partitioning = false, union_by_name = true, filename = true)"
+                described = con.execute(f"DESCRIBE SELECT * EXCLUDE (filename) FROM {read_files}", [list(load_files)])
+                columns = {name: column_type for name, column_type, *_ in described.fetchall()}
+                _ensure_table(
+                    con, schema, dataset, {**columns, SOURCE_FILE_COLUMN: "VARCHAR", "_dlt_load_id": "VARCHAR"}
+                )
+                con.execute(
+                    f"INSERT INTO {schema}.{dataset} BY NAME "
+                    f"SELECT p.* EXCLUDE (filename), f.{SOURCE_FILE_COLUMN}, ? AS _dlt_load_id FROM {read_files} p "
+                    f"JOIN (SELECT unnest(?) AS filename, unnest(?) AS {SOURCE_FILE_COLUMN}) f USING (filename)",
+                    [load_id, list(load_files), list(load_files), list(load_files.values())],
+                )
+            con.executemany(
+                f"INSERT INTO {schema}.{MANIFEST_TABLE} ({', '.join(MANIFEST_COLUMNS)}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, gen_random_uuid()::VARCHAR)",
+                [(*row.values(), load_id) for row in manifest_rows],
+            )
+            con.execute(
+                f"INSERT INTO {schema}._dlt_loads VALUES (?, ?, 0, ?, NULL)",
+                [load_id, f"filesystem_{dataset}_source", datetime.now(UTC)],
+            )
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+    if report is not None:
+        report.stage_seconds["load"] = time.perf_counter() - load_started
+    return {**metadata, "load_id": load_id}
+
+
+def make_bulk_ingestion_asset(dataset: str, database: str) -> dg.AssetsDefinition:
+    """Partitioned asset bulk loading ``dataset``, under the key of the matching dlt asset in ``loads.py``."""
+
+    @dg.asset(
+        key=dg.AssetKey(f"dlt_filesystem_{dataset}_source_{dataset}"),
+        description=f"Raw {dataset} parquet files bulk loaded into DuckDB without dlt",
+        partitions_def=DAILY_PARTITION,
+        group_name="raw_ingestion",
+        pool=f"duckdb_ingest_{dataset}",  # shares the dlt asset's pool: both write the same DuckDB file
+        kinds={"duckdb"},
+    )
+    def _asset(context: dg.AssetExecutionContext) -> Iterator[dg.AssetMaterialization | dg.MaterializeResult]:
+        # the same switch as the dlt source's skip_duplicate_files argument
+        skip_duplicate_files = dlt.config.get(f"sources.filesystem_{dataset}_source.skip_duplicate_files", bool)
+        start, end = context.partition_key_range.start, context.partition_key_range.end
+        report = IngestReport()
+        metadata = bulk_load_partitions(
+            database,
+            dataset,
+            start_date=start,
+            end_date=end,
+            skip_duplicate_files=bool(skip_duplicate_files),
+            report=report,
+        )
+        # per-partition figures for range runs, as in loads._run_partitioned
+        if start != end:
+            for partition_key in context.partition_keys:
+                yield dg.AssetMaterialization(
+                    asset_key=context.asset_key,
+                    partition=partition_key,
+                    metadata=report.partition_metadata(partition_key),
+                )
+        yield dg.MaterializeResult(metadata={**metadata, **report.metadata()})
+
+    return _asset
+
+
+calls_bulk_ingestion = make_bulk_ingestion_asset("calls", INGEST_CALLS_ABS_PATH)
+crm_bulk_ingestion = make_bulk_ingestion_asset("crm", INGEST_CRM_ABS_PATH)
+surveys_bulk_ingestion = make_bulk_ingestion_asset("surveys", INGEST_SURVEYS_ABS_PATH)
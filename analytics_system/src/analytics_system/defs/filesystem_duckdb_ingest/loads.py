@@ -1,12 +1,23 @@
-from collections.abc import Callable, Generator
-from datetime import date, timedelta
-from typing import Any, cast
+import contextlib
+import hashlib
+import json
+import os
+import time
+from collections.abc import Callable, Collection, Generator, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import Any, NamedTuple
 
 import dlt
-from dagster import AssetExecutionContext, AssetMaterialization, MaterializeResult
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dagster import AssetExecutionContext, AssetMaterialization, MaterializeResult, MetadataValue
 from dagster_dlt import DagsterDltResource, dlt_assets
-from dlt.extract import DltResource
-from dlt.sources.filesystem import filesystem, read_parquet
+from dlt.common.schema.typing import TColumnSchema
+from dlt.common.typing import TDataItems
+from dlt.destinations.exceptions import DatabaseUndefinedRelation
+from dlt.pipeline.trace import PipelineTrace
 
 from analytics_system.constants import (
     DAILY_PARTITION,
@@ -20,28 +31,403 @@ from analytics_system.constants import (
 dlt.config["normalize.parquet_normalizer.add_dlt_load_id"] = True  # TODO: Figure out why this is needed vs. config.toml
 
 
-def parquet_day_partition(dataset: str, date_partition: str) -> DltResource:
-    """Returns a dlt resource that reads all parquet files for a single day partition.
+def partition_globs(start_date: str, end_date: str) -> list[str]:
+    """Globs for the parquet files of the ``day=`` partitions from start_date to end_date (inclusive).
 
-    Uses incremental loading by file_url (ascending) to make runs idempotent. This assumes
-    partitions are backfilled sequentially in chronological order — retroactive backfills on
-    already-processed date ranges will be skipped by the cursor state.
+    The window is split into the calendar years it covers whole and the months of the years it covers in part, and
+    each piece gets the longest ISO date prefix its bounds share (e.g. ``day=2024-12-*``, ``day=2025-*`` and
+    ``day=2026-01-*`` for 2024-12-20..2026-01-10). A single glob on the prefix the two bounds share would be
+    ``day=202*`` there, listing every partition of the decade. Dates between the bounds of a piece can still fall
+    outside the window (e.g. 2025-01-30 for 2025-01-05..2025-01-20), so ``partition_date`` filtering is still
+    required.
+    """
+    start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    pieces = []
+    while start <= end:
+        next_year = date(start.year + 1, 1, 1)
+        if start.month == start.day == 1 and next_year - timedelta(days=1) <= end:
+            piece_end = next_year - timedelta(days=1)
+        else:
+            next_month = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+            piece_end = min(next_month - timedelta(days=1), end)
+        pieces.append(os.path.commonprefix([start.isoformat(), piece_end.isoformat()]))
+        start = piece_end + timedelta(days=1)
+    return [f"day={prefix}*/*.parquet" for prefix in pieces]
+
+
+def partition_date(relative_path: str) -> str:
+    """Date of the ``day=YYYY-MM-DD`` hive partition a file path (relative to the dataset directory) belongs to."""
+    return relative_path.replace("\\", "/").split("/")[0].removeprefix("day=")
+
+
+class SourceFile(NamedTuple):
+    """A parquet file of a day partition, with the file_url and modification_date dlt's filesystem source gives it."""
+
+    path: Path
+    file_url: str
+    partition_date: str
+    size_in_bytes: int
+    modification_date: datetime
+
+
+def list_partition_files(dataset: str, start_date: str, end_date: str) -> list[SourceFile]:
+    """The parquet files of the day partitions from start_date to end_date.
+
+    The dataset directory is listed once per year or month of the window (see ``partition_globs``) rather than once
+    per day, so a range materialization skips most partitions outside the window without listing every day
+    separately; the ``day=`` directory name of each file does the rest.
 
     Path.as_uri() is used instead of a manual f"file://{path}" string to produce a valid
     RFC 8089 file URI on all platforms. On Windows, Path.resolve() returns backslash paths
     (e.g. C:\\Users\\...) which produce a malformed URI when interpolated directly; as_uri()
     normalizes to forward slashes and the correct file:///C:/... form.
     """
-    abs_path = (SOURCE_DATA_DIR_PATH / dataset / f"day={date_partition}").resolve()
-    fs = filesystem(
-        abs_path.as_uri(),
-        file_glob="*.parquet",
-        incremental=dlt.sources.incremental("file_url", row_order="asc"),
+    source_dir = (SOURCE_DATA_DIR_PATH / dataset).resolve()
+    files = []
+    paths = {path for pattern in partition_globs(start_date, end_date) for path in source_dir.glob(pattern)}
+    for path in sorted(paths):
+        day = partition_date(path.relative_to(source_dir).as_posix())
+        if start_date <= day <= end_date:
+            stat = path.stat()
+            modification_date = datetime.fromtimestamp(stat.st_mtime, tz=UTC)
+            files.append(SourceFile(path, path.as_uri(), day, stat.st_size, modification_date))
+    return files
+
+
+# Table (in each raw dataset) recording every file already loaded, loaded in the same dlt load as the file's rows
+MANIFEST_TABLE = "_ingested_files"
+
+# Column of the raw tables holding the file_url each row was loaded from, so that a file's rows can be replaced
+SOURCE_FILE_COLUMN = "_file_url"
+
+# Columns of MANIFEST_TABLE that dlt cannot infer from a load in which they are all None
+MANIFEST_COLUMN_HINTS: dict[str, TColumnSchema] = {
+    "checksum": {"data_type": "text"},
+    "duplicate_of": {"data_type": "text"},
+}
+
+# Load ids are unix timestamps, so the latest version of a file rewritten in place comes last
+MANIFEST_QUERY = (
+    "SELECT file_url, partition_date, size_in_bytes, modification_date, footer_digest, checksum, duplicate_of "
+    "FROM {table} ORDER BY _dlt_load_id"
+)
+
+
+class ManifestEntry(NamedTuple):
+    partition_date: str
+    size_in_bytes: int
+    modification_date: datetime
+    footer_digest: str
+    checksum: str | None  # None when the loader did not need it (see ``IngestPlan.needs_checksum``)
+    duplicate_of: str | None
+
+
+def file_version(size_in_bytes: int, modification_date: datetime) -> tuple[int, float]:
+    """What identifies one version of a file in the manifest, next to its path (mtime rounded to the millisecond)."""
+    return size_in_bytes, round(modification_date.timestamp(), 3)
+
+
+def check_file_manifest(table_names: Collection[str], dataset: str) -> None:
+    """Raises if ``raw_<dataset>`` was loaded by the cursor-based ingestion, which did not record its files.
+
+    Those loads have no ``MANIFEST_TABLE`` to tell which files they read (and their rows no ``SOURCE_FILE_COLUMN``
+    to replace them by), so every file would be loaded a second time on top of them.
+    """
+    if dataset in table_names and "_dlt_version" in table_names and MANIFEST_TABLE not in table_names:
+        raise RuntimeError(
+            f"raw_{dataset} was loaded before ingestion recorded its files in {MANIFEST_TABLE}; reset it with "
+            "'uv run mds reset warehouse' and 'uv run mds reset dlt', then load its partitions again"
+        )
+
+
+def load_file_manifest(dataset: str) -> dict[str, ManifestEntry]:
+    """file_url -> manifest entry of every file the running pipeline has already ingested (or skipped)."""
+    with dlt.current.pipeline().sql_client() as client:
+        tables = client.execute_sql(
+            "SELECT table_name FROM information_schema.tables WHERE table_schema = %s", client.dataset_name
+        )
+        check_file_manifest({name for (name,) in tables}, dataset)
+        try:
+            rows = client.execute_sql(MANIFEST_QUERY.format(table=client.make_qualified_table_name(MANIFEST_TABLE)))
+        except DatabaseUndefinedRelation:  # nothing loaded yet
+            return {}
+    return {file_url: ManifestEntry(*entry) for file_url, *entry in rows}
+
+
+def delete_file_rows(dataset: str, file_urls: list[str]) -> None:
+    """Deletes the rows and manifest entries the running pipeline loaded from ``file_urls``."""
+    with dlt.current.pipeline().sql_client() as client:
+        for table, column in ((dataset, SOURCE_FILE_COLUMN), (MANIFEST_TABLE, "file_url")):
+            # the data table is missing when every file loaded so far was a duplicate
+            with contextlib.suppress(DatabaseUndefinedRelation):
+                client.execute_sql(
+                    f"DELETE FROM {client.make_qualified_table_name(table)} WHERE {column} IN (SELECT unnest(%s))",
+                    file_urls,
+                )
+
+
+def footer_digest(parquet_file: pq.ParquetFile) -> str:
+    """Hash of a parquet file's footer: schema, row count, row groups and column chunk statistics."""
+    footer = json.dumps(parquet_file.metadata.to_dict(), sort_keys=True, default=str)
+    return hashlib.sha256(footer.encode()).hexdigest()
+
+
+class DuplicateFileIndex:
+    """Content fingerprints (footer digest + sha256 of the bytes) of the files ingested so far, by file_url.
+
+    A file whose fingerprint matches one under a different path is a byte-identical copy, e.g. a re-delivery or the
+    renamed ``_dup`` copies made by ``mds/cli.py:inject_duplicate_parquets``. A file rewritten at its own path is
+    not matched here: ``IngestPlan.admit`` compares it with its manifest entry first.
+    """
+
+    def __init__(self, manifest: dict[str, ManifestEntry]) -> None:
+        self._file_urls: dict[tuple[str, str], str] = {}
+        for file_url, entry in manifest.items():
+            if entry.checksum is not None:
+                self._file_urls.setdefault((entry.footer_digest, entry.checksum), file_url)
+
+    def duplicate_of(self, file_url: str, footer: str, checksum: str) -> str | None:
+        """file_url of an ingested file with the same content, or None (recording this file as ingested)."""
+        original = self._file_urls.setdefault((footer, checksum), file_url)
+        return original if original != file_url else None
+
+
+@dataclass
+class IngestPlan:
+    """Which files of a window an ingestion run reads, and which earlier loads it replaces.
+
+    A listed file is read unless the manifest has its path with the same size and mtime. Files rewritten in place
+    keep their path (a regenerated dataset, ``mds compact``): one whose content is unchanged is not loaded again,
+    only its manifest row is refreshed, while a changed one replaces the rows of its previous version. Manifest
+    entries of the window whose file is gone (e.g. the parts ``mds compact`` merged into ``part-0000``, or the
+    ``duckdb-sink:`` entries of days written by ``mds/data_generation/duckdb_sink.py``) lose their rows as well.
+    """
+
+    manifest: dict[str, ManifestEntry]
+    files: list[SourceFile]
+    replaced: list[str]
+    duplicates: DuplicateFileIndex | None = None
+
+    @classmethod
+    def for_window(
+        cls,
+        manifest: dict[str, ManifestEntry],
+        listed: list[SourceFile],
+        start_date: str,
+        end_date: str,
+        skip_duplicate_files: bool = False,
+    ) -> "IngestPlan":
+        listed_urls = {file.file_url for file in listed}
+        vanished = [
+            file_url
+            for file_url, entry in manifest.items()
+            if start_date <= entry.partition_date <= end_date and file_url not in listed_urls
+        ]
+        files = [
+            file
+            for file in listed
+            if (entry := manifest.get(file.file_url)) is None
+            or file_version(entry.size_in_bytes, entry.modification_date)
+            != file_version(file.size_in_bytes, file.modification_date)
+        ]
+        duplicates = None
+        if skip_duplicate_files:
+            # only files whose rows are loaded and stay loaded can be the original of a duplicate
+            changing = set(vanished) | {file.file_url for file in files}
+            duplicates = DuplicateFileIndex({
+                file_url: entry
+                for file_url, entry in manifest.items()
+                if entry.duplicate_of is None and file_url not in changing
+            })
+        return cls(manifest, files, vanished, duplicates)
+
+    def needs_checksum(self, file: SourceFile) -> bool:
+        """Whether ``admit`` needs a file's checksum: to find duplicates, or to compare it with its last version."""
+        previous = self.manifest.get(file.file_url)
+        return self.duplicates is not None or (previous is not None and previous.checksum is not None)
+
+    def admit(self, file: SourceFile, footer: str, checksum: str | None) -> tuple[bool, str | None]:
+        """Whether to load a file's rows, and the ``duplicate_of`` of its manifest row.
+
+        A file rewritten with the same content as its manifest entry is not loaded again (with or without duplicate
+        skipping): its manifest row is refreshed with the entry's ``duplicate_of``.
+        """
+        previous = self.manifest.get(file.file_url)
+        if (
+            previous is not None
+            and checksum is not None
+            and (previous.footer_digest, previous.checksum) == (footer, checksum)
+        ):
+            if self.duplicates is not None and previous.duplicate_of is None:
+                self.duplicates.duplicate_of(file.file_url, footer, checksum)
+            return False, previous.duplicate_of
+        if previous is not None:
+            self.replaced.append(file.file_url)
+        duplicate_of = (
+            self.duplicates.duplicate_of(file.file_url, footer, checksum)
+            if self.duplicates is not None and checksum is not None
+            else None
+        )
+        return duplicate_of is None, duplicate_of
+
+
+def manifest_row(
+    file: SourceFile, num_rows: int, footer: str, checksum: str | None, duplicate_of: str | None
+) -> dict[str, Any]:
+    return {
+        "file_url": file.file_url,
+        "partition_date": file.partition_date,
+        "size_in_bytes": file.size_in_bytes,
+        "modification_date": file.modification_date,
+        "num_rows": num_rows,
+        "footer_digest": footer,
+        "checksum": checksum,
+        "duplicate_of": duplicate_of,
+    }
+
+
+# Stages of an ingestion run, timed for the Dagster materialization metadata
+INGEST_STAGES = ("extract", "normalize", "load")
+
+
+def stage_seconds(trace: PipelineTrace) -> dict[str, float]:
+    """Seconds spent in each stage of a dlt pipeline run."""
+    return {
+        step.step: (step.finished_at - step.started_at).total_seconds()
+        for step in trace.steps
+        if step.step in INGEST_STAGES and step.finished_at is not None
+    }
+
+
+@dataclass
+class PartitionStats:
+    """What an ingestion run read from one day partition."""
+
+    rows: int = 0
+    files: int = 0
+    bytes_read: int = 0
+    extract_seconds: float = 0.0
+
+
+@dataclass
+class IngestReport:
+    """What an ingestion run loaded and skipped, for the Dagster materialization metadata.
+
+    ``partitions`` is filled file by file as the files are read, extract time included. The other stages process
+    the whole run at once, so the run's ``stage_seconds`` are shared among the partitions by their rows.
+    """
+
+    skipped_duplicates: list[dict[str, str]] = field(default_factory=list)
+    partitions: dict[str, PartitionStats] = field(default_factory=dict)
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+
+    def add_file(self, partition: str, size_in_bytes: int, num_rows: int, seconds: float, loaded: bool) -> None:
+        """Records a file read during extract (``loaded`` is False for a duplicate or a file rewritten unchanged)."""
+        stats = self.partitions.setdefault(partition, PartitionStats())
+        stats.bytes_read += size_in_bytes
+        stats.extract_seconds += seconds
+        if loaded:
+            stats.rows += num_rows
+            stats.files += 1
+
+    def partition_metadata(self, partition: str) -> dict[str, Any]:
+        """Rows, files, bytes read and seconds per stage of one day partition."""
+        stats = self.partitions.get(partition, PartitionStats())
+        total_rows = sum(p.rows for p in self.partitions.values())
+        share = stats.rows / total_rows if total_rows else 0.0
+        seconds = {
+            stage: stats.extract_seconds if stage == "extract" else self.stage_seconds[stage] * share
+            for stage in INGEST_STAGES
+            if stage in self.stage_seconds
+        }
+        return {
+            "rows": stats.rows,
+            "files": stats.files,
+            "bytes_read": stats.bytes_read,
+            **{f"{stage}_seconds": round(value, 3) for stage, value in seconds.items()},
+            "rows_per_sec": round(stats.rows / sum(seconds.values()), 1) if sum(seconds.values()) else 0.0,
+        }
+
+    def metadata(self) -> dict[str, Any]:
+        rows, seconds = sum(p.rows for p in self.partitions.values()), sum(self.stage_seconds.values())
+        return {
+            "duplicate_files_skipped": len(self.skipped_duplicates),
+            "duplicate_files": MetadataValue.json(self.skipped_duplicates),
+            "files_loaded": sum(p.files for p in self.partitions.values()),
+            "bytes_read": sum(p.bytes_read for p in self.partitions.values()),
+            **{f"{stage}_seconds": round(value, 3) for stage, value in self.stage_seconds.items()},
+            "rows_per_sec": round(rows / seconds, 1) if seconds else 0.0,
+            "partitions": MetadataValue.json({p: self.partition_metadata(p) for p in sorted(self.partitions)}),
+        }
+
+
+def read_parquet_files(plan: IngestPlan, report: IngestReport | None = None) -> Iterator[TDataItems]:
+    """Reads each file of the plan as arrow record batches, then records it in the manifest table.
+
+    Each batch gets the file's file_url in ``SOURCE_FILE_COLUMN``. The manifest row goes to ``MANIFEST_TABLE``
+    through the same resource, so it is part of the same load package as the file's rows: a file only counts as
+    ingested once its rows are. A file the plan does not load (unchanged, or a duplicate) has none of its
+    batches read, and only its manifest row is loaded. Each file is read into memory once, for both its checksum
+    and its batches.
+
+    Each file's extract time (reading it and extracting its batches) is recorded in ``report`` under its partition.
+    """
+    manifest_hints = dlt.mark.make_hints(table_name=MANIFEST_TABLE, columns=MANIFEST_COLUMN_HINTS)
+    for file in plan.files:
+        started = time.perf_counter()
+        data = file.path.read_bytes()
+        checksum = hashlib.sha256(data).hexdigest()
+        parquet_file = pq.ParquetFile(pa.BufferReader(data))
+        footer = footer_digest(parquet_file)
+        load, duplicate_of = plan.admit(file, footer, checksum)
+        if load:
+            for batch in parquet_file.iter_batches():
+                yield batch.append_column(SOURCE_FILE_COLUMN, pa.array([file.file_url] * batch.num_rows))
+        elif duplicate_of is not None and report is not None:
+            report.skipped_duplicates.append({"file": file.file_url, "duplicate_of": duplicate_of})
+        num_rows = parquet_file.metadata.num_rows
+        if report is not None:
+            report.add_file(file.partition_date, file.size_in_bytes, num_rows, time.perf_counter() - started, load)
+        yield dlt.mark.with_hints(
+            manifest_row(file, num_rows, footer, checksum, duplicate_of), manifest_hints, create_table_variant=True
+        )
+
+
+def parquet_files(
+    dataset: str,
+    start_date: str,
+    end_date: str,
+    skip_duplicate_files: bool = False,
+    report: IngestReport | None = None,
+) -> Iterator[TDataItems]:
+    """Reads the parquet files of the day partitions from start_date to end_date that have not been loaded yet.
+
+    Idempotency comes from the file manifest (``MANIFEST_TABLE``) rather than a cursor (see ``IngestPlan``), so
+    partitions can be loaded in any order (retroactive backfills included) and by separate runs. Runs of the same
+    dataset share one DuckDB file (a single writer) and one dlt working directory, so each ingestion asset has its
+    own pool (``duckdb_ingest_<dataset>``, held to 1 by the instance's default pool limit): a backfill fans out
+    across run workers, and loads of the same dataset queue instead of failing on the lock.
+
+    ``skip_duplicate_files`` also skips new files whose content is identical to a file already ingested under
+    another path (see ``DuplicateFileIndex``), reporting each one in ``report``. It is off by default because the
+    Module 5 assignment relies on duplicate files reaching the raw tables.
+
+    Once every file has been read, the rows and manifest entries of the files the plan replaces are deleted, ahead of
+    the load: if it fails, those files are missing from the manifest and the next run loads them again.
+
+    A plain generator rather than a dlt resource: the source's resource yields from it, and dlt keeps the
+    ``MANIFEST_TABLE`` mark of the manifest rows only on items a resource yields itself.
+    """
+    plan = IngestPlan.for_window(
+        load_file_manifest(dataset),
+        list_partition_files(dataset, start_date, end_date),
+        start_date,
+        end_date,
+        skip_duplicate_files,
     )
-    # dlt supports piping filesystem() into read_parquet() via __or__, but the return type
-    # is not reflected in dlt's stubs — cast makes the intent explicit without suppressing
-    # unrelated type errors on the same line.
-    return cast(DltResource, fs | read_parquet(use_pyarrow=True))
+    yield from read_parquet_files(plan, report)
+    if plan.replaced:
+        delete_file_rows(dataset, plan.replaced)
 
 
 def date_range_list(start_date: str, end_date: str) -> list[str]:
@@ -58,17 +444,31 @@ def make_filesystem_source(dataset: str) -> Callable[..., Any]:
     """
 
     @dlt.source(name=f"filesystem_{dataset}_source")
-    def _source(date_partition: str | list[str] | None = None):
+    def _source(
+        date_partition: str | list[str] | None = None,
+        skip_duplicate_files: bool = False,
+        report: IngestReport | None = None,
+    ):
+        """``skip_duplicate_files`` can be turned on in dlt config, e.g. for calls in ``.dlt/config.toml``::
+
+        [sources.filesystem_calls_source]
+        skip_duplicate_files = true
+        """
+
         @dlt.resource(name=dataset)
         def _resource():
             # Called with no arguments by @dlt_assets at definition time for schema introspection.
             if date_partition is None:
                 return
-            if isinstance(date_partition, str):
-                yield from parquet_day_partition(dataset=dataset, date_partition=date_partition)
-            else:
-                for d in date_partition:
-                    yield from parquet_day_partition(dataset=dataset, date_partition=d)
+            # partition key ranges are contiguous, so the first and last dates bound the whole range
+            dates = [date_partition] if isinstance(date_partition, str) else date_partition
+            yield from parquet_files(
+                dataset=dataset,
+                start_date=min(dates),
+                end_date=max(dates),
+                skip_duplicate_files=skip_duplicate_files,
+                report=report,
+            )
 
         return _resource
 
@@ -80,71 +480,97 @@ filesystem_crm_source = make_filesystem_source("crm")
 filesystem_surveys_source = make_filesystem_source("surveys")
 
 
+def make_pipeline(dataset: str, database: str) -> dlt.Pipeline:
+    return dlt.pipeline(
+        pipeline_name=f"filesystem_{dataset}_source",  # Must match the dlt.source name to avoid state key mismatches
+        pipelines_dir=DLT_STATE_LOCATION_ABS_PATH,
+        dataset_name=f"raw_{dataset}",
+        destination=dlt.destinations.duckdb(database),
+    )
+
+
+calls_pipeline = make_pipeline("calls", INGEST_CALLS_ABS_PATH)
+crm_pipeline = make_pipeline("crm", INGEST_CRM_ABS_PATH)
+surveys_pipeline = make_pipeline("surveys", INGEST_SURVEYS_ABS_PATH)
+
+
 def _run_partitioned(
     context: AssetExecutionContext,
     dlt_resource: DagsterDltResource,
     source_fn: Callable,
+    pipeline: dlt.Pipeline,
 ) -> Generator[AssetMaterialization | MaterializeResult]:
     """Runs a partitioned dlt source, handling both single-partition and range materializations.
 
-    For individual partition runs (the normal backfill case), ``rows_loaded`` in the Dagster
-    metadata accurately reflects that partition's row count. For range materializations (multiple
-    partitions selected at once in the UI), all dates are batched into a single dlt pipeline run,
-    so ``rows_loaded`` is the aggregate total across the entire range — not broken down per date.
+    All dates are read by a single listing of the dataset directory (see ``parquet_files``) in a single dlt pipeline
+    run. The materialization metadata has the run's totals (``rows_loaded``, files and bytes read, seconds per dlt
+    stage, rows/sec) and, under ``partitions``, the same figures for each day (see ``IngestReport``). For range
+    materializations (multiple partitions selected at once in the UI), each partition key also gets its own
+    ``AssetMaterialization`` with its day's figures, so slow days show up in each partition's history.
+
+    Files skipped as duplicates (see ``parquet_files``) are listed in the metadata as well.
     """
     start, end = context.partition_key_range.start, context.partition_key_range.end
     date_partition = context.partition_key if start == end else date_range_list(start, end)
-    yield from dlt_resource.run(context=context, dlt_source=source_fn(date_partition=date_partition))
+    report = IngestReport()
+    for result in dlt_resource.run(
+        context=context, dlt_source=source_fn(date_partition=date_partition, report=report), dlt_pipeline=pipeline
+    ):
+        if isinstance(result, MaterializeResult):
+            report.stage_seconds = stage_seconds(pipeline.last_trace)
+            if start != end:
+                for partition_key in context.partition_keys:
+                    yield AssetMaterialization(
+                        asset_key=result.asset_key,
+                        partition=partition_key,
+                        metadata=report.partition_metadata(partition_key),
+                    )
+            result = MaterializeResult(
+                asset_key=result.asset_key,
+                metadata={**(result.metadata or {}), **report.metadata()},
+                check_results=result.check_results,
+                data_version=result.data_version,
+                tags=result.tags,
+            )
+        yield result
 
 
 @dlt_assets(
     dlt_source=filesystem_calls_source(),
     name="calls_ingestion_assets",
-    dlt_pipeline=dlt.pipeline(
-        pipeline_name="filesystem_calls_source",  # Must match the dlt.source name to avoid state key mismatches
-        pipelines_dir=DLT_STATE_LOCATION_ABS_PATH,
-        dataset_name="raw_calls",
-        destination=dlt.destinations.duckdb(INGEST_CALLS_ABS_PATH),
-    ),
+    dlt_pipeline=calls_pipeline,
     partitions_def=DAILY_PARTITION,
     group_name="raw_ingestion",
+    pool="duckdb_ingest_calls",
 )
 def calls_ingestion(context: AssetExecutionContext, dlt: DagsterDltResource):
     # Parameter named 'dlt' to match the Dagster resource key — shadowing of the dlt module is
     # intentional here; the module is not referenced inside this function body.
-    yield from _run_partitioned(context, dlt, filesystem_calls_source)
+    yield from _run_partitioned(context, dlt, filesystem_calls_source, calls_pipeline)
 
 
 @dlt_assets(
     dlt_source=filesystem_crm_source(),
     name="crm_ingestion_assets",
-    dlt_pipeline=dlt.pipeline(
-        pipeline_name="filesystem_crm_source",  # Must match the dlt.source name to avoid state key mismatches
-        pipelines_dir=DLT_STATE_LOCATION_ABS_PATH,
-        dataset_name="raw_crm",
-        destination=dlt.destinations.duckdb(INGEST_CRM_ABS_PATH),
-    ),
+    dlt_pipeline=crm_pipeline,
     partitions_def=DAILY_PARTITION,
     group_name="raw_ingestion",
+    pool="duckdb_ingest_crm",
 )
 def crm_ingestion(context: AssetExecutionContext, dlt: DagsterDltResource):
-    yield from _run_partitioned(context, dlt, filesystem_crm_source)
+    yield from _run_partitioned(context, dlt, filesystem_crm_source, crm_pipeline)
 
 
 @dlt_assets(
     dlt_source=filesystem_surveys_source(),
     name="survey_ingestion_assets",
-    dlt_pipeline=dlt.pipeline(
-        pipeline_name="filesystem_surveys_source",  # Must match the dlt.source name to avoid state key mismatches
-        pipelines_dir=DLT_STATE_LOCATION_ABS_PATH,
-        dataset_name="raw_surveys",
-        destination=dlt.destinations.duckdb(INGEST_SURVEYS_ABS_PATH),
-    ),
+    dlt_pipeline=surveys_pipeline,
     partitions_def=DAILY_PARTITION,
     group_name="raw_ingestion",
+    pool="duckdb_ingest_surveys",
 )
 def surveys_ingestion(context: AssetExecutionContext, dlt: DagsterDltResource):
-    yield from _run_partitioned(context, dlt, filesystem_surveys_source)
+    yield from _run_partitioned(context, dlt, filesystem_surveys_source, surveys_pipeline)
 
 
 # Asset key convention: "dlt_<source_name>_<resource_name>"
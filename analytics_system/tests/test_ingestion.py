@@ -0,0 +1,235 @@
+import os
+import shutil
+
+import dlt
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from analytics_system.defs.filesystem_duckdb_ingest import loads
+from analytics_system.defs.filesystem_duckdb_ingest.bulk_loads import bulk_load_partitions
+
+LOADERS = ["dlt", "duckdb"]
+
+
+@pytest.fixture
+def source_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(loads, "SOURCE_DATA_DIR_PATH", tmp_path / "data")
+    return tmp_path / "data" / "calls"
+
+
+@pytest.fixture
+def database(tmp_path):
+    return tmp_path / "ingest_calls.duckdb"
+
+
+def _write_part(source_dir, day, part, call_ids, mtime_offset=0):
+    path = source_dir / f"day={day}" / f"part-{part:04d}-calls.parquet"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(pa.table({"call_id": pa.array(call_ids, pa.int64())}), path)
+    if mtime_offset:
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + mtime_offset))
+    return path
+
+
+def _ingest(loader, database, start_date, end_date, **kwargs):
+    if loader == "dlt":
+        pipeline = dlt.pipeline(
+            pipeline_name="filesystem_calls_source",
+            pipelines_dir=str(database.parent / "dlt"),
+            dataset_name="raw_calls",
+            destination=dlt.destinations.duckdb(str(database)),
+        )
+        source = loads.filesystem_calls_source(date_partition=loads.date_range_list(start_date, end_date), **kwargs)
+        pipeline.run(source)
+    else:
+        bulk_load_partitions(str(database), "calls", start_date, end_date, **kwargs)
+
+
+def _call_ids(database):
+    with duckdb.connect(str(database)) as con:
+        return sorted(call_id for (call_id,) in con.sql("SELECT call_id FROM raw_calls.calls").fetchall())
+
+
+def _manifest(database):
+    with duckdb.connect(str(database)) as con:
+        return con.sql("SELECT file_url, duplicate_of FROM raw_calls._ingested_files ORDER BY _dlt_load_id").fetchall()
+
+
+@pytest.mark.parametrize("loader", LOADERS)
+def test_loaded_files_are_not_loaded_again(loader, source_dir, database):
+    _write_part(source_dir, "2025-01-01", 0, [1, 2])
+    _write_part(source_dir, "2025-01-02", 0, [3])
+    _ingest(loader, database, "2025-01-01", "2025-01-02")
+    _ingest(loader, database, "2025-01-01", "2025-01-02")
+
+    assert _call_ids(database) == [1, 2, 3]
+    assert len(_manifest(database)) == 2
+
+
+@pytest.mark.parametrize(("loader", "skip_duplicate_files"), [("dlt", False), ("dlt", True), ("duckdb", True)])
+def test_regenerated_identical_file_only_refreshes_its_manifest_row(loader, skip_duplicate_files, source_dir, database):
+    _write_part(source_dir, "2025-01-01", 0, [1, 2])
+    _ingest(loader, database, "2025-01-01", "2025-01-01", skip_duplicate_files=skip_duplicate_files)
+    # `mds reset source-data` then generate: same path and content, new mtime
+    path = _write_part(source_dir, "2025-01-01", 0, [1, 2], mtime_offset=10)
+    _ingest(loader, database, "2025-01-01", "2025-01-01", skip_duplicate_files=skip_duplicate_files)
+
+    assert _call_ids(database) == [1, 2]
+    assert _manifest(database) == [(path.as_uri(), None)] * 2
+    with duckdb.connect(str(database)) as con:
+        first_load = con.sql("SELECT min(load_id) FROM raw_calls._dlt_loads").fetchone()[0]
+        assert con.sql("SELECT DISTINCT _dlt_load_id FROM raw_calls.calls").fetchall() == [(first_load,)]
+
+
+@pytest.mark.parametrize("loader", LOADERS)
+def test_compacted_partition_replaces_the_rows_of_its_parts(loader, source_dir, database):
+    _write_part(source_dir, "2025-01-01", 0, [1, 2])
+    part_1 = _write_part(source_dir, "2025-01-01", 1, [3])
+    _write_part(source_dir, "2025-01-02", 0, [4])
+    _ingest(loader, database, "2025-01-01", "2025-01-02")
+    # `mds compact`: the parts are merged into part-0000 and removed
+    merged = _write_part(source_dir, "2025-01-01", 0, [1, 2, 3], mtime_offset=10)
+    part_1.unlink()
+    _ingest(loader, database, "2025-01-01", "2025-01-01")
+
+    assert _call_ids(database) == [1, 2, 3, 4]
+    assert merged.as_uri() in {file_url for file_url, _ in _manifest(database)}
+    assert part_1.as_uri() not in {file_url for file_url, _ in _manifest(database)}
+    with duckdb.connect(str(database)) as con:
+        rows_by_file = dict(con.sql("SELECT _file_url, count(*) FROM raw_calls.calls GROUP BY ALL").fetchall())
+    assert rows_by_file[merged.as_uri()] == 3
+
+
+@pytest.mark.parametrize("loader", LOADERS)
+def test_partitions_outside_the_window_are_left_for_later_runs(loader, source_dir, database):
+    # the glob for 2025-01-05..2025-01-20 (day=2025-01-*) also lists 2025-01-21 and 2025-01-30
+    for call_id, day in enumerate(["2025-01-04", "2025-01-05", "2025-01-20", "2025-01-21", "2025-01-30"]):
+        _write_part(source_dir, day, 0, [call_id])
+    _ingest(loader, database, "2025-01-05", "2025-01-20")
+    assert _call_ids(database) == [1, 2]
+
+    _ingest(loader, database, "2025-01-21", "2025-01-29")
+    _ingest(loader, database, "2025-01-01", "2025-01-04")
+    assert _call_ids(database) == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize(
+    ("start_date", "end_date", "globs"),
+    [
+        ("2025-01-05", "2025-01-20", ["day=2025-01-*/*.parquet"]),
+        ("2025-01-01", "2025-01-01", ["day=2025-01-01*/*.parquet"]),
+        ("2019-12-31", "2020-01-01", ["day=2019-12-31*/*.parquet", "day=2020-01-01*/*.parquet"]),
+        (
+            "2024-12-20",
+            "2026-01-10",
+            ["day=2024-12-*/*.parquet", "day=2025-*/*.parquet", "day=2026-01-*/*.parquet"],
+        ),
+    ],
+)
+def test_partition_globs_follow_the_months_and_years_of_the_window(start_date, end_date, globs):
+    assert loads.partition_globs(start_date, end_date) == globs
+
+
+@pytest.mark.parametrize("loader", LOADERS)
+def test_window_crossing_a_decade_lists_only_its_partitions(loader, source_dir, database, monkeypatch):
+    for call_id, day in enumerate(["2019-11-30", "2019-12-30", "2020-01-02", "2020-02-01", "2021-01-01"]):
+        _write_part(source_dir, day, 0, [call_id])
+    listed = []
+    glob = loads.Path.glob
+
+    def recording_glob(self, pattern):
+        paths = list(glob(self, pattern))
+        listed.extend(path.parent.name for path in paths)
+        return paths
+
+    monkeypatch.setattr(loads.Path, "glob", recording_glob)
+    _ingest(loader, database, "2019-12-15", "2020-01-15")
+
+    assert _call_ids(database) == [1, 2]
+    # the bounds only share "20": a single glob would list every partition of the decade
+    assert sorted(listed) == ["day=2019-12-30", "day=2020-01-02"]
+
+
+def test_loaders_share_the_manifest(source_dir, database):
+    _write_part(source_dir, "2025-01-01", 0, [1, 2])
+    _ingest("dlt", database, "2025-01-01", "2025-01-01")
+    _write_part(source_dir, "2025-01-02", 0, [3])
+    _ingest("duckdb", database, "2025-01-01", "2025-01-02")
+
+    assert _call_ids(database) == [1, 2, 3]
+    with duckdb.connect(str(database)) as con:
+        assert con.sql("SELECT count(*) FROM raw_calls._dlt_loads").fetchone()[0] == 2
+
+
+@pytest.mark.parametrize("loader", LOADERS)
+def test_parquet_rows_replace_the_rows_of_a_duckdb_sink_run(loader, source_dir, database):
+    # what mds/data_generation/duckdb_sink.py writes for a run that simulated 2025-01-01 and 2025-01-02
+    with duckdb.connect(str(database)) as con:
+        con.execute("CREATE SCHEMA raw_calls")
+        con.execute("CREATE TABLE raw_calls.calls (call_id BIGINT, _file_url VARCHAR, _dlt_load_id VARCHAR)")
+        con.execute(
+            "CREATE TABLE raw_calls._ingested_files (file_url VARCHAR, partition_date VARCHAR, size_in_bytes BIGINT, "
+            "modification_date TIMESTAMP WITH TIME ZONE, num_rows BIGINT, footer_digest VARCHAR, checksum VARCHAR, "
+            "duplicate_of VARCHAR, _dlt_load_id VARCHAR, _dlt_id VARCHAR)"
+        )
+        for call_id, day in [(1, "2025-01-01"), (2, "2025-01-01"), (3, "2025-01-02")]:
+            con.execute("INSERT INTO raw_calls.calls VALUES (?, ?, '1')", [call_id, f"duckdb-sink:calls/day={day}/1"])
+        for day, num_rows in [("2025-01-01", 2), ("2025-01-02", 1)]:
+            con.execute(
+                "INSERT INTO raw_calls._ingested_files (file_url, partition_date, modification_date, num_rows, "
+                "_dlt_load_id, _dlt_id) VALUES (?, ?, now(), ?, '1', gen_random_uuid()::VARCHAR)",
+                [f"duckdb-sink:calls/day={day}/1", day, num_rows],
+            )
+
+    _write_part(source_dir, "2025-01-01", 0, [1, 2])
+    _ingest(loader, database, "2025-01-01", "2025-01-01")
+
+    assert _call_ids(database) == [1, 2, 3]
+    with duckdb.connect(str(database)) as con:
+        rows_by_file = dict(con.sql("SELECT _file_url, count(*) FROM raw_calls.calls GROUP BY ALL").fetchall())
+    assert rows_by_file == {
+        (source_dir / "day=2025-01-01" / "part-0000-calls.parquet").as_uri(): 2,
+        "duckdb-sink:calls/day=2025-01-02/1": 1,
+    }
+
+
+def test_cursor_loaded_dataset_must_be_reset(source_dir, database):
+    _write_part(source_dir, "2025-01-01", 0, [1, 2])
+    with duckdb.connect(str(database)) as con:
+        con.execute("CREATE SCHEMA raw_calls")
+        con.execute("CREATE TABLE raw_calls.calls (call_id BIGINT, _dlt_load_id VARCHAR)")
+        con.execute("CREATE TABLE raw_calls._dlt_version (version BIGINT)")
+
+    with pytest.raises(RuntimeError, match="mds reset warehouse"):
+        _ingest("duckdb", database, "2025-01-01", "2025-01-01")
+
+
+@pytest.mark.parametrize("loader", LOADERS)
+def test_copies_are_skipped_only_with_skip_duplicate_files(loader, source_dir, database):
+    original = _write_part(source_dir, "2025-01-01", 0, [1, 2])
+    _ingest(loader, database, "2025-01-01", "2025-01-01", skip_duplicate_files=True)
+    copy = original.with_name("part-0000-calls_dup.parquet")
+    shutil.copy(original, copy)
+    _ingest(loader, database, "2025-01-01", "2025-01-01", skip_duplicate_files=True)
+    assert _call_ids(database) == [1, 2]
+    assert (copy.as_uri(), original.as_uri()) in _manifest(database)
+
+    shutil.copy(original, copy.with_name("part-0000-calls_dup2.parquet"))
+    _ingest(loader, database, "2025-01-01", "2025-01-01")
+    assert _call_ids(database) == [1, 1, 2, 2]
+
+
+def test_bulk_loader_hashes_files_only_to_skip_duplicates(source_dir, database):
+    path = _write_part(source_dir, "2025-01-01", 0, [1, 2])
+    _ingest("duckdb", database, "2025-01-01", "2025-01-01")
+    # with no checksum to compare with, a file rewritten unchanged replaces its rows
+    _write_part(source_dir, "2025-01-01", 0, [1, 2], mtime_offset=10)
+    _ingest("duckdb", database, "2025-01-01", "2025-01-01")
+
+    assert _call_ids(database) == [1, 2]
+    with duckdb.connect(str(database)) as con:
+        manifest = con.sql("SELECT file_url, checksum FROM raw_calls._ingested_files").fetchall()
+    assert manifest == [(path.as_uri(), None)]
@@ -36,8 +36,8 @@ select
  ,NOW() as warehouse_updated_ts
 
 from stg_data
-inner join {{ ref('agents') }} as agents
+inner join {{ dimension('agents') }} as agents
     on stg_data.agent_id = agents.agent_id
-inner join {{ ref('customers') }} as customers
+inner join {{ dimension('customers') }} as customers
     on stg_data.customer_id = customers.customer_id
 
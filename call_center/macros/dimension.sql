@@ -0,0 +1,14 @@
+{% macro dimension(name) %}
+    {#
+        Relation for a dimension table (agents, managers, customers, agent_assignments).
+
+        By default the dimensions are dbt seeds loaded from the CSVs in seeds/. Large simulated datasets write them
+        as typed parquet instead (`mds generate-source-data --seed-format parquet`); set the `dimension_format` var
+        (or MDS_DIMENSION_FORMAT) to 'parquet' to read those files through the `dimensions` source.
+    #}
+    {% if var('dimension_format') == 'parquet' %}
+        {{ return(source('dimensions', name)) }}
+    {% else %}
+        {{ return(ref(name)) }}
+    {% endif %}
+{% endmacro %}
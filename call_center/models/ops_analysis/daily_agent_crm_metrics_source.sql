@@ -40,8 +40,8 @@ select
     ,NOW() as warehouse_updated_ts
 
     from fcr_agg as f
-    inner join {{ ref('agent_assignments') }} as a
+    inner join {{ dimension('agent_assignments') }} as a
         on f.agent_id = a.agent_id
         and f.call_date between a.effective_start and a.effective_end
-    inner join {{ ref('managers') }} as m
+    inner join {{ dimension('managers') }} as m
         on a.manager_id = m.manager_id
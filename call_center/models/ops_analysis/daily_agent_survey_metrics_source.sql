@@ -41,8 +41,8 @@ select
     ,NOW() as warehouse_updated_ts
 
     from surveys_agg as s
-    inner join {{ ref('agent_assignments') }} as a
+    inner join {{ dimension('agent_assignments') }} as a
         on s.agent_id = a.agent_id
         and s.survey_date between a.effective_start and a.effective_end
-    inner join {{ ref('managers') }} as m
+    inner join {{ dimension('managers') }} as m
         on a.manager_id = m.manager_id
\ No newline at end of file
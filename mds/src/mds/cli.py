@@ -1,12 +1,20 @@
 import argparse
 import datetime
+import json
 import logging
 import shutil
 from pathlib import Path
 
 import duckdb
 
+from mds.data_generation.benchmarks import BENCHMARKS, SUITES, run_benchmarks
+from mds.data_generation.call_center_simulation import DIMENSION_GENERATORS, ENGINES, SINKS, SimulationConfig
 from mds.data_generation.call_center_simulation import main as run_simulation
+from mds.data_generation.checkpoint import DEFAULT_CHECKPOINT_INTERVAL, load_checkpoint
+from mds.data_generation.dataset_cache import DatasetCache
+from mds.data_generation.estimate import estimate_run, latest_bench_results
+from mds.data_generation.profiling import PROFILERS
+from mds.data_generation.writers import PARQUET_COMPRESSIONS, SEED_FORMATS, TABLE_SCHEMAS, compact_partitions
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +39,7 @@ PROD_WAREHOUSE_PATH = WAREHOUSE_DIR / "warehouse_prod.duckdb"
 METABASE_DATA_PATH = BASE_DIR / "data_vis_metabase" / "pgdata"
 
 DATA_DIR = BASE_DIR / "data"
+BENCH_RESULTS_DIR = BASE_DIR / "bench-results"
 
 SCRIPTS_DIR = BASE_DIR / "scripts"
 WAREHOUSE_STARTUP_TEMPLATE_FILE = SCRIPTS_DIR / "warehouse-startup-template.sql"
@@ -210,14 +219,22 @@ def reset_metabase_data():
     _delete_contents(METABASE_DATA_PATH)
 
 
+def reset_dataset_cache():
+    """Delete the cached simulated datasets (lives outside the repo, so 'all' keeps it)."""
+    cache = DatasetCache()
+    cache.clear()
+    logger.info(f"COMPLETED: Cleaned {cache.root}")
+
+
 def source_data_status() -> str:
     """
     Check whether source data parquet files exist for all three datasets.
 
     Returns:
         'complete'  — all three datasets have parquet files
-        'partial'   — at least one dataset has files but another is missing/empty
-                      (running the simulation again would append and create duplicates)
+        'partial'   — at least one dataset has files but another is missing/empty, or the simulation checkpoint
+                      shows that the run stopped before its end date (running the simulation again would append
+                      and create duplicates; 'generate-source-data --resume' finishes the interrupted run instead)
         'missing'   — none of the datasets have any parquet files
     """
     datasets = ("calls", "crm", "surveys")
@@ -226,7 +243,8 @@ def source_data_status() -> str:
         dataset_dir = DATA_DIR / dataset
         has_data.append(dataset_dir.exists() and any(dataset_dir.rglob("*.parquet")))
 
-    if all(has_data):
+    checkpoint = load_checkpoint(DATA_DIR)
+    if all(has_data) and (checkpoint is None or checkpoint.complete):
         return "complete"
     if any(has_data):
         return "partial"
@@ -242,22 +260,129 @@ def generate_source_data(args: argparse.Namespace) -> None:
         "seed_output_dir": _resolve_path("./call_center/seeds"),
         "parquet_output_dir": _resolve_path("./data"),
     }
+    if args.scale_factor:
+        overrides["scale_factor"] = args.scale_factor
+
     if args.global_start_date:
         overrides["global_start_date"] = datetime.datetime.strptime(args.global_start_date, "%Y-%m-%d").date()
 
     if args.global_end_date:
         overrides["global_end_date"] = datetime.datetime.strptime(args.global_end_date, "%Y-%m-%d").date()
 
+    if args.engine:
+        overrides["engine"] = args.engine
+
+    if args.dimension_generator:
+        overrides["dimension_generator"] = args.dimension_generator
+
+    if args.shards:
+        overrides["shards"] = args.shards
+
+    if args.seed_format:
+        overrides["seed_format"] = args.seed_format
+
+    if args.workers:
+        overrides["workers"] = args.workers
+
+    if args.parquet_compression:
+        overrides["parquet_compression"] = args.parquet_compression
+
+    if args.background_writes:
+        overrides["background_writes"] = True
+
+    if args.no_checkpoint:
+        overrides["checkpoint"] = False
+
+    if args.checkpoint_every:
+        overrides["checkpoint_interval"] = args.checkpoint_every
+
+    if args.resume:
+        overrides["resume"] = True
+
+    if args.extend_to:
+        overrides["resume"] = True
+        overrides["global_end_date"] = datetime.datetime.strptime(args.extend_to, "%Y-%m-%d").date()
+
+    if args.profile:
+        overrides["profiler"] = args.profile
+
+    if not args.no_cache:
+        overrides["dataset_cache"] = DatasetCache()
+
+    if args.sink == "duckdb":
+        overrides["sink"] = "duckdb"
+        overrides["duckdb_databases"] = {
+            "calls": INGEST_CALLS_WAREHOUSE,
+            "crm": INGEST_CRM_WAREHOUSE,
+            "surveys": INGEST_SURVEYS_WAREHOUSE,
+        }
+
     run_simulation(**overrides)
 
 
+def compact_source_data(tables: list[str] | None = None) -> None:
+    """Merges the part files of each day partition in the source data directory into a single file.
+
+    Partitions that were already ingested are replaced on their next ingestion run: the merged ``part-0000`` is
+    loaded in place of the rows of every part it replaces (see ``IngestPlan`` in the analytics_system ingestion).
+    """
+    compacted = compact_partitions(DATA_DIR, tables=tables or list(TABLE_SCHEMAS))
+    logger.info(f"Compacted {compacted} partition(s) in {DATA_DIR.relative_to(BASE_DIR)}")
+
+
+def estimate(args: argparse.Namespace) -> None:
+    """Prints the expected rows, bytes and runtime of a generate-source-data run with the same settings as JSON."""
+    overrides = {}
+    if args.global_start_date:
+        overrides["global_start_date"] = datetime.datetime.strptime(args.global_start_date, "%Y-%m-%d").date()
+
+    if args.global_end_date:
+        overrides["global_end_date"] = datetime.datetime.strptime(args.global_end_date, "%Y-%m-%d").date()
+
+    if args.engine:
+        overrides["engine"] = args.engine
+
+    if args.dimension_generator:
+        overrides["dimension_generator"] = args.dimension_generator
+
+    if args.seed_format:
+        overrides["seed_format"] = args.seed_format
+
+    config = SimulationConfig.at_scale(args.scale_factor or 1, **overrides)
+    bench_results = latest_bench_results(args.bench_results or BENCH_RESULTS_DIR)
+    if bench_results is None:
+        logger.warning(
+            "No benchmark results found, so no runtime projection. Run "
+            f"'uv run mds bench --output {BENCH_RESULTS_DIR.relative_to(BASE_DIR)}/$(git rev-parse --short HEAD).json'"
+        )
+
+    result = {
+        "scale_factor": args.scale_factor or 1,
+        "global_start_date": config.global_start_date.isoformat(),
+        "global_end_date": config.global_end_date.isoformat(),
+        "agents_count": config.agents_count,
+        "managers_count": config.managers_count,
+        "customers_count": config.customers_count,
+        **estimate_run(config, sink=args.sink, bench_results=bench_results),
+    }
+    print(json.dumps(result, indent=2))
+
+
+def bench(suite: str, only: list[str] | None, output: str | None) -> None:
+    """Runs the simulator benchmark suite and writes the results as JSON (to stdout if no output path is given)."""
+    results = run_benchmarks(suite=suite, only=only, output=output)
+    if output is None:
+        print(json.dumps(results, indent=2))
+
+
 def inject_duplicate_parquets(num_days: int = 3) -> None:
     """Copies source parquet files under new names to simulate a dlt re-ingestion event.
 
-    dlt tracks ingested files via a ``file_url`` cursor. Copying a file under a new name
-    causes dlt to treat it as a previously unseen file and re-ingest its rows, creating
-    duplicates in the raw DuckDB tables. Students observe the resulting unique-test failures
-    in the mart layer and fix them by implementing the deduplication CTE in staging.
+    Ingestion tracks loaded files by path in its ``_ingested_files`` manifest. Copying a file under a
+    new name causes it to be treated as a previously unseen file and its rows re-ingested, creating
+    duplicates in the raw DuckDB tables (unless ``skip_duplicate_files`` is turned on). Students
+    observe the resulting unique-test failures in the mart layer and fix them by implementing the
+    deduplication CTE in staging.
     """
     for dataset in ("calls", "crm", "surveys"):
         dataset_dir = DATA_DIR / dataset
@@ -330,13 +455,14 @@ def setup_assignment(module: int, prompt_for_reset: bool = True) -> None:
         run_simulation(
             seed_output_dir=_resolve_path("./call_center/seeds"),
             parquet_output_dir=_resolve_path("./data"),
+            dataset_cache=DatasetCache(),
         )
     elif data_status == "partial":
         logger.error(
-            "Source data is incomplete — some datasets exist but others are missing.\n"
+            "Source data is incomplete — some datasets are missing or the last simulation run was interrupted.\n"
             "Running the simulation again would append duplicate records.\n"
-            "To fix: run 'uv run mds reset source-data' then "
-            "'uv run mds generate-source-data', then retry."
+            "To fix: run 'uv run mds generate-source-data --resume' to finish an interrupted run, or "
+            "'uv run mds reset source-data' then 'uv run mds generate-source-data', then retry."
         )
         return
 
@@ -446,8 +572,85 @@ def main() -> None:
     simulate_parser = subparsers.add_parser(
         "generate-source-data", help="Generates source data simulating the call center"
     )
+    simulate_parser.add_argument(
+        "--scale-factor",
+        type=float,
+        help="Size of the dataset relative to the default one (1): scales agents, managers, customers and the number "
+        "of days together (see 'mds estimate')",
+    )
     simulate_parser.add_argument("--global-start-date", type=str, help="Global start date")
     simulate_parser.add_argument("--global-end-date", type=str, help="Global end date")
+    simulate_parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        help="Simulation engine: 'loop' (per-call reference engine, default) or 'vectorized' (much faster)",
+    )
+    simulate_parser.add_argument(
+        "--dimension-generator",
+        choices=DIMENSION_GENERATORS,
+        help="Customers/agents/managers generator: 'faker' (per-row, default) or 'bulk' (for millions of customers)",
+    )
+    simulate_parser.add_argument(
+        "--seed-format",
+        choices=SEED_FORMATS,
+        help="Dimension files for dbt: 'csv' seeds (default) or typed 'parquet' read in place by dbt "
+        "(set MDS_DIMENSION_FORMAT=parquet for dbt and Dagster)",
+    )
+    simulate_parser.add_argument(
+        "--shards",
+        type=int,
+        help="Vectorized engine only: number of independent agent/customer partitions (changes the output)",
+    )
+    simulate_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Processes used to simulate shards in parallel (never changes the output)",
+    )
+    simulate_parser.add_argument(
+        "--parquet-compression", choices=PARQUET_COMPRESSIONS, help="Parquet compression codec (default: snappy)"
+    )
+    simulate_parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Don't save a checkpoint (the run can then not be resumed or extended)",
+    )
+    simulate_parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        help=f"Days between checkpoints (default: {DEFAULT_CHECKPOINT_INTERVAL}; the last day is always checkpointed)",
+    )
+    simulate_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from the checkpoint in data/ (uses the checkpointed settings)",
+    )
+    simulate_parser.add_argument(
+        "--extend-to",
+        type=str,
+        help="Extend a finished (or interrupted) run to this end date (YYYY-MM-DD) from the checkpoint in data/",
+    )
+    simulate_parser.add_argument(
+        "--sink",
+        choices=SINKS,
+        default="parquet",
+        help="'parquet' (files under data/ for dlt to ingest, default) or 'duckdb' (append straight into the raw "
+        "ingest_*.duckdb tables, bypassing parquet and dlt)",
+    )
+    simulate_parser.add_argument(
+        "--background-writes", action="store_true", help="Write parquet files on a background thread"
+    )
+    simulate_parser.add_argument(
+        "--profile",
+        choices=PROFILERS,
+        help="Also profile the run with cProfile or pyinstrument (saved next to data/_run_profile.json, the per-phase "
+        "timing report every run writes)",
+    )
+    simulate_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always simulate, without restoring from or adding to the dataset cache "
+        "($MDS_DATASET_CACHE_DIR, default ~/.cache/mds/datasets)",
+    )
 
     init_env_parser = subparsers.add_parser(
         "init-env", help="Initialize environment (.env files and initial database destinations)"
@@ -458,7 +661,7 @@ def main() -> None:
     reset_parser.add_argument(
         "targets",
         nargs="+",
-        choices=["dagster", "dlt", "warehouse", "source-data", "metabase", "all"],
+        choices=["dagster", "dlt", "warehouse", "source-data", "metabase", "dataset-cache", "all"],
         help="Which components to reset",
     )
 
@@ -494,6 +697,35 @@ def main() -> None:
         "cleanup-dupes", help="Remove duplicate parquet files created by the Module 5 assignment setup"
     )
 
+    compact_parser = subparsers.add_parser(
+        "compact", help="Merge the part files of each source data day partition into a single file"
+    )
+    compact_parser.add_argument(
+        "--tables", nargs="+", choices=list(TABLE_SCHEMAS), help="Tables to compact (default: all)"
+    )
+
+    estimate_parser = subparsers.add_parser(
+        "estimate", help="Estimate the rows, bytes and runtime of generate-source-data before running it"
+    )
+    estimate_parser.add_argument("--scale-factor", type=float, help="Scale factor (default: 1)")
+    estimate_parser.add_argument("--global-start-date", type=str, help="Global start date")
+    estimate_parser.add_argument("--global-end-date", type=str, help="Global end date")
+    estimate_parser.add_argument("--engine", choices=ENGINES, help="Simulation engine")
+    estimate_parser.add_argument("--dimension-generator", choices=DIMENSION_GENERATORS, help="Dimension generator")
+    estimate_parser.add_argument("--seed-format", choices=SEED_FORMATS, help="Dimension file format")
+    estimate_parser.add_argument("--sink", choices=SINKS, default="parquet", help="Output sink")
+    estimate_parser.add_argument(
+        "--bench-results",
+        type=str,
+        help="'mds bench --output' results file, or a directory of them (the most recent is used; default: "
+        "bench-results/)",
+    )
+
+    bench_parser = subparsers.add_parser("bench", help="Benchmark the source data simulator")
+    bench_parser.add_argument("--suite", choices=list(SUITES), default="quick", help="Benchmark matrix to run")
+    bench_parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Only run these benchmarks")
+    bench_parser.add_argument("--output", type=str, help="Path of the JSON results file (default: print to stdout)")
+
     args = parser.parse_args()
 
     if args.command == "reset":
@@ -511,6 +743,7 @@ def main() -> None:
                     "warehouse": reset_warehouse,
                     "source-data": reset_source_data,
                     "metabase": reset_metabase_data,
+                    "dataset-cache": reset_dataset_cache,
                 }[target]()
     elif args.command == "generate-source-data":
         generate_source_data(args)
@@ -530,6 +763,12 @@ def main() -> None:
         sync_answers()
     elif args.command == "cleanup-dupes":
         cleanup_duplicate_parquets()
+    elif args.command == "compact":
+        compact_source_data(tables=args.tables)
+    elif args.command == "estimate":
+        estimate(args)
+    elif args.command == "bench":
+        bench(suite=args.suite, only=args.only, output=args.output)
 
 
 if __name__ == "__main__":
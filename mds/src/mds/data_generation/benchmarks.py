@@ -0,0 +1,376 @@
+"""Offline benchmark suite for the call center simulator.
+
+Each benchmark runs a matrix of parameter combinations. Every combination runs in a fresh worker process, so the
+peak RSS reported for it is not inflated by earlier cases. Results are saved as JSON (one file per run) so that
+numbers can be compared between commits:
+
+    uv run mds bench --suite quick --output bench-results/$(git rev-parse --short HEAD).json
+
+The same quick suite also runs under pytest with ``pytest -m benchmark``.
+"""
+
+from __future__ import annotations
+
+import datetime
+import itertools
+import json
+import logging
+import multiprocessing
+import platform
+import subprocess
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import duckdb
+import numpy as np
+import pyarrow.parquet as pq
+
+from mds.data_generation import call_center_simulation, dimensions
+from mds.data_generation.profiling import peak_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+BENCH_START_DATE = datetime.date(2025, 1, 1)
+
+# benchmark name -> parameter name -> values; every combination of values is one case
+SUITES: dict[str, dict[str, dict[str, list[Any]]]] = {
+    "quick": {
+        "simulate_call_center": {
+            "engine": ["loop", "vectorized"],
+            "sink": ["parquet", "duckdb"],
+            "agents_count": [10],
+            "customers_count": [2_000],
+            "days": [3],
+        },
+        "parquet_dlt_load": {"engine": ["vectorized"], "agents_count": [10], "customers_count": [2_000], "days": [3]},
+        "parquet_partition_load": {
+            "loader": ["dlt", "duckdb"],
+            "engine": ["vectorized"],
+            "agents_count": [10],
+            "customers_count": [2_000],
+            "days": [3],
+        },
+        "generate_customers": {"dimension_generator": ["faker", "bulk"], "customers_count": [2_000]},
+        "distribute_agents_to_managers": {"dimension_generator": ["faker", "bulk"], "agents_count": [50], "days": [30]},
+        "get_call_reasons_plus_duration": {"calls": [20_000]},
+        "write_daily_parquet": {"rows": [10_000]},
+    },
+    "full": {
+        "simulate_call_center": {
+            "engine": ["loop", "vectorized"],
+            "sink": ["parquet", "duckdb"],
+            "agents_count": [50, 500],
+            "customers_count": [None, 1_000_000],  # None = SimulationConfig default
+            "days": [7, 30],
+        },
+        "parquet_dlt_load": {"engine": ["vectorized"], "agents_count": [500], "customers_count": [None], "days": [30]},
+        "parquet_partition_load": {
+            "loader": ["dlt", "duckdb"],
+            "engine": ["vectorized"],
+            "agents_count": [500],
+            "customers_count": [None],
+            "days": [30],
+        },
+        "generate_customers": {"dimension_generator": ["faker", "bulk"], "customers_count": [10_000, 100_000]},
+        "distribute_agents_to_managers": {
+            "dimension_generator": ["faker", "bulk"],
+            "agents_count": [50, 500, 5_000],
+            "days": [30, 365],
+        },
+        "get_call_reasons_plus_duration": {"calls": [100_000, 1_000_000]},
+        "write_daily_parquet": {"rows": [1_000, 100_000, 1_000_000]},
+    },
+}
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def _config(**overrides) -> call_center_simulation.SimulationConfig:
+    days = overrides.pop("days", 1)
+    return call_center_simulation.SimulationConfig(
+        global_start_date=BENCH_START_DATE,
+        global_end_date=BENCH_START_DATE + datetime.timedelta(days=days - 1),
+        **overrides,
+    )
+
+
+def _ingest_databases(scratch: Path) -> dict[str, Path]:
+    return {table: scratch / f"ingest_{table}.duckdb" for table in ("calls", "crm", "surveys")}
+
+
+def bench_simulate_call_center(params: dict[str, Any], scratch: Path) -> dict[str, Any]:
+    params = dict(params)
+    sink = params.pop("sink", "parquet")
+    config = _config(**params)
+    seed_dir, parquet_dir = scratch / "seeds", scratch / "data"
+    seed_dir.mkdir()
+
+    start = time.perf_counter()
+    call_center_simulation.simulate_call_center(
+        config,
+        parquet_output_dir=str(parquet_dir),
+        seed_output_dir=str(seed_dir),
+        sink=sink,
+        duckdb_databases=_ingest_databases(scratch),
+        checkpoint=False,  # the simulation, not pickling its state
+    )
+    seconds = time.perf_counter() - start
+
+    if sink == "duckdb":
+        with duckdb.connect(str(scratch / "ingest_calls.duckdb"), read_only=True) as con:
+            calls = con.sql("SELECT count(*) FROM raw_calls.calls").fetchone()[0]
+        bytes_written = sum(path.stat().st_size for path in _ingest_databases(scratch).values())
+    else:
+        calls = sum(pq.ParquetFile(f).metadata.num_rows for f in (parquet_dir / "calls").rglob("*.parquet"))
+        bytes_written = _dir_size(parquet_dir)
+    return {
+        "seconds": seconds,
+        "calls": calls,
+        "calls_per_sec": calls / seconds,
+        "seconds_per_day": seconds / params["days"],
+        "bytes_written": bytes_written + _dir_size(seed_dir),
+    }
+
+
+def bench_parquet_dlt_load(params: dict[str, Any], scratch: Path) -> dict[str, Any]:
+    """Parquet files + a dlt filesystem -> read_parquet -> duckdb load; the path ``sink="duckdb"`` bypasses."""
+    try:
+        import dlt
+        from dlt.sources.filesystem import filesystem, read_parquet
+    except ImportError:
+        return {"skipped": "dlt is not installed"}
+
+    simulated = bench_simulate_call_center({**params, "sink": "parquet"}, scratch)
+    databases = _ingest_databases(scratch)
+
+    start = time.perf_counter()
+    for table, database in databases.items():
+        pipeline = dlt.pipeline(
+            pipeline_name=f"filesystem_{table}_source",
+            pipelines_dir=str(scratch / "dlt"),
+            dataset_name=f"raw_{table}",
+            destination=dlt.destinations.duckdb(str(database)),
+        )
+        files = filesystem((scratch / "data" / table).resolve().as_uri(), file_glob="**/*.parquet")
+        pipeline.run((files | read_parquet(use_pyarrow=True)).with_name(table))
+    load_seconds = time.perf_counter() - start
+
+    seconds = simulated["seconds"] + load_seconds
+    return {
+        "seconds": seconds,
+        "simulate_seconds": simulated["seconds"],
+        "load_seconds": load_seconds,
+        "calls": simulated["calls"],
+        "calls_per_sec": simulated["calls"] / seconds,
+        "seconds_per_day": seconds / params["days"],
+        "bytes_written": simulated["bytes_written"] + sum(path.stat().st_size for path in databases.values()),
+    }
+
+
+def _load_partition_dlt(files: list[Path], dataset: str, database: Path, scratch: Path) -> None:
+    import dlt
+    from dlt.sources.filesystem import filesystem, read_parquet
+
+    pipeline = dlt.pipeline(
+        pipeline_name=f"filesystem_{dataset}_source",
+        pipelines_dir=str(scratch / "dlt"),
+        dataset_name=f"raw_{dataset}",
+        destination=dlt.destinations.duckdb(str(database)),
+    )
+    partition = files[0].parent
+    listing = filesystem(partition.resolve().as_uri(), file_glob="*.parquet")
+    pipeline.run((listing | read_parquet(use_pyarrow=True)).with_name(dataset))
+
+
+def _load_partition_duckdb(files: list[Path], dataset: str, database: Path, scratch: Path) -> None:
+    schema, load_id = f"raw_{dataset}", str(time.time())
+    read_files = "read_parquet(?, hive_partitioning = false, union_by_name = true)"
+    with duckdb.connect(str(database)) as con:
+        con.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        con.execute(
+            f"CREATE TABLE IF NOT EXISTS {schema}.{dataset} AS SELECT *, ?::VARCHAR AS _dlt_load_id FROM {read_files} "
+            "LIMIT 0",
+            [load_id, [str(f) for f in files]],
+        )
+        con.execute(
+            f"INSERT INTO {schema}.{dataset} BY NAME SELECT *, ? AS _dlt_load_id FROM {read_files}",
+            [load_id, [str(f) for f in files]],
+        )
+
+
+def bench_parquet_partition_load(params: dict[str, Any], scratch: Path) -> dict[str, Any]:
+    """Loads the simulated parquet files into DuckDB one ``day=`` partition at a time, as the daily ingestion assets
+    do, with dlt (``loader="dlt"``) or with a native DuckDB ``INSERT ... SELECT FROM read_parquet`` (``"duckdb"``).
+
+    A lower bound for the ingestion assets of analytics_system, which mds does not depend on: ``"dlt"`` runs dlt's
+    stock ``filesystem | read_parquet`` pipeline and ``"duckdb"`` only the bulk loader's ``INSERT``, without the
+    assets' file manifest, checksums, ``_file_url`` column or ``_dlt_loads`` row. It compares the two load paths, not
+    what an asset run costs end to end (see the ``*_seconds`` of its materialization metadata for that).
+    """
+    params = dict(params)
+    loader = params.pop("loader")
+    if loader == "dlt":
+        try:
+            import dlt  # noqa: F401
+        except ImportError:
+            return {"skipped": "dlt is not installed"}
+    load_partition = {"dlt": _load_partition_dlt, "duckdb": _load_partition_duckdb}[loader]
+
+    simulated = bench_simulate_call_center({**params, "sink": "parquet"}, scratch)
+    databases = _ingest_databases(scratch)
+    partitions = [
+        (dataset, sorted(partition.glob("*.parquet")))
+        for dataset in databases
+        for partition in sorted((scratch / "data" / dataset).glob("day=*"))
+    ]
+    rows = sum(pq.ParquetFile(f).metadata.num_rows for _, files in partitions for f in files)
+
+    start = time.perf_counter()
+    for dataset, files in partitions:
+        load_partition(files, dataset, databases[dataset], scratch)
+    load_seconds = time.perf_counter() - start
+    return {
+        "seconds": load_seconds,
+        "partitions": len(partitions),
+        "seconds_per_partition": load_seconds / len(partitions),
+        "rows": rows,
+        "rows_per_sec": rows / load_seconds,
+        "simulate_seconds": simulated["seconds"],
+    }
+
+
+def bench_generate_customers(params: dict[str, Any], scratch: Path) -> dict[str, Any]:
+    config = _config(**params)
+    start = time.perf_counter()
+    customers = config.generate_customers()
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "rows": len(customers), "rows_per_sec": len(customers) / seconds}
+
+
+def bench_distribute_agents_to_managers(params: dict[str, Any], scratch: Path) -> dict[str, Any]:
+    config = _config(agents_count=params["agents_count"], days=params["days"], dimension_generator="bulk")
+    agents, managers = config.generate_agents(), config.generate_managers()
+    distribute = (
+        dimensions.distribute_agents_to_managers_bulk
+        if params["dimension_generator"] == "bulk"
+        else call_center_simulation.distribute_agents_to_managers
+    )
+
+    start = time.perf_counter()
+    assignments = distribute(
+        agents=agents, managers=managers, start_date=config.global_start_date, end_date=config.global_end_date
+    )
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "rows": len(assignments), "agents_per_sec": len(agents) / seconds}
+
+
+def bench_get_call_reasons_plus_duration(params: dict[str, Any], scratch: Path) -> dict[str, Any]:
+    config = _config()
+    program_keys = list(config.programs.keys())
+    rng = np.random.default_rng(config.rng_seed)
+
+    start = time.perf_counter()
+    for i in range(params["calls"]):
+        call_center_simulation.get_call_reasons_plus_duration(config, program_keys[i % len(program_keys)], rng)
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "calls_per_sec": params["calls"] / seconds}
+
+
+def bench_write_daily_parquet(params: dict[str, Any], scratch: Path) -> dict[str, Any]:
+    start_ts = datetime.datetime.combine(BENCH_START_DATE, datetime.time(8), tzinfo=datetime.UTC)
+    records = [
+        {
+            "call_id": i,
+            "agent_id": i % 50,
+            "customer_id": i,
+            "queue_hold_time": 45,
+            "start_ts": start_ts,
+            "end_ts": start_ts + datetime.timedelta(seconds=300),
+            "duration_s": 300,
+            "hold_time_during_call_s": 20,
+            "transfer_flag": False,
+        }
+        for i in range(params["rows"])
+    ]
+    start = time.perf_counter()
+    call_center_simulation.write_daily_parquet(records, output_dir=str(scratch), table="calls", date=BENCH_START_DATE)
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "rows_per_sec": params["rows"] / seconds, "bytes_written": _dir_size(scratch)}
+
+
+BENCHMARKS: dict[str, Callable[[dict[str, Any], Path], dict[str, Any]]] = {
+    "simulate_call_center": bench_simulate_call_center,
+    "parquet_dlt_load": bench_parquet_dlt_load,
+    "parquet_partition_load": bench_parquet_partition_load,
+    "generate_customers": bench_generate_customers,
+    "distribute_agents_to_managers": bench_distribute_agents_to_managers,
+    "get_call_reasons_plus_duration": bench_get_call_reasons_plus_duration,
+    "write_daily_parquet": bench_write_daily_parquet,
+}
+
+
+def _run_case(name: str, params: dict[str, Any]) -> dict[str, Any]:
+    """Run one benchmark case (in a worker process) in its own scratch directory."""
+    with tempfile.TemporaryDirectory(prefix=f"mds-bench-{name}-") as scratch:
+        metrics = BENCHMARKS[name](params, Path(scratch))
+    metrics["peak_rss_bytes"] = peak_rss_bytes()
+    return metrics
+
+
+def iter_cases(suite: dict[str, dict[str, list[Any]]], only: list[str] | None = None):
+    """(benchmark name, params) for every combination in a suite."""
+    for name, matrix in suite.items():
+        if only and name not in only:
+            continue
+        for values in itertools.product(*matrix.values()):
+            yield name, dict(zip(matrix.keys(), values, strict=True))
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_benchmarks(suite: str = "quick", only: list[str] | None = None, output: str | Path | None = None) -> dict:
+    """Run a benchmark suite and optionally save the results as JSON.
+
+    Args:
+        suite: Name of a suite in ``SUITES``.
+        only: Restrict the run to these benchmark names.
+        output: Path of the JSON results file.
+
+    Returns:
+        The results document (run metadata plus one entry per case).
+    """
+    results = []
+    # spawn (rather than fork) so each case starts from a clean interpreter and reports its own peak RSS
+    mp_context = multiprocessing.get_context("spawn")
+    for name, params in iter_cases(SUITES[suite], only):
+        logger.info(f"Benchmark {name} {params}")
+        with ProcessPoolExecutor(max_workers=1, mp_context=mp_context) as executor:
+            metrics = executor.submit(_run_case, name, params).result()
+        logger.info(f"  -> {metrics}")
+        results.append({"benchmark": name, "params": params, "metrics": metrics})
+
+    document = {
+        "suite": suite,
+        "git_commit": _git_commit(),
+        "created_at": datetime.datetime.now(datetime.UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if output is not None:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        Path(output).write_text(json.dumps(document, indent=2))
+        logger.info(f"Wrote benchmark results to {output}")
+    return document
@@ -2,16 +2,30 @@ from __future__ import annotations
 
 import calendar
 import datetime
+import hashlib
 import logging
+import math
 import random
-from dataclasses import dataclass, field, replace
+import time
+from collections.abc import Collection, Iterator, Mapping
+from dataclasses import dataclass, field, fields, replace
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 from faker import Faker
 
+from mds.data_generation.callbacks import CallbackScheduler, random_other_agent
+from mds.data_generation.checkpoint import (
+    DEFAULT_CHECKPOINT_INTERVAL,
+    Checkpoint,
+    discard_partitions_after,
+    load_checkpoint,
+    save_checkpoint,
+)
 from mds.data_generation.constants import (
     GLOBAL_END_DATE,
     GLOBAL_START_DATE,
@@ -19,10 +33,48 @@ from mds.data_generation.constants import (
     SENTINEL_END_DATE,
     WEEKDAY_MULTIPLIERS,
 )
-from mds.data_generation.helpers import generate_nps
+from mds.data_generation.customer_store import CUSTOMER_DRAW_ATTEMPTS, CustomerStore
+from mds.data_generation.dataset_cache import NON_OUTPUT_CONFIG_FIELDS, DatasetCache
+from mds.data_generation.dimensions import (
+    distribute_agents_to_managers_bulk,
+    generate_customers_bulk,
+    generate_names_bulk,
+)
+from mds.data_generation.duckdb_sink import DuckDBSink
+from mds.data_generation.fingerprint import MANIFEST_FILE, RunFingerprint
+from mds.data_generation.helpers import (
+    US_PER_DAY,
+    US_PER_HOUR,
+    US_PER_SECOND,
+    epoch_day_to_date,
+    epoch_us,
+    generate_nps,
+    seconds_to_us,
+)
+from mds.data_generation.profiling import PROFILERS, RunProfile, run_profiler
+from mds.data_generation.profiling import REPORT_FILE as PROFILE_REPORT_FILE
+from mds.data_generation.sampling import ReasonSampler
+from mds.data_generation.vectorized_engine import VectorizedState, initial_vectorized_state, iter_days_vectorized
+from mds.data_generation.writers import (
+    PARQUET_COMPRESSIONS,
+    SEED_FORMATS,
+    TABLE_SCHEMAS,
+    ColumnBuffer,
+    DayBatches,
+    PartitionWriter,
+    write_seed,
+)
 
 logger = logging.getLogger(__name__)
 
+# "loop" is the per-call reference engine; "vectorized" draws each day as NumPy arrays (see vectorized_engine.py)
+ENGINES = ("loop", "vectorized")
+# "faker" calls Faker per row (reference dimensions); "bulk" samples Faker vocabularies once and draws the agent
+# assignments as arrays (see dimensions.py)
+DIMENSION_GENERATORS = ("faker", "bulk")
+# "parquet" writes files for dlt to ingest; "duckdb" appends straight into the raw ingest tables (see duckdb_sink.py)
+SINKS = ("parquet", "duckdb")
+
 
 @dataclass(frozen=True)
 class SimulationConfig:
@@ -42,6 +94,14 @@ class SimulationConfig:
     workday_start: int = 8
     workday_end: int = 17
     mean_seconds_between_calls: int = 600
+    engine: str = "loop"  # one of ENGINES
+    shards: int = 1  # vectorized engine only: independent agent/customer partitions (see vectorized_engine.py)
+    dimension_generator: str = "faker"  # one of DIMENSION_GENERATORS
+    seed_format: str = "csv"  # one of SEED_FORMATS: dimension files for dbt (see writers.write_seed)
+    # Parquet output (see writers.py)
+    parquet_compression: str = "snappy"  # one of PARQUET_COMPRESSIONS
+    parquet_row_group_size: int | None = None  # None = one row group per file
+    background_writes: bool = False  # write parquet files on a background thread
     # Seasonality + weekday scaling
     seasonality_amplitude: float = 0.3  # +/- 30%
     weekday_multipliers: dict[int, float] = field(default_factory=lambda: WEEKDAY_MULTIPLIERS.copy())
@@ -53,6 +113,22 @@ class SimulationConfig:
     tables: tuple[str, ...] = ("calls", "crm", "surveys", "agents", "managers", "agent_assignments")
 
     def __post_init__(self) -> None:
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unknown simulation engine {self.engine!r}. Expected one of {ENGINES}")
+        if self.dimension_generator not in DIMENSION_GENERATORS:
+            raise ValueError(
+                f"Unknown dimension generator {self.dimension_generator!r}. Expected one of {DIMENSION_GENERATORS}"
+            )
+        if self.seed_format not in SEED_FORMATS:
+            raise ValueError(f"Unknown seed format {self.seed_format!r}. Expected one of {SEED_FORMATS}")
+        if self.parquet_compression not in PARQUET_COMPRESSIONS:
+            raise ValueError(
+                f"Unknown parquet compression {self.parquet_compression!r}. Expected one of {PARQUET_COMPRESSIONS}"
+            )
+        if self.shards > 1 and self.engine != "vectorized":
+            raise ValueError("shards > 1 is only supported by the vectorized engine")
+        if self.shards > 1 and self.agents_count < 2 * self.shards:
+            raise ValueError(f"Each of the {self.shards} shards needs at least 2 agents to hand callbacks to")
         if self.customers_count is None:
             object.__setattr__(
                 self,
@@ -64,7 +140,48 @@ class SimulationConfig:
         """Return a new SimulationConfig with some fields overridden."""
         return replace(self, **kwargs)
 
-    def generate_customers(self, faker_seed: int = 289, random_seed: int = 315) -> pd.DataFrame:
+    @classmethod
+    def at_scale(cls, scale_factor: float, **overrides) -> SimulationConfig:
+        """Config whose output is ``scale_factor`` times the default dataset (scale factor 1).
+
+        Row counts grow with agents x days, so both grow with sqrt(scale_factor): agents, managers, customers (via
+        the default agents x calls_per_agent_per_day x 20) and the number of days from ``global_start_date``.
+        ``overrides`` take precedence over the scaled values.
+        """
+        if scale_factor <= 0:
+            raise ValueError(f"scale_factor must be positive, got {scale_factor}")
+        growth = math.sqrt(scale_factor)
+        default = cls()
+        start_date = overrides.get("global_start_date", default.global_start_date)
+        days = max(1, round(((default.global_end_date - default.global_start_date).days + 1) * growth))
+        scaled = {
+            "agents_count": max(2, round(default.agents_count * growth)),
+            "managers_count": max(1, round(default.managers_count * growth)),
+            "global_end_date": start_date + datetime.timedelta(days=days - 1),
+        }
+        return cls(**{**scaled, **overrides})
+
+    def fingerprint(self, exclude: Collection[str] = ()) -> str:
+        """Stable hash of the config's field values, leaving out the ``exclude`` fields."""
+        values = [(f.name, getattr(self, f.name)) for f in fields(self) if f.name not in exclude]
+        return hashlib.sha256(repr(values).encode()).hexdigest()
+
+    @cached_property
+    def reason_sampler(self) -> ReasonSampler:
+        """Reason/sub-reason sampler compiled once from ``programs`` (cached on the config instance)."""
+        return ReasonSampler(self.programs)
+
+    def generate_customers(self, faker_seed: int = 289, random_seed: int = 315, workers: int = 1) -> pd.DataFrame:
+        if self.dimension_generator == "bulk":
+            return generate_customers_bulk(
+                count=self.customers_count,
+                program_names=list(self.programs.keys()),
+                birth_date_bounds=self._birth_date_bounds,
+                faker_seed=faker_seed,
+                random_seed=random_seed,
+                workers=workers,
+            )
+
         fake = Faker()
         Faker.seed(faker_seed)
         random.seed(random_seed)
@@ -80,10 +197,7 @@ class SimulationConfig:
                 "customer_id": i + 1,
                 "first_name": fake.first_name(),
                 "last_name": fake.last_name(),
-                "birth_date": fake.date_between(
-                    start_date=self.global_start_date - datetime.timedelta(days=77 * 365),
-                    end_date=self.global_start_date - datetime.timedelta(days=21 * 365),
-                ),
+                "birth_date": fake.date_between(*self._birth_date_bounds),
                 "state": state,
                 "zip_code": fake.zipcode_in_state(state_abbr=state),
                 "program": program_selection,
@@ -96,7 +210,21 @@ class SimulationConfig:
 
         return customer_df
 
+    @property
+    def _birth_date_bounds(self) -> tuple[datetime.date, datetime.date]:
+        """Customers are between 21 and 77 years old at the start of the simulation."""
+        return (
+            self.global_start_date - datetime.timedelta(days=77 * 365),
+            self.global_start_date - datetime.timedelta(days=21 * 365),
+        )
+
     def generate_agents(self, faker_seed: int = 867) -> pd.DataFrame:
+        if self.dimension_generator == "bulk":
+            return pd.DataFrame({
+                "agent_id": np.arange(1, self.agents_count + 1, dtype=np.int64),
+                "agent_name": generate_names_bulk(self.agents_count, faker_seed=faker_seed),
+            })
+
         fake = Faker()
         Faker.seed(faker_seed)
 
@@ -112,6 +240,12 @@ class SimulationConfig:
         return pd.DataFrame.from_records(agent_records)
 
     def generate_managers(self, faker_seed: int = 222) -> pd.DataFrame:
+        if self.dimension_generator == "bulk":
+            return pd.DataFrame({
+                "manager_id": np.arange(1, self.managers_count + 1, dtype=np.int64),
+                "manager_name": generate_names_bulk(self.managers_count, faker_seed=faker_seed),
+            })
+
         fake = Faker()
         Faker.seed(faker_seed)
 
@@ -138,40 +272,18 @@ def get_call_reasons_plus_duration(
     reason: str | None = None,
     subreason: str | None = None,
 ) -> tuple[str, str, int]:
-    if reason and subreason:
-        reason_record = [
-            reason_record
-            for reason_record in simulation_config.programs[program_key]["reasons"]
-            if reason_record["name"] == reason
-        ][0]
-        subreason_record = [
-            subreason_record
-            for subreason_record in reason_record["sub_reasons"]
-            if subreason_record["name"] == subreason
-        ][0]
-
-        duration = max(
-            simulation_config.min_call_length,
-            int(rng.normal(subreason_record["duration_mean"], subreason_record["duration_std"])),
-        )
+    sampler = simulation_config.reason_sampler
+    program_code = sampler.program_codes[program_key]
 
-        return reason, subreason, duration
+    if reason and subreason:
+        leaf = sampler.lookup(program_code, reason, subreason)
     else:
-        reasons = simulation_config.programs[program_key]["reasons"]
-        reason_probs = [r["prob"] for r in reasons]
-
-        reason = rng.choice(reasons, p=reason_probs)
-        sub_reasons = reason["sub_reasons"]
-        sub_probs = [s["prob"] for s in sub_reasons]
-
-        sub_reason = rng.choice(sub_reasons, p=sub_probs)
+        leaf = sampler.sample(program_code, rng)
 
-        # duration draw ~ Normal(mean, std)
-        duration = max(
-            simulation_config.min_call_length, int(rng.normal(sub_reason["duration_mean"], sub_reason["duration_std"]))
-        )
+    # duration draw ~ Normal(mean, std)
+    duration = sampler.duration(leaf, rng, simulation_config.min_call_length)
 
-        return str(reason["name"]), str(sub_reason["name"]), duration
+    return str(sampler.reason_names[leaf]), str(sampler.sub_reason_names[leaf]), duration
 
 
 def distribute_agents_to_managers(
@@ -232,61 +344,315 @@ def simulate_hold_time(rng: np.random.Generator) -> int:
     return int(np.clip(rng.normal(45, 20), 0, 300))
 
 
-def write_daily_parquet(records: list[dict], output_dir: str, table: str, date: datetime.date):
-    """Write records to parquet, partitioned by day."""
-    if not records:
-        return
-    df = pd.DataFrame.from_records(records)
-    day_str = date.strftime("%Y-%m-%d")
-    day_dir = Path(output_dir) / table / f"day={day_str}"
-    day_dir.mkdir(parents=True, exist_ok=True)
-    # Find the next part number
-    existing_parts = list(day_dir.glob(f"part-*-{table}.parquet"))
-    part_nums = [
-        int(f.name.split("-")[1])
-        for f in existing_parts
-        if f.name.startswith("part-") and f.name.endswith(f"-{table}.parquet")
-    ]
-    next_part = max(part_nums, default=-1) + 1
-    filename = day_dir / f"part-{next_part:04d}-{table}.parquet"
-    df.to_parquet(filename, index=False)
+def write_daily_parquet(records: list[dict] | pd.DataFrame, output_dir: str, table: str, date: datetime.date):
+    """Write records (or an already columnar DataFrame) to parquet, partitioned by day.
+
+    One-off helper: it lists the partition directory on every call. Long runs should keep a ``PartitionWriter``.
+    """
+    if isinstance(records, pd.DataFrame):
+        records = pa.RecordBatch.from_pandas(records, preserve_index=False)
+    PartitionWriter(output_dir).write(table=table, date=date, data=records)
 
 
 def simulate_call_center(
     simulation_config: SimulationConfig = DEFAULT_CONFIG,
     parquet_output_dir: str = "../data",
     seed_output_dir: str = "../call_center/seeds",
+    workers: int = 1,
+    sink: str = "parquet",
+    duckdb_databases: Mapping[str, str | Path] | None = None,
+    checkpoint: bool = True,
+    checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+    resume: bool = False,
+    dataset_cache: DatasetCache | None = None,
+    profiler: str | None = None,
 ) -> None:
-    rng = np.random.default_rng(simulation_config.rng_seed)
+    """Simulate the call center: dbt seed files for the dimensions, plus the calls, crm and surveys tables.
+
+    With ``sink="parquet"`` the tables are written as day-partitioned parquet files under ``parquet_output_dir``
+    for dlt to ingest. With ``sink="duckdb"`` they are appended straight into the raw ingest databases given by
+    ``duckdb_databases`` (table -> database path), laid out as dlt would have loaded them (see duckdb_sink.py).
+
+    The parquet sink saves a checkpoint in ``parquet_output_dir`` every ``checkpoint_interval`` days and after the
+    last day (see checkpoint.py) unless ``checkpoint`` is False. ``resume=True`` continues from that checkpoint up to
+    ``global_end_date``, which either finishes an interrupted run (re-simulating the days after its last checkpoint)
+    or extends a finished one; either way the output is identical to an uninterrupted run.
+
+    With a ``dataset_cache``, a fresh parquet run (no table data in ``parquet_output_dir`` yet) restores the output
+    from the cache when the same config was simulated before by the same code, and caches its output otherwise (unless
+    ``checkpoint`` is False: a restored dataset must have the checkpoint that ``resume`` continues from).
+
+    Every run writes a per-phase timing report to ``parquet_output_dir`` (see profiling.py); ``profiler``
+    ("cprofile" or "pyinstrument") also profiles the run. It also writes a manifest with a content fingerprint of
+    each table there (see fingerprint.py), so runs can be compared without reading their output back.
+    """
+    if sink not in SINKS:
+        raise ValueError(f"Unknown sink {sink!r}. Expected one of {SINKS}")
+    if sink == "duckdb" and duckdb_databases is None:
+        raise ValueError("sink='duckdb' requires duckdb_databases")
+    if sink == "duckdb" and resume:
+        raise ValueError("resume is only supported by the parquet sink")
+    if checkpoint_interval < 1:
+        raise ValueError(f"checkpoint_interval must be at least 1 day, got {checkpoint_interval}")
+    if profiler is not None and profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler {profiler!r}. Expected one of {PROFILERS}")
+
+    resumed = None
+    if resume:
+        resumed = load_checkpoint(parquet_output_dir)
+        if resumed is None:
+            raise FileNotFoundError(f"No checkpoint to resume from in {parquet_output_dir}")
+        resumed.check_compatible(simulation_config)
+
+    profile = RunProfile()
+    with run_profiler(profiler, parquet_output_dir):
+        _simulate_call_center(
+            simulation_config,
+            parquet_output_dir=parquet_output_dir,
+            seed_output_dir=seed_output_dir,
+            workers=workers,
+            sink=sink,
+            duckdb_databases=duckdb_databases,
+            checkpoint=checkpoint,
+            checkpoint_interval=checkpoint_interval,
+            resumed=resumed,
+            dataset_cache=dataset_cache,
+            profile=profile,
+        )
+    report = profile.write_report(
+        Path(parquet_output_dir) / PROFILE_REPORT_FILE, config=simulation_config, sink=sink, workers=workers
+    )
+    logger.info(f"Wrote the run profile to {report}")
 
-    # Write out customers, managers, and assignments csv files for dbt seed
-    agents = simulation_config.generate_agents()
-    managers = simulation_config.generate_managers()
-    customers = simulation_config.generate_customers()
-    agent_assignments = distribute_agents_to_managers(
+
+def _simulate_call_center(
+    simulation_config: SimulationConfig,
+    parquet_output_dir: str,
+    seed_output_dir: str,
+    workers: int,
+    sink: str,
+    duckdb_databases: Mapping[str, str | Path] | None,
+    checkpoint: bool,
+    checkpoint_interval: int,
+    resumed: Checkpoint | None,
+    dataset_cache: DatasetCache | None,
+    profile: RunProfile,
+) -> None:
+    cache_key = None
+    if dataset_cache is not None and sink == "parquet" and resumed is None and not _has_table_data(parquet_output_dir):
+        cache_key = dataset_cache.key(simulation_config)
+        with profile.phase("cache.restore"):
+            restored = dataset_cache.restore(cache_key, parquet_output_dir, seed_output_dir)
+        if restored:
+            logger.info(f"Restored the simulated dataset from the cache ({cache_key[:12]})")
+            return
+
+    # Write out customers, managers, and assignments files for dbt (seeds, or parquet read as external sources)
+    with profile.phase("dimensions.agents", rows=simulation_config.agents_count):
+        agents = simulation_config.generate_agents()
+    with profile.phase("dimensions.managers", rows=simulation_config.managers_count):
+        managers = simulation_config.generate_managers()
+    with profile.phase("dimensions.customers", rows=simulation_config.customers_count):
+        customers = simulation_config.generate_customers(workers=workers)
+    distribute = (
+        distribute_agents_to_managers_bulk
+        if simulation_config.dimension_generator == "bulk"
+        else distribute_agents_to_managers
+    )
+    start = time.perf_counter()
+    agent_assignments = distribute(
         agents=agents,
         managers=managers,
         start_date=simulation_config.global_start_date,
         end_date=simulation_config.global_end_date,
     )
-    logger.info("Writing out agents seed csv")
-    agents.to_csv(f"{seed_output_dir}/agents.csv", index=False, header=True)
-    logger.info("Writing out managers seed csv")
-    managers.to_csv(f"{seed_output_dir}/managers.csv", index=False, header=True)
-    logger.info("Writing out customers seed csv")
-    customers.to_csv(f"{seed_output_dir}/customers.csv", index=False, header=True)
-    logger.info("Writing out agent_assignments seed csv")
-    agent_assignments.to_csv(f"{seed_output_dir}/agent_assignments.csv", index=False, header=True)
-
-    call_id_counter, crm_id_counter, survey_id_counter = 0, 0, 0
-    pending_callbacks = []
-
-    customer_busy_until = {
-        cid: datetime.datetime.combine(simulation_config.global_start_date, datetime.time.min, tzinfo=datetime.UTC)
-        for cid in customers["customer_id"]
-    }
-
-    for day in pd.date_range(simulation_config.global_start_date, simulation_config.global_end_date):
+    profile.record("assignments", time.perf_counter() - start, rows=len(agent_assignments))
+    seeds = {"agents": agents, "managers": managers, "customers": customers, "agent_assignments": agent_assignments}
+    for name, seed in seeds.items():
+        logger.info(f"Writing out {name} seed {simulation_config.seed_format}")
+        start = time.perf_counter()
+        path = write_seed(seed, seed_output_dir, name, simulation_config.seed_format)
+        profile.record(f"seeds.{name}", time.perf_counter() - start, rows=len(seed), bytes=path.stat().st_size)
+
+    if sink == "duckdb":
+        fingerprint = RunFingerprint()
+        with DuckDBSink(duckdb_databases) as sink_output:
+            days = iter_call_center(simulation_config, agents=agents, customers=customers, workers=workers)
+            for day in _fingerprinted_days(profile, fingerprint, _timed_days(profile, days)):
+                with profile.phase("write.duckdb", rows=day.num_rows):
+                    sink_output.write_day(day)
+        logger.info(f"Wrote {sink_output.rows_written} rows to the duckdb sink")
+        _write_manifest(fingerprint, simulation_config, parquet_output_dir)
+        return
+
+    if resumed is not None:
+        discarded = discard_partitions_after(parquet_output_dir, resumed.last_day, tables=tuple(TABLE_SCHEMAS))
+        logger.info(f"Resuming after {resumed.last_day} (discarded {discarded} later partitions)")
+        state, fingerprint = resumed.state, resumed.fingerprint
+        last_checkpoint = resumed.last_day
+    else:
+        state = initial_state(simulation_config, agents=agents, customers=customers)
+        fingerprint = RunFingerprint()
+        last_checkpoint = simulation_config.global_start_date - datetime.timedelta(days=1)
+
+    with PartitionWriter(
+        parquet_output_dir,
+        compression=simulation_config.parquet_compression,
+        row_group_size=simulation_config.parquet_row_group_size,
+        background=simulation_config.background_writes,
+        profile=profile,
+    ) as writer:
+        if resumed is not None:
+            for (table, date), batches in resumed.buffered.items():
+                for batch in batches:
+                    writer.buffer(table, date, batch)
+
+        days = _timed_days(profile, iter_call_center(simulation_config, workers=workers, state=state))
+        for day in _fingerprinted_days(profile, fingerprint, days):
+            writer.write_day(day)
+            # every checkpoint_interval days and after the last day, at a day boundary: the state only matches the
+            # written output there (block boundaries in parallel mode)
+            last_day = day.date >= simulation_config.global_end_date
+            due = last_day or (day.date - last_checkpoint).days >= checkpoint_interval
+            if checkpoint and due and state.next_day == day.date + datetime.timedelta(days=1):
+                last_checkpoint = day.date
+                writer.flush(before=state.next_day)
+                with profile.phase("checkpoint.sync"):
+                    writer.sync()
+                with profile.phase("checkpoint.save"):
+                    save_checkpoint(
+                        parquet_output_dir,
+                        Checkpoint(
+                            config=simulation_config,
+                            last_day=day.date,
+                            state=state,
+                            buffered=writer.buffered(),
+                            fingerprint=fingerprint,
+                        ),
+                    )
+    logger.info(f"Wrote {writer.rows_written} rows to {writer.files_written} parquet files")
+    _write_manifest(fingerprint, simulation_config, parquet_output_dir)
+
+    if cache_key is not None:
+        with profile.phase("cache.store"):
+            stored = dataset_cache.store(cache_key, simulation_config, parquet_output_dir, seed_output_dir)
+        if stored:
+            logger.info(f"Cached the simulated dataset ({cache_key[:12]})")
+
+
+def _timed_days(profile: RunProfile, days: Iterator[DayBatches]) -> Iterator[DayBatches]:
+    """Record how long each day takes to simulate (in ``profile``, and in the log)."""
+    for day, seconds in profile.timed("simulate", days, rows=lambda day: day.calls.num_rows):
+        profile.days.append({"date": day.date, "seconds": seconds, "calls": day.calls.num_rows})
+        logger.info(f"Simulated {day.date}: {day.calls.num_rows} calls in {seconds:.3f}s")
+        yield day
+
+
+def _fingerprinted_days(
+    profile: RunProfile, fingerprint: RunFingerprint, days: Iterator[DayBatches]
+) -> Iterator[DayBatches]:
+    """Add each day to the run's content fingerprint as it streams past (see fingerprint.py)."""
+    for day in days:
+        with profile.phase("fingerprint", rows=day.num_rows):
+            fingerprint.add_day(day)
+        yield day
+
+
+def _write_manifest(fingerprint: RunFingerprint, simulation_config: SimulationConfig, output_dir: str | Path) -> None:
+    config_fingerprint = simulation_config.fingerprint(exclude=NON_OUTPUT_CONFIG_FIELDS)
+    path = fingerprint.write_manifest(Path(output_dir) / MANIFEST_FILE, config_fingerprint=config_fingerprint)
+    logger.info(f"Wrote the run manifest to {path}")
+
+
+def _has_table_data(parquet_output_dir: str | Path) -> bool:
+    return any(any((Path(parquet_output_dir) / table).rglob("*.parquet")) for table in TABLE_SCHEMAS)
+
+
+def iter_call_center(
+    simulation_config: SimulationConfig = DEFAULT_CONFIG,
+    agents: pd.DataFrame | None = None,
+    customers: pd.DataFrame | None = None,
+    workers: int = 1,
+    state: SimulationState | None = None,
+) -> Iterator[DayBatches]:
+    """Simulate the configured date range, yielding each day's calls, crm and surveys as Arrow record batches.
+
+    Only the day being yielded is held in memory (a block of days per shard in parallel vectorized mode), so the
+    stream can be fed straight into DuckDB, a socket or a benchmark without writing parquet files.
+    ``simulate_call_center`` is this stream plus a ``PartitionWriter``.
+
+    Args:
+        simulation_config: Simulation parameters, including the engine.
+        agents: Agents dimension (generated from the config if None; unused when ``state`` is given).
+        customers: Customers dimension (generated from the config if None; unused when ``state`` is given).
+        workers: Processes used for bulk customer generation and parallel vectorized shards.
+        state: Engine state to continue from (see ``initial_state``); advanced in place as days are yielded.
+    """
+    if state is None:
+        if agents is None:
+            agents = simulation_config.generate_agents()
+        if customers is None:
+            customers = simulation_config.generate_customers(workers=workers)
+        state = initial_state(simulation_config, agents=agents, customers=customers)
+
+    if simulation_config.engine == "vectorized":
+        yield from iter_days_vectorized(simulation_config=simulation_config, state=state, workers=workers)
+    else:
+        yield from _iter_days_loop(simulation_config=simulation_config, state=state)
+
+
+@dataclass
+class LoopState:
+    """Carry-over state of the loop engine between days (checkpointed by ``simulate_call_center``)."""
+
+    next_day: datetime.date
+    agent_ids: list[int]
+    customer_store: CustomerStore
+    rng: np.random.Generator
+    pending_callbacks: CallbackScheduler
+    call_id: int = 0
+    crm_id: int = 0
+    survey_id: int = 0
+
+
+SimulationState = LoopState | VectorizedState
+
+
+def initial_state(
+    simulation_config: SimulationConfig, agents: pd.DataFrame, customers: pd.DataFrame
+) -> SimulationState:
+    """Engine state before the first simulated day."""
+    if simulation_config.engine == "vectorized":
+        return initial_vectorized_state(simulation_config, agents=agents, customers=customers)
+    return LoopState(
+        next_day=simulation_config.global_start_date,
+        agent_ids=agents["agent_id"].tolist(),
+        customer_store=CustomerStore.from_frame(
+            customers,
+            program_codes=simulation_config.reason_sampler.program_codes,
+            available_from_us=epoch_us(simulation_config.global_start_date),
+        ),
+        rng=np.random.default_rng(simulation_config.rng_seed),
+        pending_callbacks=CallbackScheduler(),
+    )
+
+
+def _iter_days_loop(simulation_config: SimulationConfig, state: LoopState) -> Iterator[DayBatches]:
+    """Reference engine: simulates every call one at a time with scalar draws, from ``state.next_day`` on.
+
+    The clock is int64 epoch microseconds (advanced exactly as timezone-aware datetimes plus timedeltas would be) and
+    rows go straight into per-column lists, so no datetime or per-row dict is kept for a day's records.
+    """
+    rng, customer_store, pending_callbacks, agent_ids = (
+        state.rng,
+        state.customer_store,
+        state.pending_callbacks,
+        state.agent_ids,
+    )
+    call_id_counter, crm_id_counter, survey_id_counter = state.call_id, state.crm_id, state.survey_id
+    program_names = simulation_config.reason_sampler.program_names
+
+    for day in pd.date_range(state.next_day, simulation_config.global_end_date):
         logger.info(f"Simulation start for day: {day.date()}")
         logger.info(f"calls: {call_id_counter}")
         logger.info(f"crm: {crm_id_counter}")
@@ -299,66 +665,67 @@ def simulate_call_center(
         seasonal_mult = 1 + simulation_config.seasonality_amplitude * np.cos(2 * np.pi * (day_in_month / days_in_month))
         volume_mult = weekday_mult * seasonal_mult
 
-        day_calls, day_crm = [], []
-        day_surveys_by_date = {}  # key = survey_date, value = list of surveys
+        day_calls, day_crm = ColumnBuffer("calls"), ColumnBuffer("crm")
+        day_surveys_by_day = {}  # key = response day (days since the epoch), value = surveys responded that day
+        workday_start_us = epoch_us(day_date) + simulation_config.workday_start * US_PER_HOUR
 
-        todays_callbacks = [cb for cb in pending_callbacks if cb["day"] == day_date]
+        todays_callbacks = pending_callbacks.pop_day(day_date)
 
-        for _, agent_id in agents["agent_id"].items():
+        for agent_pos, agent_id in enumerate(agent_ids):
             n_calls = int(simulation_config.calls_per_agent_per_day * volume_mult)
-            start_time = datetime.datetime.combine(
-                day_date, datetime.time.min, tzinfo=datetime.UTC
-            ) + datetime.timedelta(hours=simulation_config.workday_start)
+            start_us = workday_start_us
 
-            agent_callbacks = [cb for cb in todays_callbacks if cb["agent_id"] == agent_id]
+            agent_callbacks = todays_callbacks.get(agent_id, [])
             work_items = ["new"] * n_calls + agent_callbacks
             rng.shuffle(work_items)
 
             for item in work_items:
                 hold_time = simulate_hold_time(rng)
                 inter_arrival = rng.exponential(scale=simulation_config.mean_seconds_between_calls)
-                start_time = start_time + datetime.timedelta(seconds=hold_time + inter_arrival)
+                start_us += seconds_to_us(hold_time + inter_arrival)
 
                 if item != "new" and isinstance(item, dict):  # callback
                     customer_id = item["customer_id"]
-                    customer = customers[customers["customer_id"] == customer_id]
+                    customer_pos = customer_store.position(customer_id)
                     reason, subreason = item["reason"], item["subreason"]
                     previous_issue_flag = rng.random() < simulation_config.previous_issue_rate
                     reason, subreason, duration = get_call_reasons_plus_duration(
                         simulation_config=simulation_config,
-                        program_key=customer["program"].item(),
+                        program_key=program_names[customer_store.program_codes[customer_pos]],
                         rng=rng,
                         reason=reason,
                         subreason=subreason,
                     )
 
                 else:  # Select a free customer (fixed attempts)
-                    customer = None
-                    customer_id = None
+                    # One scalar draw per attempt (rather than CustomerStore.draw_free) keeps this engine's
+                    # random stream, and therefore the reference dataset, unchanged.
+                    customer_pos = None
 
-                    for _ in range(15):
-                        customer_idx = rng.integers(0, len(customers))
-                        customer = customers.iloc[[customer_idx]]
-                        customer_id = customer["customer_id"].item()
+                    for _ in range(CUSTOMER_DRAW_ATTEMPTS):
+                        customer_pos = int(rng.integers(0, len(customer_store)))
 
-                        if start_time >= customer_busy_until[customer_id]:
+                        if start_us >= customer_store.busy_until_us[customer_pos]:
                             break
 
-                    if customer is None:
-                        raise RuntimeError(f"No free customer found after 15 attempts at {start_time}")
+                    if customer_pos is None:
+                        raise RuntimeError(
+                            f"No free customer found after {CUSTOMER_DRAW_ATTEMPTS} attempts at {start_us} (epoch us)"
+                        )
 
+                    customer_id = int(customer_store.customer_ids[customer_pos])
                     reason, subreason, duration = get_call_reasons_plus_duration(
                         simulation_config=simulation_config,
-                        program_key=customer["program"].item(),
+                        program_key=program_names[customer_store.program_codes[customer_pos]],
                         rng=rng,
                     )
                     previous_issue_flag = False
 
-                end_ts = start_time + datetime.timedelta(seconds=duration)
-                customer_busy_until[customer_id] = end_ts
+                end_us = start_us + duration * US_PER_SECOND
+                customer_store.busy_until_us[customer_pos] = end_us
 
-                # Stop work items if there isn't enough time in workday
-                if end_ts.hour >= simulation_config.workday_end:
+                # Stop work items if there isn't enough time in workday (hour of day, UTC)
+                if (end_us // US_PER_HOUR) % 24 >= simulation_config.workday_end:
                     break
 
                 transfer = rng.random() < simulation_config.transfer_rate
@@ -368,41 +735,37 @@ def simulate_call_center(
                 # Telephony record
                 call_id_counter += 1
                 call_id = call_id_counter
-                call = {
-                    "call_id": call_id,
-                    "agent_id": agent_id,
-                    "customer_id": customer_id,
-                    "queue_hold_time": hold_time,
-                    "start_ts": start_time,
-                    "end_ts": end_ts,
-                    "duration_s": duration,
-                    "hold_time_during_call_s": hold_time_during_call,
-                    "transfer_flag": transfer,
-                }
-
-                day_calls.append(call)
+                day_calls.append(
+                    call_id=call_id,
+                    agent_id=agent_id,
+                    customer_id=customer_id,
+                    queue_hold_time=hold_time,
+                    start_ts=start_us,
+                    end_ts=end_us,
+                    duration_s=duration,
+                    hold_time_during_call_s=hold_time_during_call,
+                    transfer_flag=transfer,
+                )
 
                 # CRM record
                 crm_id_counter += 1
-                crm = {
-                    "crm_id": crm_id_counter,
-                    "agent_id": agent_id,
-                    "call_id": call_id,
-                    "customer_id": customer_id,
-                    "reason_code": reason,
-                    "sub_reason_code": subreason,
-                    "previous_issue_flag": previous_issue_flag,
-                    "created_ts": start_time,
-                }
-
-                day_crm.append(crm)
+                day_crm.append(
+                    crm_id=crm_id_counter,
+                    agent_id=agent_id,
+                    call_id=call_id,
+                    customer_id=customer_id,
+                    reason_code=reason,
+                    sub_reason_code=subreason,
+                    previous_issue_flag=previous_issue_flag,
+                    created_ts=start_us,
+                )
 
                 if rng.random() < simulation_config.survey_rate:
                     survey_id_counter += 1
-                    response_ts = (
-                        end_ts
-                        + datetime.timedelta(seconds=float(rng.integers(15, 60, endpoint=True)))
-                        + datetime.timedelta(days=float(rng.integers(0, 4, endpoint=True)))
+                    response_us = (
+                        end_us
+                        + int(rng.integers(15, 60, endpoint=True)) * US_PER_SECOND
+                        + int(rng.integers(0, 4, endpoint=True)) * US_PER_DAY
                     )
                     csat = int(
                         np.clip(
@@ -414,61 +777,80 @@ def simulate_call_center(
                     nps = generate_nps(
                         rng=rng, transfer=transfer, hold_time=hold_time, previous_issue_flag=previous_issue_flag
                     )
-                    survey = {
-                        "survey_id": survey_id_counter,
-                        "call_id": call_id,
-                        "agent_id": agent_id,
-                        "customer_id": customer_id,
-                        "sent_ts": end_ts + datetime.timedelta(seconds=5),
-                        "response_ts": response_ts,
-                        "csat": csat,
-                        "nps": nps,
-                    }
-
-                    day_surveys_by_date.setdefault(response_ts.date(), []).append(survey)
+                    response_day = response_us // US_PER_DAY
+                    if response_day not in day_surveys_by_day:
+                        day_surveys_by_day[response_day] = ColumnBuffer("surveys")
+                    day_surveys_by_day[response_day].append(
+                        survey_id=survey_id_counter,
+                        call_id=call_id,
+                        agent_id=agent_id,
+                        customer_id=customer_id,
+                        sent_ts=end_us + 5 * US_PER_SECOND,
+                        response_ts=response_us,
+                        csat=csat,
+                        nps=nps,
+                    )
 
                 if item == "new" and rng.random() < simulation_config.callback_rate:
                     days_out = int(rng.integers(1, 6, endpoint=True))
                     future_day = day_date + datetime.timedelta(days=days_out)
-                    if future_day <= simulation_config.global_end_date:
-                        other_agents = agents[agents["agent_id"] != agent_id]
-                        cb_agent = other_agents.iloc[[rng.integers(0, len(other_agents))]]
-                        # TODO: Sometimes use a different call reason/sub reason?
-                        pending_callbacks.append({
-                            "day": future_day,
+                    # scheduled even past global_end_date, so that extending the date range reproduces an
+                    # uninterrupted run
+                    cb_agent_id = agent_ids[random_other_agent(rng, len(agent_ids), agent_pos)]
+                    # TODO: Sometimes use a different call reason/sub reason?
+                    pending_callbacks.schedule(
+                        day=future_day,
+                        agent_id=cb_agent_id,
+                        callback={
                             "customer_id": customer_id,
                             "reason": reason,
                             "subreason": subreason,
-                            "agent_id": cb_agent["agent_id"].item(),
-                        })
-                        # reserve the customer until the callback day starts (prevents being chosen before)
-                        customer_busy_until[customer_id] = datetime.datetime.combine(
-                            future_day, datetime.time.min, tzinfo=datetime.UTC
-                        )
+                            "agent_id": cb_agent_id,
+                        },
+                    )
+                    # reserve the customer until the callback day starts (prevents being chosen before)
+                    customer_store.busy_until_us[customer_pos] = epoch_us(future_day)
                 # need to kick off the next call as another time after the duration of the call
-                # so the inter-arrival time will get added next time start_time is reassigned
-                start_time = end_ts
-
-        # write daily calls/crm
-        write_daily_parquet(records=day_calls, output_dir=parquet_output_dir, table="calls", date=day_date)
-        write_daily_parquet(records=day_crm, output_dir=parquet_output_dir, table="crm", date=day_date)
-
-        # write daily survey data based on response date
-        # should get multiple files in directory because of the randomness of responses by day of call
-        for survey_date, surveys in day_surveys_by_date.items():
-            write_daily_parquet(records=surveys, output_dir=parquet_output_dir, table="surveys", date=survey_date)
+                # so the inter-arrival time will get added next time start_us is advanced
+                start_us = end_us
+
+        state.next_day = day_date + datetime.timedelta(days=1)
+        state.call_id, state.crm_id, state.survey_id = call_id_counter, crm_id_counter, survey_id_counter
+        yield DayBatches(
+            date=day_date,
+            calls=day_calls.to_record_batch(),
+            crm=day_crm.to_record_batch(),
+            surveys={epoch_day_to_date(d): surveys.to_record_batch() for d, surveys in day_surveys_by_day.items()},
+        )
 
 
 def main(**overrides):
     """Run the call center simulation with optional config overrides."""
-    config_overrides = {k: v for k, v in overrides.items() if k not in ["seed_output_dir", "parquet_output_dir"]}
-    config = DEFAULT_CONFIG.with_overrides(**config_overrides) if config_overrides else DEFAULT_CONFIG
+    run_options = [
+        "seed_output_dir",
+        "parquet_output_dir",
+        "workers",
+        "sink",
+        "duckdb_databases",
+        "checkpoint",
+        "checkpoint_interval",
+        "resume",
+        "dataset_cache",
+        "profiler",
+    ]
+    config_overrides = {k: v for k, v in overrides.items() if k not in run_options}
+    scale_factor = config_overrides.pop("scale_factor", None)
+    resumed = load_checkpoint(overrides.get("parquet_output_dir", "../data")) if overrides.get("resume") else None
+    if resumed is not None:
+        # continue with the checkpointed config; overrides (e.g. a later global_end_date) apply on top of it
+        config = resumed.config.with_overrides(**config_overrides)
+    elif scale_factor is not None:
+        config = SimulationConfig.at_scale(scale_factor, **config_overrides)
+    else:
+        config = DEFAULT_CONFIG.with_overrides(**config_overrides) if config_overrides else DEFAULT_CONFIG
 
     sim_kwargs = {"simulation_config": config}
-    if "seed_output_dir" in overrides:
-        sim_kwargs["seed_output_dir"] = overrides["seed_output_dir"]
-    if "parquet_output_dir" in overrides:
-        sim_kwargs["parquet_output_dir"] = overrides["parquet_output_dir"]
+    sim_kwargs.update({k: overrides[k] for k in run_options if k in overrides})
 
     start_time = datetime.datetime.now()
     simulate_call_center(**sim_kwargs)
@@ -0,0 +1,40 @@
+"""Callback bookkeeping for the call center simulation."""
+
+from __future__ import annotations
+
+import datetime
+from typing import Any
+
+import numpy as np
+
+
+class CallbackScheduler:
+    """Pending callbacks bucketed by (day, agent_id).
+
+    Callbacks are scheduled into a per-day bucket of per-agent lists. Each simulated day pops its bucket in O(1),
+    which also releases the memory for that day, so the scheduler only ever holds callbacks for days that have not
+    been simulated yet. Within an agent's list, callbacks keep the order they were scheduled in.
+    """
+
+    def __init__(self) -> None:
+        self._by_day: dict[datetime.date, dict[int, list[dict[str, Any]]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(callbacks) for by_agent in self._by_day.values() for callbacks in by_agent.values())
+
+    def schedule(self, day: datetime.date, agent_id: int, callback: dict[str, Any]) -> None:
+        self._by_day.setdefault(day, {}).setdefault(agent_id, []).append(callback)
+
+    def pop_day(self, day: datetime.date) -> dict[int, list[dict[str, Any]]]:
+        """Remove and return the callbacks due on ``day``, keyed by the agent who handles them."""
+        return self._by_day.pop(day, {})
+
+
+def random_other_agent(rng: np.random.Generator, agent_count: int, agent_pos: int) -> int:
+    """Draw the position of a uniformly random agent other than the one at ``agent_pos``, in O(1).
+
+    Draws from the ``agent_count - 1`` other positions and skips over ``agent_pos``. This consumes the generator the
+    same way as drawing an index into the agents table with ``agent_pos`` filtered out.
+    """
+    other_pos = int(rng.integers(0, agent_count - 1))
+    return other_pos + (other_pos >= agent_pos)
@@ -0,0 +1,192 @@
+"""Local cache of simulated datasets, keyed by everything that determines their content.
+
+The simulation is seeded and deterministic, so the parquet partitions and seed files produced for a config only
+change when the config, the simulator code or the libraries that draw / encode the data change. ``DatasetCache``
+stores each generated dataset under a hash of those inputs; a later run with the same inputs restores the files
+instead of simulating again.
+
+Cache layout (``<root>`` defaults to ``~/.cache/mds/datasets``, or ``$MDS_DATASET_CACHE_DIR``)::
+
+    <root>/<key>/entry.json      key inputs, size, creation time; its mtime is the entry's last use (LRU)
+    <root>/<key>/data/...        <table>/day=YYYY-MM-DD/part-NNNN-<table>.parquet, _checkpoint.pkl, _manifest.json
+    <root>/<key>/seeds/*         the dbt seed files (.csv or .parquet, see ``SimulationConfig.seed_format``)
+
+Data files are hard-linked between the cache and the output directory when both are on the same filesystem (copied
+otherwise). That is safe because nothing rewrites them in place: new rows go to new part files, ``compact``/``reset``
+unlink files rather than truncate them, and a resumed run replaces ``_checkpoint.pkl`` and ``_manifest.json`` with
+``os.replace``. Seed files are always copied, since every run rewrites them in place.
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import shutil
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from mds.data_generation.checkpoint import CHECKPOINT_FILE
+from mds.data_generation.fingerprint import MANIFEST_FILE
+from mds.data_generation.writers import TABLE_SCHEMAS
+
+if TYPE_CHECKING:
+    from mds.data_generation.call_center_simulation import SimulationConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("MDS_DATASET_CACHE_DIR", Path.home() / ".cache" / "mds" / "datasets"))
+DEFAULT_MAX_BYTES = int(os.environ.get("MDS_DATASET_CACHE_MAX_BYTES", 5 * 1024**3))
+
+SEEDS = ("agents", "managers", "customers", "agent_assignments")
+
+# Config fields that never change the generated files (output_dir, write_csv, write_parquet and tables are not read
+# by the simulation: the output goes where simulate_call_center's arguments say)
+NON_OUTPUT_CONFIG_FIELDS = frozenset({"background_writes", "output_dir", "write_csv", "write_parquet", "tables"})
+
+# Libraries whose versions can change the drawn values or the parquet encoding
+KEY_LIBRARIES = ("numpy", "pandas", "pyarrow", "faker")
+
+ENTRY_FILE = "entry.json"
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Hash of the simulator's source files and of the versions of the libraries that shape its output."""
+    digest = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    for library in KEY_LIBRARIES:
+        digest.update(f"{library}=={metadata.version(library)}".encode())
+    return digest.hexdigest()
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if dst.exists():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:  # different filesystem, or links not supported
+        shutil.copy2(src, dst)
+
+
+def _data_files(parquet_dir: Path) -> list[Path]:
+    files = [f for table in TABLE_SCHEMAS for f in sorted((parquet_dir / table).rglob("*.parquet"))]
+    files.extend(parquet_dir / name for name in (CHECKPOINT_FILE, MANIFEST_FILE) if (parquet_dir / name).exists())
+    return files
+
+
+class DatasetCache:
+    """Content-addressed store of generated datasets with least-recently-used eviction.
+
+    Args:
+        root: Directory holding the cache entries.
+        max_bytes: Total size the entries may take up. Storing an entry evicts the least recently used ones until
+            the cache fits; a dataset larger than this is not cached at all.
+    """
+
+    def __init__(self, root: str | Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def key(self, simulation_config: SimulationConfig) -> str:
+        config_hash = simulation_config.fingerprint(exclude=NON_OUTPUT_CONFIG_FIELDS)
+        return hashlib.sha256(f"{config_hash}:{code_version()}".encode()).hexdigest()
+
+    def restore(self, key: str, parquet_output_dir: str | Path, seed_output_dir: str | Path) -> bool:
+        """Put the cached dataset ``key`` into the output directories. Returns False if it is not cached."""
+        entry = self.root / key
+        if not (entry / ENTRY_FILE).exists():
+            return False
+        for src in _data_files(entry / "data"):
+            _link_or_copy(src, Path(parquet_output_dir) / src.relative_to(entry / "data"))
+        Path(seed_output_dir).mkdir(parents=True, exist_ok=True)
+        for src in sorted((entry / "seeds").iterdir()):
+            shutil.copyfile(src, Path(seed_output_dir) / src.name)
+        (entry / ENTRY_FILE).touch()
+        return True
+
+    def store(
+        self,
+        key: str,
+        simulation_config: SimulationConfig,
+        parquet_output_dir: str | Path,
+        seed_output_dir: str | Path,
+    ) -> bool:
+        """Add the dataset in the output directories to the cache as ``key``. Returns False if it was not stored.
+
+        Only datasets with a checkpoint are stored: resuming or extending a restored dataset needs one.
+        """
+        entry = self.root / key
+        if entry.exists():
+            return True
+        parquet_output_dir = Path(parquet_output_dir)
+        if not (parquet_output_dir / CHECKPOINT_FILE).exists():
+            logger.info("Not caching the dataset: it has no checkpoint to resume or extend it from")
+            return False
+        data_files = _data_files(parquet_output_dir)
+        seed_files = [Path(seed_output_dir) / f"{name}.{simulation_config.seed_format}" for name in SEEDS]
+        size = sum(f.stat().st_size for f in data_files + seed_files)
+        if size > self.max_bytes:
+            logger.info(f"Not caching the dataset: {size} bytes exceeds the cache limit of {self.max_bytes} bytes")
+            return False
+
+        # build the entry under a temporary name so that readers only ever see complete entries
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_entry = self.root / f".tmp-{key}-{os.getpid()}"
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        for src in data_files:
+            _link_or_copy(src, tmp_entry / "data" / src.relative_to(parquet_output_dir))
+        (tmp_entry / "seeds").mkdir(parents=True)
+        for src in seed_files:
+            shutil.copyfile(src, tmp_entry / "seeds" / src.name)
+        (tmp_entry / ENTRY_FILE).write_text(
+            json.dumps(
+                {
+                    "config": repr(simulation_config),
+                    "code_version": code_version(),
+                    "size_bytes": size,
+                    "created_at": datetime.datetime.now(datetime.UTC).isoformat(),
+                },
+                indent=2,
+            )
+        )
+        try:
+            tmp_entry.rename(entry)
+        except OSError:  # stored concurrently by another run
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+        self.evict()
+        return True
+
+    def entries(self) -> list[tuple[Path, float, int]]:
+        """(entry dir, last used time, size in bytes) of every complete entry, least recently used first."""
+        if not self.root.exists():
+            return []
+        entries = []
+        for entry_file in self.root.glob(f"*/{ENTRY_FILE}"):
+            size = json.loads(entry_file.read_text())["size_bytes"]
+            entries.append((entry_file.parent, entry_file.stat().st_mtime, size))
+        return sorted(entries, key=lambda e: e[1])
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits in ``max_bytes``. Returns the number deleted."""
+        entries = self.entries()
+        total = sum(size for _, _, size in entries)
+        evicted = 0
+        for entry, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        """Delete every cache entry."""
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,184 @@
+"""Bulk generation of the customers, agents and managers dimensions.
+
+``SimulationConfig.generate_customers`` calls Faker several times per customer, which is fine for the course dataset
+but far too slow for millions of rows. The bulk generator instead samples a vocabulary from Faker once per seed
+(names, states and zip codes per state), then draws every column as a NumPy array of indices into that vocabulary.
+
+Output is deterministic for a given (faker seed, random seed) and does not depend on the number of workers: rows
+are generated in fixed-size shards, each with its own child stream of ``np.random.SeedSequence(random_seed)``.
+
+``distribute_agents_to_managers_bulk`` is the columnar counterpart of ``distribute_agents_to_managers``: the same
+assignment model (round-robin start, up to ``avg_reassignments`` distinct change days per agent, each change to a
+different manager) drawn as integer arrays instead of per-agent Python loops.
+"""
+
+from __future__ import annotations
+
+import datetime
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from faker import Faker
+
+from mds.data_generation.constants import SENTINEL_END_DATE
+
+# Rows generated per shard (and per process pool task). Part of the output contract: changing it changes the data.
+BULK_SHARD_ROWS = 250_000
+
+# Number of Faker samples drawn into each vocabulary pool
+NAME_POOL_SIZE = 5_000
+ZIP_POOL_SIZE = 200
+
+
+@dataclass(frozen=True)
+class FakerVocabulary:
+    """Pools of Faker samples. Drawing uniformly from a pool reproduces Faker's own (weighted) distribution."""
+
+    first_names: np.ndarray
+    last_names: np.ndarray
+    states: np.ndarray
+    zip_codes_by_state: dict[str, np.ndarray]
+
+
+@functools.lru_cache(maxsize=8)
+def faker_vocabulary(faker_seed: int) -> FakerVocabulary:
+    """Sample the vocabulary pools from a seeded Faker instance (cached per seed and process)."""
+    fake = Faker()
+    fake.seed_instance(faker_seed)
+
+    first_names = np.array([fake.first_name() for _ in range(NAME_POOL_SIZE)], dtype=object)
+    last_names = np.array([fake.last_name() for _ in range(NAME_POOL_SIZE)], dtype=object)
+    states = np.array(
+        [
+            fake.state_abbr(include_territories=False, include_freely_associated_states=False)
+            for _ in range(NAME_POOL_SIZE)
+        ],
+        dtype=object,
+    )
+    zip_codes_by_state = {
+        state: np.array([fake.zipcode_in_state(state_abbr=state) for _ in range(ZIP_POOL_SIZE)], dtype=object)
+        for state in sorted(set(states))
+    }
+    return FakerVocabulary(first_names, last_names, states, zip_codes_by_state)
+
+
+def _shard_rngs(random_seed: int, count: int) -> list[tuple[int, int, np.random.SeedSequence]]:
+    """(first row, row count, seed sequence) for each fixed-size shard of ``count`` rows."""
+    starts = range(0, max(count, 1), BULK_SHARD_ROWS)
+    seed_sequences = np.random.SeedSequence(random_seed).spawn(len(starts))
+    return [
+        (start, min(BULK_SHARD_ROWS, count - start), seed_sequence)
+        for start, seed_sequence in zip(starts, seed_sequences, strict=True)
+    ]
+
+
+def _customer_shard(
+    faker_seed: int,
+    program_names: list[str],
+    birth_date_bounds: tuple[datetime.date, datetime.date],
+    start: int,
+    count: int,
+    seed_sequence: np.random.SeedSequence,
+) -> pd.DataFrame:
+    vocabulary = faker_vocabulary(faker_seed)
+    rng = np.random.default_rng(seed_sequence)
+
+    states = vocabulary.states[rng.integers(0, len(vocabulary.states), size=count)]
+    zip_codes = np.empty(count, dtype=object)
+    zip_draws = rng.integers(0, ZIP_POOL_SIZE, size=count)
+    for state, pool in vocabulary.zip_codes_by_state.items():
+        in_state = states == state
+        zip_codes[in_state] = pool[zip_draws[in_state]]
+
+    min_birth, max_birth = (np.datetime64(d, "D") for d in birth_date_bounds)
+    birth_offsets = rng.integers(0, (max_birth - min_birth).astype(int), size=count, endpoint=True)
+
+    return pd.DataFrame({
+        "customer_id": np.arange(start + 1, start + count + 1, dtype=np.int64),
+        "first_name": vocabulary.first_names[rng.integers(0, NAME_POOL_SIZE, size=count)],
+        "last_name": vocabulary.last_names[rng.integers(0, NAME_POOL_SIZE, size=count)],
+        "birth_date": min_birth + birth_offsets,
+        "state": states,
+        "zip_code": zip_codes,
+        "program": np.array(program_names, dtype=object)[rng.integers(0, len(program_names), size=count)],
+    })
+
+
+def generate_customers_bulk(
+    count: int,
+    program_names: list[str],
+    birth_date_bounds: tuple[datetime.date, datetime.date],
+    faker_seed: int,
+    random_seed: int,
+    workers: int = 1,
+) -> pd.DataFrame:
+    """Generate the customers dimension in columnar form, optionally sharded across ``workers`` processes."""
+    shards = _shard_rngs(random_seed, count)
+    args = [(faker_seed, program_names, birth_date_bounds, start, n, seq) for start, n, seq in shards]
+
+    if workers <= 1 or len(shards) == 1:
+        frames = [_customer_shard(*shard_args) for shard_args in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            frames = list(executor.map(_customer_shard, *zip(*args, strict=True)))
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def generate_names_bulk(count: int, faker_seed: int) -> np.ndarray:
+    """Full names ("First Last") for the agents and managers dimensions."""
+    vocabulary = faker_vocabulary(faker_seed)
+    rng = np.random.default_rng(faker_seed)
+    first = vocabulary.first_names[rng.integers(0, NAME_POOL_SIZE, size=count)]
+    last = vocabulary.last_names[rng.integers(0, NAME_POOL_SIZE, size=count)]
+    return first + " " + last
+
+
+def distribute_agents_to_managers_bulk(
+    agents: pd.DataFrame,
+    managers: pd.DataFrame,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    avg_reassignments: int = 2,
+    random_seed: int = 315,
+) -> pd.DataFrame:
+    """SCD-style agent -> manager assignments (``effective_start`` / ``effective_end``) in columnar form."""
+    shuffled_agent_ids = agents.sample(frac=1, random_state=42)["agent_id"].to_numpy()
+    manager_ids = managers["manager_id"].to_numpy()
+    n_agents, n_managers = len(shuffled_agent_ids), len(manager_ids)
+    n_days = (end_date - start_date).days + 1
+    max_changes = min(avg_reassignments, n_days)
+    rng = np.random.default_rng(random_seed)
+
+    n_changes = rng.integers(avg_reassignments + 1, size=n_agents).clip(max=max_changes)
+    # change days as day offsets; redraw the rows whose changes collide until every agent's days are distinct
+    draws = rng.integers(n_days, size=(n_agents, max_changes))
+    used = np.arange(max_changes) < n_changes[:, None]
+    while True:
+        # unused slots get distinct offsets past the end, so sorting leaves each row's changes first and in order
+        offsets = np.sort(np.where(used, draws, n_days + np.arange(max_changes)), axis=1)
+        collided = (np.diff(offsets, axis=1) == 0).any(axis=1)
+        if not collided.any():
+            break
+        draws[collided] = rng.integers(n_days, size=(collided.sum(), max_changes))
+
+    # segment j of an agent starts on its j-th change day and moves to a uniformly drawn *other* manager
+    steps = rng.integers(1, max(n_managers, 2), size=(n_agents, max_changes))
+    initial = np.arange(n_agents)[:, None] % n_managers  # round-robin over the shuffled agents
+    manager_idx = (initial + np.cumsum(np.hstack([np.zeros_like(initial), steps]), axis=1)) % n_managers
+
+    start = np.datetime64(start_date, "D")
+    segment_starts = np.hstack([np.full((n_agents, 1), start), start + offsets])
+    segment_ends = np.hstack([start + offsets - 1, np.full((n_agents, 1), start)])
+    segment_ends[np.arange(n_agents), n_changes] = np.datetime64(SENTINEL_END_DATE, "D")
+
+    in_use = np.arange(max_changes + 1) <= n_changes[:, None]
+    return pd.DataFrame({
+        "agent_id": np.repeat(shuffled_agent_ids, n_changes + 1),
+        "manager_id": manager_ids[manager_idx[in_use]],
+        "effective_start": segment_starts[in_use].astype("datetime64[us]"),
+        "effective_end": segment_ends[in_use].astype("datetime64[us]"),
+    })
@@ -0,0 +1,188 @@
+"""Direct-to-DuckDB sink for the simulated source tables.
+
+The regular path writes parquet files that dlt later ingests (``filesystem`` -> ``read_parquet`` -> normalize -> load)
+into one DuckDB database per table. For warehouse load testing only the raw rows matter, so ``DuckDBSink`` appends
+each simulated day's Arrow batches straight into those databases instead.
+
+The raw tables are laid out the way dlt's duckdb destination creates them, so the ``stg_*`` models run unchanged:
+    * ``<dataset>.<table>`` holds the table's columns plus ``_file_url`` (the source file of a row) and
+      ``_dlt_load_id``;
+    * ``<dataset>._dlt_loads`` gets one row per sink run (status 0 = loaded), whose ``load_id`` and ``inserted_at``
+      are what the staging models join and de-duplicate on.
+
+The sink and the ingestion loaders can fill the same databases. Each (table, partition day) a sink run writes is
+recorded in the loaders' file manifest, ``<dataset>._ingested_files``, under a ``duckdb-sink:`` file_url that is
+also the ``_file_url`` of its rows (see ``sink_file_url``). No such file is ever listed, so a later load of those
+days' parquet files treats the entries like files removed from their partitions and deletes their rows: the parquet
+rows replace the sink's instead of being loaded on top of them. Sinking days that were already loaded from parquet
+appends a second copy of them, as running the simulation twice into the same output would.
+"""
+
+from __future__ import annotations
+
+import datetime
+import time
+from collections.abc import Mapping
+from pathlib import Path
+
+import duckdb
+import pyarrow as pa
+
+from mds.data_generation.writers import TABLE_SCHEMAS, DayBatches
+
+# Table -> dlt dataset (DuckDB schema) used by the ingestion pipelines in analytics_system
+DLT_DATASETS = {"calls": "raw_calls", "crm": "raw_crm", "surveys": "raw_surveys"}
+
+# Schema name recorded in _dlt_loads; matches the dlt source that would have loaded the table
+DLT_SCHEMA_NAMES = {table: f"filesystem_{table}_source" for table in DLT_DATASETS}
+
+_DUCKDB_TYPES = {
+    pa.int64(): "BIGINT",
+    pa.string(): "VARCHAR",
+    pa.bool_(): "BOOLEAN",
+    pa.timestamp("us", tz="UTC"): "TIMESTAMP WITH TIME ZONE",
+}
+
+
+# Columns the ingestion loaders add to every raw table, next to the table's own
+_LOADER_COLUMNS = {"_file_url": "VARCHAR", "_dlt_load_id": "VARCHAR"}
+
+# File manifest of the ingestion loaders (MANIFEST_TABLE and MANIFEST_COLUMNS in analytics_system's bulk_loads.py)
+MANIFEST_TABLE = "_ingested_files"
+_MANIFEST_COLUMNS = {
+    "file_url": "VARCHAR",
+    "partition_date": "VARCHAR",
+    "size_in_bytes": "BIGINT",
+    "modification_date": "TIMESTAMP WITH TIME ZONE",
+    "num_rows": "BIGINT",
+    "footer_digest": "VARCHAR",
+    "checksum": "VARCHAR",
+    "duplicate_of": "VARCHAR",
+    "_dlt_load_id": "VARCHAR",
+    "_dlt_id": "VARCHAR",
+}
+
+
+def _table_columns(table: str) -> dict[str, str]:
+    return {**{f.name: _DUCKDB_TYPES[f.type] for f in TABLE_SCHEMAS[table]}, **_LOADER_COLUMNS}
+
+
+def sink_file_url(table: str, date: datetime.date, load_id: str) -> str:
+    """The ``_file_url`` and manifest file_url of the rows a sink run writes for one partition day of a table."""
+    return f"duckdb-sink:{table}/day={date.isoformat()}/{load_id}"
+
+
+def _ensure_table(con: duckdb.DuckDBPyConnection, dataset: str, table: str, columns: dict[str, str]) -> None:
+    """Creates a table, or adds the columns it lacks when a loader created it (as dlt's schema evolution does).
+
+    The ingestion loaders create the tables with the parquet columns in their own order, so rows are always inserted
+    by name.
+    """
+    column_defs = ", ".join(f'"{name}" {column_type}' for name, column_type in columns.items())
+    con.execute(f"CREATE TABLE IF NOT EXISTS {dataset}.{table} ({column_defs})")
+    for name, column_type in columns.items():
+        con.execute(f'ALTER TABLE {dataset}.{table} ADD COLUMN IF NOT EXISTS "{name}" {column_type}')
+
+
+_DLT_LOADS_DDL = """
+CREATE TABLE IF NOT EXISTS {dataset}._dlt_loads (
+    load_id VARCHAR NOT NULL,
+    schema_name VARCHAR,
+    status BIGINT NOT NULL,
+    inserted_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    schema_version_hash VARCHAR
+)
+"""
+
+
+class DuckDBSink:
+    """Appends simulated days into the raw ingest tables, one DuckDB database per table.
+
+    All rows of a run share one load id and are committed in a single transaction per database, together with the
+    ``_dlt_loads`` row and the run's manifest entries, when the sink is closed. A run that fails part-way leaves the
+    tables unchanged.
+
+    Args:
+        databases: DuckDB database path for each of "calls", "crm" and "surveys".
+    """
+
+    def __init__(self, databases: Mapping[str, str | Path]) -> None:
+        missing = set(DLT_DATASETS) - set(databases)
+        if missing:
+            raise ValueError(f"No DuckDB database given for table(s) {sorted(missing)}")
+        # same format as dlt load ids: the load's unix timestamp as a string
+        self.load_id = str(time.time())
+        self.rows_written = 0
+        # (table, partition day) -> rows written, recorded in the manifest on close
+        self._partition_rows: dict[tuple[str, datetime.date], int] = {}
+        self._connections: dict[str, duckdb.DuckDBPyConnection] = {}
+        for table, dataset in DLT_DATASETS.items():
+            con = duckdb.connect(str(databases[table]))
+            con.execute(f"CREATE SCHEMA IF NOT EXISTS {dataset}")
+            _ensure_table(con, dataset, table, _table_columns(table))
+            _ensure_table(con, dataset, MANIFEST_TABLE, _MANIFEST_COLUMNS)
+            con.execute(_DLT_LOADS_DDL.format(dataset=dataset))
+            con.begin()
+            self._connections[table] = con
+
+    def __enter__(self) -> DuckDBSink:
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write_day(self, day: DayBatches) -> None:
+        """Append one simulated day (surveys of every response date go to the same table)."""
+        self.append("calls", day.calls, day.date)
+        self.append("crm", day.crm, day.date)
+        for response_date, surveys in day.surveys.items():
+            self.append("surveys", surveys, response_date)
+
+    def append(self, table: str, batch: pa.RecordBatch, date: datetime.date) -> None:
+        """Append rows of the ``date`` partition of a table."""
+        if batch.num_rows == 0:
+            return
+        con = self._connections[table]
+        con.register("_sink_batch", batch)
+        con.execute(
+            f"INSERT INTO {DLT_DATASETS[table]}.{table} BY NAME "
+            "SELECT *, ? AS _file_url, ? AS _dlt_load_id FROM _sink_batch",
+            [sink_file_url(table, date, self.load_id), self.load_id],
+        )
+        con.unregister("_sink_batch")
+        self._partition_rows[table, date] = self._partition_rows.get((table, date), 0) + batch.num_rows
+        self.rows_written += batch.num_rows
+
+    def close(self) -> None:
+        """Record the load in ``_dlt_loads`` and the written partitions in the manifest, then commit every database."""
+        inserted_at = datetime.datetime.now(datetime.UTC)
+        for table, con in self._connections.items():
+            manifest_rows = [
+                (sink_file_url(table, date, self.load_id), date.isoformat(), inserted_at, num_rows, self.load_id)
+                for (partition_table, date), num_rows in sorted(self._partition_rows.items())
+                if partition_table == table
+            ]
+            if manifest_rows:
+                con.executemany(
+                    f"INSERT INTO {DLT_DATASETS[table]}.{MANIFEST_TABLE} "
+                    "(file_url, partition_date, modification_date, num_rows, _dlt_load_id, _dlt_id) "
+                    "VALUES (?, ?, ?, ?, ?, gen_random_uuid()::VARCHAR)",
+                    manifest_rows,
+                )
+            con.execute(
+                f"INSERT INTO {DLT_DATASETS[table]}._dlt_loads VALUES (?, ?, 0, ?, NULL)",
+                [self.load_id, DLT_SCHEMA_NAMES[table], inserted_at],
+            )
+            con.commit()
+            con.close()
+        self._connections = {}
+
+    def abort(self) -> None:
+        """Roll back everything appended by this sink."""
+        for con in self._connections.values():
+            con.rollback()
+            con.close()
+        self._connections = {}
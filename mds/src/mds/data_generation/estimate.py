@@ -0,0 +1,154 @@
+"""Pre-run size and runtime estimate for a simulation config.
+
+Row counts come from the simulation model itself, so they hold for both engines (within a few percent):
+    * every agent works through ``int(calls_per_agent_per_day * weekday * seasonality)`` new calls plus callbacks
+      (``callback_rate`` of yesterday's new calls), but only until a call would end after ``workday_end``. The
+      number of calls that fit is the renewal count of (queue hold + inter-arrival + duration) cycles in the workday,
+      with the mean duration taken from the ``programs`` reason/sub-reason mix;
+    * crm has one row per call and surveys ``survey_rate`` of the calls.
+
+Bytes use per-row sizes measured on snappy parquet partitions and on the seed files. Runtime is projected from
+benchmark results (``mds bench --output``): the per-call cost of the largest matching ``simulate_call_center``
+case (less the time it spent generating its customers), plus the rate of the largest matching ``generate_customers``
+case.
+"""
+
+from __future__ import annotations
+
+import calendar
+import datetime
+import json
+import math
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from mds.data_generation.call_center_simulation import SimulationConfig
+
+# Queue hold time before each call ~ Normal(45, 20) seconds (see simulate_hold_time)
+QUEUE_HOLD_MEAN_S = 45
+QUEUE_HOLD_STD_S = 20
+
+# Segments per agent in agent_assignments: 1 + mean of rng.integers(avg_reassignments + 1) with the default of 2
+ASSIGNMENT_SEGMENTS_PER_AGENT = 2
+
+# Bytes per row, measured on day-partitioned snappy parquet (a few thousand calls per day) and on the seed files
+PARQUET_BYTES_PER_ROW = {"calls": 36, "crm": 28, "surveys": 38}
+SEED_BYTES_PER_ROW = {
+    "csv": {"agents": 18, "managers": 21, "customers": 60, "agent_assignments": 28},
+    "parquet": {"agents": 22, "managers": 30, "customers": 13, "agent_assignments": 10},
+}
+
+
+def _duration_moments(simulation_config: SimulationConfig) -> tuple[float, float]:
+    """Mean and variance of a call's duration, for customers spread evenly over the programs."""
+    programs = list(simulation_config.programs.values())
+    mean = second_moment = 0.0
+    for program in programs:
+        for reason in program["reasons"]:
+            for sub_reason in reason["sub_reasons"]:
+                weight = reason["prob"] * sub_reason["prob"] / len(programs)
+                # durations are truncated to whole seconds and floored at min_call_length
+                leaf_mean = max(simulation_config.min_call_length, sub_reason["duration_mean"]) - 0.5
+                mean += weight * leaf_mean
+                second_moment += weight * (sub_reason["duration_std"] ** 2 + leaf_mean**2)
+    return mean, second_moment - mean**2
+
+
+def calls_per_agent_workday(simulation_config: SimulationConfig) -> float:
+    """Expected number of calls an agent with unlimited work items completes within the workday."""
+    duration_mean, duration_var = _duration_moments(simulation_config)
+    cycle_mean = QUEUE_HOLD_MEAN_S + simulation_config.mean_seconds_between_calls + duration_mean
+    cycle_var = QUEUE_HOLD_STD_S**2 + simulation_config.mean_seconds_between_calls**2 + duration_var
+    workday_s = (simulation_config.workday_end - simulation_config.workday_start) * 3600
+    # renewal theorem: E[N(t)] ~ t / mu + (sigma^2 - mu^2) / (2 mu^2)
+    return max(0.0, workday_s / cycle_mean + (cycle_var - cycle_mean**2) / (2 * cycle_mean**2))
+
+
+def estimate_rows(simulation_config: SimulationConfig) -> dict[str, int]:
+    """Expected row count of every output table."""
+    capacity = calls_per_agent_workday(simulation_config)
+    calls = 0.0
+    day = simulation_config.global_start_date
+    while day <= simulation_config.global_end_date:
+        days_in_month = calendar.monthrange(day.year, day.month)[1]
+        volume_mult = simulation_config.weekday_multipliers[day.weekday()] * (
+            1 + simulation_config.seasonality_amplitude * math.cos(2 * math.pi * (day.day / days_in_month))
+        )
+        new_calls = int(simulation_config.calls_per_agent_per_day * volume_mult)
+        work_items = new_calls * (1 + simulation_config.callback_rate)
+        calls += simulation_config.agents_count * min(work_items, capacity)
+        day += datetime.timedelta(days=1)
+
+    return {
+        "calls": round(calls),
+        "crm": round(calls),
+        "surveys": round(calls * simulation_config.survey_rate),
+        "agents": simulation_config.agents_count,
+        "managers": simulation_config.managers_count,
+        "customers": simulation_config.customers_count,
+        "agent_assignments": simulation_config.agents_count * ASSIGNMENT_SEGMENTS_PER_AGENT,
+    }
+
+
+def latest_bench_results(path: str | Path) -> dict[str, Any] | None:
+    """The benchmark results document at ``path``, or the most recent one in the directory ``path``."""
+    path = Path(path)
+    if path.is_file():
+        return json.loads(path.read_text())
+    documents = [json.loads(f.read_text()) for f in path.glob("*.json")] if path.is_dir() else []
+    return max(documents, key=lambda d: d.get("created_at", ""), default=None)
+
+
+def _largest_case(bench_results: dict[str, Any], benchmark: str, size_metric: str, **params: Any) -> dict | None:
+    cases = [
+        r
+        for r in bench_results.get("results", [])
+        if r["benchmark"] == benchmark
+        and size_metric in r["metrics"]
+        and all(r["params"].get(k, v) == v for k, v in params.items())
+    ]
+    return max(cases, key=lambda r: r["metrics"][size_metric], default=None)
+
+
+def estimate_seconds(
+    simulation_config: SimulationConfig, rows: dict[str, int], sink: str, bench_results: dict[str, Any]
+) -> float | None:
+    """Projected runtime from benchmark results, or None if they have no matching cases."""
+    simulated = _largest_case(
+        bench_results, "simulate_call_center", "calls", engine=simulation_config.engine, sink=sink
+    )
+    dimensions = _largest_case(
+        bench_results, "generate_customers", "rows", dimension_generator=simulation_config.dimension_generator
+    )
+    reference = _largest_case(bench_results, "generate_customers", "rows", dimension_generator="faker")
+    if simulated is None or dimensions is None or reference is None:
+        return None
+
+    # the simulate_call_center cases also generate their customers with faker; take that out of the per-call cost
+    params = simulated["params"]
+    # customers_count None = the SimulationConfig default of agents x calls_per_agent_per_day (60) x 20
+    bench_customers = params.get("customers_count") or params["agents_count"] * 60 * 20
+    bench_dimension_seconds = bench_customers / reference["metrics"]["rows_per_sec"]
+    simulated_seconds = max(simulated["metrics"]["seconds"] - bench_dimension_seconds, 0.0)
+    seconds_per_call = simulated_seconds / max(simulated["metrics"]["calls"], 1)
+    return rows["calls"] * seconds_per_call + rows["customers"] / dimensions["metrics"]["rows_per_sec"]
+
+
+def estimate_run(
+    simulation_config: SimulationConfig, sink: str = "parquet", bench_results: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """Expected rows and bytes per table and, given benchmark results, the projected runtime of a run."""
+    rows = estimate_rows(simulation_config)
+    seed_bytes = SEED_BYTES_PER_ROW[simulation_config.seed_format]
+    size = {table: rows[table] * seed_bytes[table] for table in seed_bytes}
+    if sink == "parquet":
+        size.update({table: rows[table] * per_row for table, per_row in PARQUET_BYTES_PER_ROW.items()})
+
+    return {
+        "rows": rows,
+        "bytes": size,
+        "total_bytes": sum(size.values()),
+        "seconds": estimate_seconds(simulation_config, rows, sink, bench_results) if bench_results else None,
+        "bench_commit": bench_results.get("git_commit") if bench_results else None,
+    }
@@ -0,0 +1,120 @@
+"""Streaming content fingerprints of the simulated tables, recorded in a run manifest.
+
+``RunFingerprint`` hashes the calls, crm and surveys record batches as the simulation emits them, so two runs can be
+checked for identical output by comparing a few hashes instead of writing and re-reading every file.
+
+A table's fingerprint depends on its values and row order only: each column is hashed as a stream of its values
+(and, for strings, of their lengths), so it does not change with how the rows are split into batches, nor with the
+sink, the parquet settings or the worker count. Rows are hashed in emission order, day by day; surveys in the order
+the days emit them, which is not their parquet partition order. Each day's digests are kept, so that a checkpoint
+can carry them (a resumed run ends with the same fingerprints as an uninterrupted one).
+
+``simulate_call_center`` writes the manifest to ``<parquet_output_dir>/_manifest.json``::
+
+    {"config_fingerprint": ..., "first_day": ..., "last_day": ...,
+     "tables": {"calls": {"rows": ..., "fingerprint": ...}, "crm": {...}, "surveys": {...}}}
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from mds.data_generation.writers import TABLE_SCHEMAS, DayBatches
+
+MANIFEST_FILE = "_manifest.json"
+
+DIGEST_SIZE = 16
+
+
+def _column_streams(array: pa.Array, row_offset: int) -> Iterable[tuple[str, Any]]:
+    """(stream, bytes-like) pieces of a column whose concatenation over consecutive batches is batch-independent."""
+    if array.null_count:
+        nulls = np.flatnonzero(~pc.is_valid(array).to_numpy(zero_copy_only=False)).astype(np.int64) + row_offset
+        yield "nulls", nulls
+        array = pc.fill_null(array, pa.scalar(0, pa.int64()).cast(array.type))
+
+    if pa.types.is_boolean(array.type):
+        yield "values", array.to_numpy(zero_copy_only=False)
+    elif pa.types.is_string(array.type) or pa.types.is_binary(array.type):
+        _, offsets, data = array.buffers()
+        offsets = np.frombuffer(offsets, dtype=np.int32)[array.offset : array.offset + len(array) + 1]
+        yield "lengths", np.diff(offsets)
+        yield "values", memoryview(data)[offsets[0] : offsets[-1]] if data is not None else b""
+    else:
+        width = array.type.bit_width // 8
+        yield "values", memoryview(array.buffers()[1])[array.offset * width : (array.offset + len(array)) * width]
+
+
+def fingerprint_batches(batches: Iterable[pa.RecordBatch]) -> tuple[int, str]:
+    """Row count and order-stable hash of the rows in ``batches`` (independent of how they are split into batches)."""
+    streams: dict[tuple[str, str], hashlib.blake2b] = {}
+    rows = 0
+    for batch in batches:
+        if batch.num_rows == 0:
+            continue
+        for name, column in zip(batch.schema.names, batch.columns, strict=True):
+            for stream, data in _column_streams(column, rows):
+                streams.setdefault((name, stream), hashlib.blake2b(digest_size=DIGEST_SIZE)).update(data)
+        rows += batch.num_rows
+
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for (name, stream), hasher in sorted(streams.items()):
+        digest.update(f"{name}.{stream}:".encode())
+        digest.update(hasher.digest())
+    return rows, digest.hexdigest()
+
+
+class RunFingerprint:
+    """Per-day (rows, digest) of every fact table, in the order the days were simulated."""
+
+    def __init__(self) -> None:
+        self.days: dict[str, list[tuple[datetime.date, int, str]]] = {table: [] for table in TABLE_SCHEMAS}
+
+    def add_day(self, day: DayBatches) -> None:
+        for table, batches in (("calls", [day.calls]), ("crm", [day.crm]), ("surveys", day.surveys.values())):
+            self.days[table].append((day.date, *fingerprint_batches(batches)))
+
+    def tables(self) -> dict[str, dict[str, Any]]:
+        """Total rows and fingerprint of each table over all the days added so far."""
+        tables = {}
+        for table, days in self.days.items():
+            digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+            for date, rows, day_digest in days:
+                digest.update(f"{date.isoformat()}:{rows}:{day_digest}\n".encode())
+            tables[table] = {"rows": sum(rows for _, rows, _ in days), "fingerprint": digest.hexdigest()}
+        return tables
+
+    def write_manifest(self, path: str | Path, config_fingerprint: str) -> Path:
+        """Write the run manifest as JSON. It only holds content-derived values, so equal runs write equal files.
+
+        The file is replaced rather than rewritten in place: it may be hard-linked into a dataset cache entry.
+        """
+        dates = [date for date, _, _ in self.days["calls"]]
+        manifest = {
+            "config_fingerprint": config_fingerprint,
+            "first_day": min(dates).isoformat() if dates else None,
+            "last_day": max(dates).isoformat() if dates else None,
+            "tables": self.tables(),
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp_path, path)
+        return path
+
+
+def read_manifest(output_dir: str | Path) -> dict[str, Any] | None:
+    """The run manifest in ``output_dir``, or None if there is none."""
+    path = Path(output_dir) / MANIFEST_FILE
+    return json.loads(path.read_text()) if path.exists() else None
@@ -1,3 +1,5 @@
+import datetime
+
 import numpy as np
 
 
@@ -23,3 +25,60 @@ def generate_nps(rng: np.random.Generator, transfer: bool, hold_time: int, previ
         return int(rng.choice([7, 8], p=[0.5, 0.5]))
     else:  # detractor
         return int(rng.integers(1, 7))
+
+
+def generate_nps_batch(
+    rng: np.random.Generator, transfer: np.ndarray, hold_time: np.ndarray, previous_issue_flag: np.ndarray
+) -> np.ndarray:
+    """Vectorized ``generate_nps``: one NPS score per survey, with the same category and score distributions.
+
+    Uses two uniforms per survey (category, then score within the category) instead of up to three ``rng.choice``
+    calls, so it is statistically equivalent to, but not draw-for-draw identical with, the scalar version.
+    """
+    poor_call = np.asarray(transfer) | (np.asarray(hold_time) > 120) | np.asarray(previous_issue_flag)
+    p_promoter = np.where(poor_call, 0.4, 0.6)
+    p_passive = 0.2
+
+    category_draw = rng.random(len(poor_call))
+    score_draw = rng.random(len(poor_call))
+    promoter = category_draw < p_promoter
+    passive = ~promoter & (category_draw < p_promoter + p_passive)
+
+    scores = 1 + (score_draw * 6).astype(np.int8)  # detractor: 1-6
+    scores[passive] = 7 + (score_draw[passive] * 2).astype(np.int8)  # passive: 7-8
+    scores[promoter] = 9 + (score_draw[promoter] * 2).astype(np.int8)  # promoter: 9-10
+    return scores
+
+
+def generate_csat_batch(
+    rng: np.random.Generator, transfer: np.ndarray, hold_time_during_call: np.ndarray
+) -> np.ndarray:
+    """CSAT scores (1-5) for a batch of surveys, centered on 2 for transferred calls with long holds and 4 otherwise."""
+    good_call = ~np.asarray(transfer) | (np.asarray(hold_time_during_call) < 60)
+    return np.clip(rng.normal(np.where(good_call, 4, 2), 1), 1, 5).astype(np.int8)
+
+
+US_PER_SECOND = 1_000_000
+US_PER_HOUR = 3_600 * US_PER_SECOND
+US_PER_DAY = 86_400 * US_PER_SECOND
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+
+
+def epoch_us(day: datetime.date) -> int:
+    """Microseconds since the unix epoch for midnight UTC of the given date."""
+    return (day - _EPOCH.date()).days * US_PER_DAY
+
+
+def epoch_day_to_date(epoch_day: int) -> datetime.date:
+    """Date of a day number counted from the unix epoch (``epoch_us // US_PER_DAY``)."""
+    return _EPOCH.date() + datetime.timedelta(days=int(epoch_day))
+
+
+def seconds_to_us(seconds: float) -> int:
+    """Whole microseconds in a non-negative number of seconds, rounded exactly like ``timedelta(seconds=seconds)``.
+
+    Splitting off the whole seconds first keeps the fractional part exact, so ties round half-to-even on the same
+    value datetime rounds (and clocks advanced in integer microseconds match ones advanced with timedelta).
+    """
+    whole = int(seconds)
+    return whole * US_PER_SECOND + round((seconds - whole) * US_PER_SECOND)
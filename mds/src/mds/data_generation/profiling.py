@@ -0,0 +1,148 @@
+"""Per-phase instrumentation of simulation runs.
+
+``simulate_call_center`` records every phase of a run in a ``RunProfile`` and writes it as JSON next to the output
+(``<parquet_output_dir>/_run_profile.json``):
+    * phases: wall time, number of timings, rows and bytes per phase (dimension generation, assignments, seed
+      writes, simulation, parquet writes per table, checkpoints, ...), plus the process peak RSS when each phase
+      last ended;
+    * days: wall time and call count of every simulated day.
+
+Parquet writes done on the background writer thread overlap with the simulation, so phase times can add up to
+more than the total. With ``workers > 1`` the simulation phase is the wall time spent waiting for the worker
+processes.
+
+``profiler`` additionally runs the whole simulation under cProfile (``_run_profile.pstats``, read it with
+``python -m pstats`` or snakeviz) or pyinstrument (``_run_profile.html``; needs ``pip install pyinstrument``).
+Both only see the main process.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import datetime
+import json
+import platform
+import threading
+import time
+from collections.abc import Callable, Generator, Iterable, Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_FILE = "_run_profile.json"
+PROFILERS = ("cprofile", "pyinstrument")
+
+T = TypeVar("T")
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process so far (None where the platform does not report it)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if platform.system() == "Darwin" else peak * 1024  # bytes on macOS, KiB on Linux
+
+
+@dataclass
+class PhaseStats:
+    seconds: float = 0.0
+    count: int = 0
+    rows: int = 0
+    bytes: int = 0
+    peak_rss_bytes: int | None = None
+
+
+class RunProfile:
+    """Accumulates per-phase timings and counts for one run. Safe to record into from several threads."""
+
+    def __init__(self) -> None:
+        self.started_at = datetime.datetime.now(datetime.UTC)
+        self.phases: dict[str, PhaseStats] = {}
+        self.days: list[dict[str, Any]] = []
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, phase: str, seconds: float, rows: int = 0, bytes: int = 0) -> None:
+        with self._lock:
+            stats = self.phases.setdefault(phase, PhaseStats())
+            stats.seconds += seconds
+            stats.count += 1
+            stats.rows += rows
+            stats.bytes += bytes
+            stats.peak_rss_bytes = peak_rss_bytes()
+
+    @contextlib.contextmanager
+    def phase(self, phase: str, rows: int = 0, bytes: int = 0) -> Generator[None]:
+        """Time the block as one occurrence of ``phase``."""
+        start = time.perf_counter()
+        yield
+        self.record(phase, time.perf_counter() - start, rows=rows, bytes=bytes)
+
+    def timed(
+        self, phase: str, items: Iterable[T], rows: Callable[[T], int] = lambda _: 0
+    ) -> Iterator[tuple[T, float]]:
+        """Yield (item, seconds) from ``items``, timing how long each item takes to produce (e.g. a simulated day)."""
+        iterator = iter(items)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            seconds = time.perf_counter() - start
+            self.record(phase, seconds, rows=rows(item))
+            yield item, seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "total_seconds": time.perf_counter() - self._start,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "phases": {name: asdict(stats) for name, stats in self.phases.items()},
+            "days": self.days,
+        }
+
+    def write_report(self, path: str | Path, **metadata: Any) -> Path:
+        """Write the report (plus ``metadata``, e.g. the config) as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({**metadata, **self.to_dict()}, indent=2, default=str))
+        return path
+
+
+@contextlib.contextmanager
+def run_profiler(profiler: str | None, output_dir: str | Path) -> Generator[None]:
+    """Run the block under cProfile or pyinstrument (``profiler``), saving the result in ``output_dir``."""
+    if profiler is None:
+        yield
+        return
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if profiler == "cprofile":
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+        try:
+            yield
+        finally:
+            cprofile.disable()
+            cprofile.dump_stats(output_dir / "_run_profile.pstats")
+    elif profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError as e:
+            raise ImportError("profiler='pyinstrument' requires the pyinstrument package") from e
+        pyinstrument = Profiler()
+        pyinstrument.start()
+        try:
+            yield
+        finally:
+            pyinstrument.stop()
+            (output_dir / "_run_profile.html").write_text(pyinstrument.output_html())
+    else:
+        raise ValueError(f"Unknown profiler {profiler!r}. Expected one of {PROFILERS}")
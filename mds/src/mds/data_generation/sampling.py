@@ -0,0 +1,112 @@
+"""Precompiled samplers for the call center simulation.
+
+``PROGRAMS`` describes call reasons as nested dicts, which is convenient to read and edit but slow to sample from
+once per call. ``ReasonSampler`` compiles those dicts once into integer-coded lookup tables.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+
+def _cdf(probs: list[float]) -> np.ndarray:
+    """Normalized cumulative distribution, computed the same way ``np.random.Generator.choice`` does."""
+    cdf = np.cumsum(np.asarray(probs, dtype=np.float64))
+    cdf /= cdf[-1]
+    return cdf
+
+
+class ReasonSampler:
+    """Integer-coded (reason, sub-reason) sampler compiled from a ``programs`` dict.
+
+    Every (program, reason, sub-reason) combination gets an integer "leaf" code. Reason names, sub-reason names and
+    duration parameters are stored in arrays indexed by leaf code, so a drawn leaf resolves to its attributes in O(1).
+
+    Two sampling paths are provided:
+        * ``sample`` draws a single leaf with two uniforms (reason, then sub-reason). It consumes the generator
+          exactly like the original ``rng.choice`` over the nested dicts, so the loop engine output is unchanged.
+        * ``sample_many`` draws N leaves for one or more programs with a single uniform per sample, using a
+          flattened joint (reason x sub-reason) cumulative table per program.
+    """
+
+    def __init__(self, programs: dict[str, Any]) -> None:
+        self.program_names: list[str] = list(programs.keys())
+        self.program_codes: dict[str, int] = {name: code for code, name in enumerate(self.program_names)}
+
+        leaf_reason, leaf_sub_reason, leaf_mean, leaf_std = [], [], [], []
+        self._leaf_lookup: dict[tuple[int, str, str], int] = {}
+        # Two-stage tables: reason cdf per program, then sub-reason cdf + leaf codes per (program, reason)
+        self._reason_cdfs: list[np.ndarray] = []
+        self._sub_reason_cdfs: list[list[np.ndarray]] = []
+        self._sub_reason_leaves: list[list[np.ndarray]] = []
+        # Joint tables: leaf codes + cumulative joint probability per program
+        self._program_leaves: list[np.ndarray] = []
+        self._joint_cdfs: list[np.ndarray] = []
+
+        for program_code, program in enumerate(programs.values()):
+            reasons = program["reasons"]
+            self._reason_cdfs.append(_cdf([r["prob"] for r in reasons]))
+            sub_cdfs, sub_leaves, program_leaves, joint_probs = [], [], [], []
+            for reason in reasons:
+                leaves = []
+                for sub_reason in reason["sub_reasons"]:
+                    leaf = len(leaf_reason)
+                    leaf_reason.append(reason["name"])
+                    leaf_sub_reason.append(sub_reason["name"])
+                    leaf_mean.append(sub_reason["duration_mean"])
+                    leaf_std.append(sub_reason["duration_std"])
+                    self._leaf_lookup[(program_code, reason["name"], sub_reason["name"])] = leaf
+                    leaves.append(leaf)
+                    joint_probs.append(reason["prob"] * sub_reason["prob"])
+                sub_cdfs.append(_cdf([s["prob"] for s in reason["sub_reasons"]]))
+                sub_leaves.append(np.array(leaves, dtype=np.int64))
+                program_leaves.extend(leaves)
+            self._sub_reason_cdfs.append(sub_cdfs)
+            self._sub_reason_leaves.append(sub_leaves)
+            self._program_leaves.append(np.array(program_leaves, dtype=np.int64))
+            self._joint_cdfs.append(_cdf(joint_probs))
+
+        self.reason_names = np.array(leaf_reason, dtype=object)
+        self.sub_reason_names = np.array(leaf_sub_reason, dtype=object)
+        self.duration_mean = np.array(leaf_mean, dtype=np.float64)
+        self.duration_std = np.array(leaf_std, dtype=np.float64)
+
+    def lookup(self, program_code: int, reason: str, sub_reason: str) -> int:
+        """Leaf code of a fixed (reason, sub-reason) for a program, e.g. the original call of a callback."""
+        return self._leaf_lookup[(program_code, reason, sub_reason)]
+
+    def sample(self, program_code: int, rng: np.random.Generator) -> int:
+        """Draw a single leaf code for a program (reason first, then sub-reason)."""
+        reason_idx = int(self._reason_cdfs[program_code].searchsorted(rng.random(), side="right"))
+        sub_idx = int(self._sub_reason_cdfs[program_code][reason_idx].searchsorted(rng.random(), side="right"))
+        return int(self._sub_reason_leaves[program_code][reason_idx][sub_idx])
+
+    def sample_many(
+        self, program_codes: int | np.ndarray, rng: np.random.Generator, size: int | None = None
+    ) -> np.ndarray:
+        """Draw leaf codes for many calls at once.
+
+        ``program_codes`` is either a single program code (with ``size`` samples drawn for it) or an array of
+        program codes (one sample per element).
+        """
+        if np.isscalar(program_codes):
+            program_codes = np.full(size, program_codes, dtype=np.int64)
+        uniforms = rng.random(len(program_codes))
+        leaves = np.empty(len(program_codes), dtype=np.int64)
+        for code, (program_leaves, cdf) in enumerate(zip(self._program_leaves, self._joint_cdfs, strict=True)):
+            mask = program_codes == code
+            # the final cdf entry is exactly 1.0, but guard against a uniform landing on it after rounding
+            idx = np.minimum(cdf.searchsorted(uniforms[mask], side="right"), len(cdf) - 1)
+            leaves[mask] = program_leaves[idx]
+        return leaves
+
+    def duration(self, leaf: int, rng: np.random.Generator, min_call_length: int) -> int:
+        """Draw a single call duration ~ Normal(mean, std) for a leaf, floored at ``min_call_length``."""
+        return max(min_call_length, int(rng.normal(self.duration_mean[leaf], self.duration_std[leaf])))
+
+    def durations(self, leaves: np.ndarray, rng: np.random.Generator, min_call_length: int) -> np.ndarray:
+        """Draw call durations for an array of leaf codes."""
+        drawn = rng.normal(self.duration_mean[leaves], self.duration_std[leaves]).astype(np.int64)
+        return np.maximum(min_call_length, drawn)
@@ -0,0 +1,19 @@
+import json
+
+import pytest
+
+from mds.data_generation.benchmarks import SUITES, iter_cases, run_benchmarks
+
+
+@pytest.mark.benchmark
+def test_quick_benchmark_suite(tmp_path):
+    output = tmp_path / "bench.json"
+    run_benchmarks(suite="quick", output=output)
+
+    results = json.loads(output.read_text())["results"]
+    assert len(results) == len(list(iter_cases(SUITES["quick"])))
+    for result in results:
+        assert "skipped" in result["metrics"] or result["metrics"]["seconds"] > 0
+    simulate = [r for r in results if r["benchmark"] == "simulate_call_center"]
+    assert {r["params"]["sink"] for r in simulate} == {"parquet", "duckdb"}
+    assert all(r["metrics"]["calls_per_sec"] > 0 and r["metrics"]["bytes_written"] > 0 for r in simulate)
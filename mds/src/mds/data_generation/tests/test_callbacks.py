@@ -0,0 +1,37 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from mds.data_generation.callbacks import CallbackScheduler, random_other_agent
+
+
+def test_random_other_agent_matches_filtered_draw():
+    agents = pd.DataFrame({"agent_id": range(1, 8)})
+    rng_filtered, rng_fast = np.random.default_rng(7), np.random.default_rng(7)
+
+    for _ in range(500):
+        agent_pos = int(rng_filtered.integers(0, len(agents)))
+        rng_fast.integers(0, len(agents))  # keep both streams aligned
+        agent_id = agents["agent_id"].iloc[agent_pos]
+
+        other_agents = agents[agents["agent_id"] != agent_id]
+        expected = other_agents.iloc[[rng_filtered.integers(0, len(other_agents))]]["agent_id"].item()
+        actual = agents["agent_id"].iloc[random_other_agent(rng_fast, len(agents), agent_pos)]
+        assert actual == expected != agent_id
+
+
+def test_scheduler_pops_day_buckets_in_order():
+    scheduler = CallbackScheduler()
+    day = datetime.date(2025, 1, 2)
+    scheduler.schedule(day, agent_id=1, callback={"customer_id": 10})
+    scheduler.schedule(day, agent_id=2, callback={"customer_id": 20})
+    scheduler.schedule(day, agent_id=1, callback={"customer_id": 11})
+    scheduler.schedule(day + datetime.timedelta(days=1), agent_id=1, callback={"customer_id": 12})
+    assert len(scheduler) == 4
+
+    todays = scheduler.pop_day(day)
+    assert [cb["customer_id"] for cb in todays[1]] == [10, 11]
+    assert [cb["customer_id"] for cb in todays[2]] == [20]
+    assert scheduler.pop_day(day) == {}
+    assert len(scheduler) == 1
@@ -0,0 +1,121 @@
+import datetime
+import os
+
+import pytest
+
+from mds.data_generation import call_center_simulation, profiling
+from mds.data_generation.dataset_cache import DatasetCache
+from mds.data_generation.fingerprint import read_manifest
+
+
+def _config(**overrides):
+    return call_center_simulation.SimulationConfig(
+        global_start_date=datetime.date(2025, 1, 1),
+        global_end_date=datetime.date(2025, 1, 3),
+        customers_count=20,
+        agents_count=5,
+        managers_count=2,
+    ).with_overrides(**overrides)
+
+
+def _output_bytes(run_dir):
+    files = [f for f in sorted(run_dir.rglob("*")) if f.is_file() and f.name != profiling.REPORT_FILE]
+    return {f.relative_to(run_dir): f.read_bytes() for f in files}
+
+
+def test_cache_hit_restores_identical_output_without_simulating(tmp_path, monkeypatch):
+    cache = DatasetCache(tmp_path / "cache")
+
+    def run(name, config):
+        os.makedirs(tmp_path / name / "seeds")
+        call_center_simulation.simulate_call_center(
+            simulation_config=config,
+            parquet_output_dir=str(tmp_path / name / "data"),
+            seed_output_dir=str(tmp_path / name / "seeds"),
+            dataset_cache=cache,
+        )
+        return _output_bytes(tmp_path / name)
+
+    simulated = run("first", _config())
+    assert len(cache.entries()) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("a cached config must not be simulated again")
+
+    monkeypatch.setattr(call_center_simulation, "iter_call_center", fail)
+    # these fields do not change the files, so they map to the same entry
+    assert run("second", _config(background_writes=True, output_dir="elsewhere", write_csv=False)) == simulated
+
+    with pytest.raises(AssertionError, match="must not be simulated"):
+        run("third", _config(rng_seed=124))
+
+
+def test_resuming_a_restored_run_leaves_the_cache_entry_unchanged(tmp_path):
+    cache = DatasetCache(tmp_path / "cache")
+
+    def run(name, config, resume=False):
+        os.makedirs(tmp_path / name / "seeds", exist_ok=True)
+        call_center_simulation.simulate_call_center(
+            simulation_config=config,
+            parquet_output_dir=str(tmp_path / name / "data"),
+            seed_output_dir=str(tmp_path / name / "seeds"),
+            resume=resume,
+            dataset_cache=cache,
+        )
+
+    run("first", _config())
+    (entry, _, _), *_ = cache.entries()
+    cached = _output_bytes(entry)
+
+    run("second", _config())
+    run("second", _config(global_end_date=datetime.date(2025, 1, 6)), resume=True)
+    assert read_manifest(tmp_path / "second" / "data")["last_day"] == "2025-01-06"
+    assert _output_bytes(entry) == cached
+    assert read_manifest(tmp_path / "first" / "data")["last_day"] == "2025-01-03"
+
+
+def test_runs_without_a_checkpoint_are_not_cached(tmp_path):
+    cache = DatasetCache(tmp_path / "cache")
+
+    def run(name, checkpoint):
+        os.makedirs(tmp_path / name / "seeds")
+        call_center_simulation.simulate_call_center(
+            simulation_config=_config(),
+            parquet_output_dir=str(tmp_path / name / "data"),
+            seed_output_dir=str(tmp_path / name / "seeds"),
+            checkpoint=checkpoint,
+            dataset_cache=cache,
+        )
+
+    run("first", checkpoint=False)
+    assert cache.entries() == []
+
+    run("second", checkpoint=True)
+    run("third", checkpoint=False)
+    # a restored dataset can be extended even if the run restoring it would not have saved a checkpoint
+    assert (tmp_path / "third" / "data" / "_checkpoint.pkl").exists()
+
+
+def test_eviction_drops_least_recently_used_entries(tmp_path):
+    cache = DatasetCache(tmp_path / "cache")
+    seed_dir = tmp_path / "seeds"
+    os.makedirs(seed_dir)
+    call_center_simulation.simulate_call_center(
+        simulation_config=_config(), parquet_output_dir=str(tmp_path / "data"), seed_output_dir=str(seed_dir)
+    )
+
+    configs = [_config(rng_seed=seed) for seed in (1, 2, 3)]
+    for i, config in enumerate(configs):
+        assert cache.store(cache.key(config), config, tmp_path / "data", seed_dir)
+        entry_file = cache.root / cache.key(config) / "entry.json"
+        os.utime(entry_file, (i, i))
+    # using the oldest entry makes the second one the least recently used
+    assert cache.restore(cache.key(configs[0]), tmp_path / "restored", tmp_path / "restored_seeds")
+
+    entry_size = cache.entries()[0][2]
+    cache.max_bytes = 2 * entry_size
+    assert cache.evict() == 1
+    assert {entry.name for entry, _, _ in cache.entries()} == {cache.key(configs[0]), cache.key(configs[2])}
+
+    cache.max_bytes = entry_size - 1
+    assert not cache.store(cache.key(_config()), _config(), tmp_path / "data", seed_dir)
@@ -2,10 +2,14 @@ import datetime
 import os
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 
-from mds.data_generation import call_center_simulation
+from mds.data_generation import call_center_simulation, dimensions, fingerprint, profiling, writers
+from mds.data_generation.constants import SENTINEL_END_DATE
 
 # NOTE: In Pycharm, mark the tests directory as "Test Sources Root" to make these run from the gutter
 
@@ -21,6 +25,19 @@ def test_generate_customers_determinism():
         pd.testing.assert_frame_equal(df1, different_seed_df)
 
 
+def test_generate_customers_bulk_determinism(monkeypatch):
+    monkeypatch.setattr(dimensions, "BULK_SHARD_ROWS", 40)
+    config = call_center_simulation.SimulationConfig(customers_count=100, dimension_generator="bulk")
+    df1 = config.generate_customers()
+    df2 = config.generate_customers(workers=2)
+    pd.testing.assert_frame_equal(df1, df2)
+    assert df1["customer_id"].tolist() == list(range(1, 101))
+
+    different_seed_df = config.generate_customers(random_seed=111)
+    with pytest.raises(AssertionError):
+        pd.testing.assert_frame_equal(df1, different_seed_df)
+
+
 def test_generate_agents_determinism():
     config = call_center_simulation.SimulationConfig(agents_count=10)
     df1 = config.generate_agents()
@@ -68,7 +85,33 @@ def test_agent_assignments_determinism():
     pd.testing.assert_frame_equal(agent_assignments1, agent_assignments2)
 
 
-def test_bitwise_determinism_csv_parquet(tmp_path):
+def test_agent_assignments_bulk_follows_reference_model():
+    config = call_center_simulation.SimulationConfig(agents_count=200, managers_count=7, dimension_generator="bulk")
+    agents, managers = config.generate_agents(), config.generate_managers()
+    dates = {"start_date": config.global_start_date, "end_date": config.global_end_date}
+    reference = call_center_simulation.distribute_agents_to_managers(agents=agents, managers=managers, **dates)
+    bulk = dimensions.distribute_agents_to_managers_bulk(agents=agents, managers=managers, **dates)
+    pd.testing.assert_frame_equal(bulk, dimensions.distribute_agents_to_managers_bulk(agents, managers, **dates))
+
+    assert (bulk.dtypes == reference.dtypes).all()
+    # same agent order and round-robin starting managers
+    first = bulk.groupby("agent_id", sort=False).head(1).reset_index(drop=True)
+    reference_first = reference.groupby("agent_id", sort=False).head(1).reset_index(drop=True)
+    pd.testing.assert_frame_equal(first[["agent_id", "manager_id"]], reference_first[["agent_id", "manager_id"]])
+
+    # contiguous segments from the start date to the sentinel, each changing to a different manager
+    for _, segments in bulk.groupby("agent_id"):
+        assert len(segments) <= 3
+        assert segments["effective_start"].iloc[0] == pd.Timestamp(config.global_start_date)
+        assert segments["effective_end"].iloc[-1] == pd.Timestamp(SENTINEL_END_DATE)
+        starts = segments["effective_start"].to_numpy()
+        assert (starts[1:] == segments["effective_end"].to_numpy()[:-1] + np.timedelta64(1, "D")).all()
+        assert (starts[1:] <= np.datetime64(config.global_end_date)).all()
+        assert (segments["manager_id"].to_numpy()[1:] != segments["manager_id"].to_numpy()[:-1]).all()
+
+
+@pytest.mark.parametrize("engine", call_center_simulation.ENGINES)
+def test_bitwise_determinism_csv_parquet(tmp_path, engine):
     # First run
     output_dir1 = tmp_path / "run1"
     seed_dir1 = tmp_path / "seed1"
@@ -82,6 +125,7 @@ def test_bitwise_determinism_csv_parquet(tmp_path):
             agents_count=5,
             managers_count=2,
             rng_seed=123,
+            engine=engine,
         ),
         parquet_output_dir=str(output_dir1),
         seed_output_dir=str(seed_dir1),
@@ -100,16 +144,153 @@ def test_bitwise_determinism_csv_parquet(tmp_path):
             agents_count=5,
             managers_count=2,
             rng_seed=123,
+            engine=engine,
         ),
         parquet_output_dir=str(output_dir2),
         seed_output_dir=str(seed_dir2),
     )
 
-    # Compare all files bitwise
+    # Compare all files bitwise (except the run's timing report)
     for dir1, dir2 in [(output_dir1, output_dir2), (seed_dir1, seed_dir2)]:
         for file1 in Path(dir1).rglob("*"):
-            if file1.is_file():
+            if file1.is_file() and file1.name != profiling.REPORT_FILE:
                 rel = file1.relative_to(dir1)
                 file2 = dir2 / rel
                 assert file2.exists()
                 assert file1.read_bytes() == file2.read_bytes()
+
+
+def test_parallel_output_independent_of_worker_count(tmp_path):
+    config = call_center_simulation.SimulationConfig(
+        global_start_date=datetime.date(2025, 1, 1),
+        global_end_date=datetime.date(2025, 1, 10),
+        customers_count=200,
+        agents_count=8,
+        managers_count=2,
+        rng_seed=123,
+        engine="vectorized",
+        shards=4,
+    )
+    output_dirs = []
+    for workers in (1, 3):
+        output_dir, seed_dir = tmp_path / f"run_{workers}", tmp_path / f"seed_{workers}"
+        os.makedirs(output_dir)
+        os.makedirs(seed_dir)
+        call_center_simulation.simulate_call_center(
+            simulation_config=config,
+            parquet_output_dir=str(output_dir),
+            seed_output_dir=str(seed_dir),
+            workers=workers,
+        )
+        output_dirs.append(output_dir)
+
+    files1 = sorted(f.relative_to(output_dirs[0]) for f in output_dirs[0].rglob("*.parquet"))
+    files2 = sorted(f.relative_to(output_dirs[1]) for f in output_dirs[1].rglob("*.parquet"))
+    assert files1 and files1 == files2
+    for rel in files1:
+        assert (output_dirs[0] / rel).read_bytes() == (output_dirs[1] / rel).read_bytes()
+
+
+@pytest.mark.parametrize("engine", call_center_simulation.ENGINES)
+def test_iter_call_center_matches_written_files(tmp_path, engine):
+    config = call_center_simulation.SimulationConfig(
+        global_start_date=datetime.date(2025, 1, 1),
+        global_end_date=datetime.date(2025, 1, 3),
+        customers_count=10,
+        agents_count=5,
+        managers_count=2,
+        rng_seed=123,
+        engine=engine,
+    )
+    os.makedirs(tmp_path / "seeds")
+    call_center_simulation.simulate_call_center(
+        simulation_config=config, parquet_output_dir=str(tmp_path / "data"), seed_output_dir=str(tmp_path / "seeds")
+    )
+
+    days = list(call_center_simulation.iter_call_center(config))
+    assert [day.date for day in days] == list(pd.date_range(config.global_start_date, config.global_end_date).date)
+    for day in days:
+        written = pq.read_table(tmp_path / "data" / "calls" / f"day={day.date}")
+        assert written.equals(pa.Table.from_batches([day.calls]))
+        assert all(survey_date >= day.date for survey_date in day.surveys)
+
+    survey_ids = sorted(sid for day in days for batch in day.surveys.values() for sid in batch["survey_id"].to_pylist())
+    assert survey_ids == sorted(pq.read_table(tmp_path / "data" / "surveys")["survey_id"].to_pylist())
+
+
+def _parquet_bytes(output_dir: Path) -> dict[Path, bytes]:
+    return {f.relative_to(output_dir): f.read_bytes() for f in sorted(output_dir.rglob("*.parquet"))}
+
+
+@pytest.mark.parametrize("engine", call_center_simulation.ENGINES)
+def test_extend_and_resume_match_uninterrupted_run(tmp_path, monkeypatch, engine):
+    config = call_center_simulation.SimulationConfig(
+        global_start_date=datetime.date(2025, 1, 1),
+        global_end_date=datetime.date(2025, 1, 10),
+        customers_count=50,
+        agents_count=5,
+        managers_count=2,
+        rng_seed=123,
+        engine=engine,
+    )
+
+    def run(name, run_config, **kwargs):
+        os.makedirs(tmp_path / name / "seeds", exist_ok=True)
+        call_center_simulation.simulate_call_center(
+            simulation_config=run_config,
+            parquet_output_dir=str(tmp_path / name / "data"),
+            seed_output_dir=str(tmp_path / name / "seeds"),
+            **kwargs,
+        )
+
+    run("full", config)
+    expected = _parquet_bytes(tmp_path / "full" / "data")
+    expected_manifest = fingerprint.read_manifest(tmp_path / "full" / "data")
+
+    # extend a finished run
+    run("extended", config.with_overrides(global_end_date=datetime.date(2025, 1, 6)))
+    run("extended", config, resume=True)
+    assert _parquet_bytes(tmp_path / "extended" / "data") == expected
+    assert fingerprint.read_manifest(tmp_path / "extended" / "data") == expected_manifest
+
+    # resume a run that died part-way through a day
+    write_day = writers.PartitionWriter.write_day
+
+    def crash_on_day_8(self, day):
+        if day.date == datetime.date(2025, 1, 8):
+            raise KeyboardInterrupt
+        write_day(self, day)
+
+    monkeypatch.setattr(writers.PartitionWriter, "write_day", crash_on_day_8)
+    with pytest.raises(KeyboardInterrupt):
+        run("resumed", config)
+    monkeypatch.setattr(writers.PartitionWriter, "write_day", write_day)
+    run("resumed", config, resume=True)
+    assert _parquet_bytes(tmp_path / "resumed" / "data") == expected
+    assert fingerprint.read_manifest(tmp_path / "resumed" / "data") == expected_manifest
+
+    with pytest.raises(ValueError, match="differs from the checkpointed one"):
+        run("resumed", config.with_overrides(rng_seed=1), resume=True)
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "expected"), [({}, [7, 10]), ({"checkpoint_interval": 4}, [4, 8, 10]), ({"checkpoint": False}, [])]
+)
+def test_checkpoints_every_interval_and_after_the_last_day(tmp_path, monkeypatch, kwargs, expected):
+    config = call_center_simulation.SimulationConfig(
+        global_start_date=datetime.date(2025, 1, 1),
+        global_end_date=datetime.date(2025, 1, 10),
+        customers_count=50,
+        agents_count=5,
+        managers_count=2,
+        rng_seed=123,
+        engine="vectorized",
+    )
+    saved = []
+    monkeypatch.setattr(
+        call_center_simulation, "save_checkpoint", lambda _, checkpoint: saved.append(checkpoint.last_day)
+    )
+    call_center_simulation.simulate_call_center(
+        simulation_config=config, parquet_output_dir=str(tmp_path / "data"), seed_output_dir=str(tmp_path), **kwargs
+    )
+    assert saved == [datetime.date(2025, 1, day) for day in expected]
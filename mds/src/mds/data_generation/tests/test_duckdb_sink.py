@@ -0,0 +1,135 @@
+import datetime
+
+import duckdb
+import pyarrow as pa
+import pytest
+
+from mds.data_generation.call_center_simulation import SimulationConfig, iter_call_center
+from mds.data_generation.duckdb_sink import DLT_DATASETS, DuckDBSink, sink_file_url
+
+
+@pytest.fixture
+def databases(tmp_path):
+    return {table: tmp_path / f"ingest_{table}.duckdb" for table in DLT_DATASETS}
+
+
+def _days():
+    config = SimulationConfig(
+        global_start_date=datetime.date(2025, 1, 1),
+        global_end_date=datetime.date(2025, 1, 3),
+        customers_count=10,
+        agents_count=5,
+        managers_count=2,
+        rng_seed=123,
+        engine="vectorized",
+    )
+    return list(iter_call_center(config))
+
+
+def test_sink_tables_join_to_dlt_loads(databases):
+    days = _days()
+    with DuckDBSink(databases) as sink:
+        for day in days:
+            sink.write_day(day)
+
+    expected = {
+        "calls": sum(day.calls.num_rows for day in days),
+        "crm": sum(day.crm.num_rows for day in days),
+        "surveys": sum(batch.num_rows for day in days for batch in day.surveys.values()),
+    }
+    for table, dataset in DLT_DATASETS.items():
+        with duckdb.connect(str(databases[table])) as con:
+            joined = con.sql(
+                f"SELECT count(*) FROM {dataset}.{table} s JOIN {dataset}._dlt_loads l ON s._dlt_load_id = l.load_id"
+            ).fetchone()[0]
+            assert joined == expected[table] > 0
+
+
+def test_sink_rolls_back_on_error(databases):
+    day = _days()[0]
+    with pytest.raises(RuntimeError), DuckDBSink(databases) as sink:
+        sink.write_day(day)
+        raise RuntimeError("simulation failed")
+
+    with duckdb.connect(str(databases["calls"])) as con:
+        assert con.sql("SELECT count(*) FROM raw_calls.calls").fetchone()[0] == 0
+        assert con.sql("SELECT count(*) FROM raw_calls._dlt_loads").fetchone()[0] == 0
+
+
+def test_sink_records_its_partitions_in_the_file_manifest(databases):
+    days = _days()
+    with DuckDBSink(databases) as sink:
+        for day in days:
+            sink.write_day(day)
+
+    response_dates = sorted({date for day in days for date, batch in day.surveys.items() if batch.num_rows})
+    expected = {"calls": [day.date for day in days], "crm": [day.date for day in days], "surveys": response_dates}
+    for table, dataset in DLT_DATASETS.items():
+        with duckdb.connect(str(databases[table])) as con:
+            manifest = con.sql(
+                f"SELECT file_url, partition_date, num_rows FROM {dataset}._ingested_files ORDER BY partition_date"
+            ).fetchall()
+            rows_by_file = dict(con.sql(f"SELECT _file_url, count(*) FROM {dataset}.{table} GROUP BY ALL").fetchall())
+        assert manifest == [
+            (
+                sink_file_url(table, date, sink.load_id),
+                date.isoformat(),
+                rows_by_file[sink_file_url(table, date, sink.load_id)],
+            )
+            for date in expected[table]
+        ]
+
+
+def _sunk_calls(database, load_id):
+    with duckdb.connect(str(database)) as con:
+        rows = con.sql(
+            "SELECT call_id, agent_id, _file_url FROM raw_calls.calls WHERE _dlt_load_id = ? ORDER BY call_id",
+            params=[load_id],
+        )
+        return rows.fetchall()
+
+
+def _expected_calls(day, load_id):
+    columns = day.calls.select(["call_id", "agent_id"]).to_pydict()
+    file_url = sink_file_url("calls", day.date, load_id)
+    return sorted((call_id, agent_id, file_url) for call_id, agent_id in zip(*columns.values(), strict=True))
+
+
+def test_sink_appends_to_tables_created_by_the_loaders(databases):
+    days = _days()
+    with duckdb.connect(str(databases["calls"])) as con:
+        # laid out as the bulk loader creates it: the parquet columns in file order, then _file_url and _dlt_load_id
+        con.execute("CREATE SCHEMA raw_calls")
+        con.register("_day", days[0].calls)
+        con.execute(
+            "CREATE TABLE raw_calls.calls AS SELECT * EXCLUDE (agent_id), agent_id, "
+            "'file:///data/calls/day%3D2025-01-01/part-0000-calls.parquet' AS _file_url, '1' AS _dlt_load_id FROM _day"
+        )
+    with DuckDBSink(databases) as sink:
+        sink.write_day(days[1])
+
+    assert _sunk_calls(databases["calls"], sink.load_id) == _expected_calls(days[1], sink.load_id)
+    with duckdb.connect(str(databases["calls"])) as con:
+        assert con.sql("SELECT count(*) FROM raw_calls.calls WHERE _dlt_load_id = '1'").fetchone()[0] == (
+            days[0].calls.num_rows
+        )
+
+
+def test_sink_appends_to_tables_loaded_by_dlt(databases, tmp_path):
+    dlt = pytest.importorskip("dlt")
+    days = _days()
+    calls = days[0].calls
+    pipeline = dlt.pipeline(
+        pipeline_name="filesystem_calls_source",
+        pipelines_dir=str(tmp_path / "dlt"),
+        dataset_name="raw_calls",
+        destination=dlt.destinations.duckdb(str(databases["calls"])),
+    )
+    file_url = pa.array(["file:///data/calls/day%3D2025-01-01/part-0000-calls.parquet"] * calls.num_rows)
+    pipeline.run(calls.append_column("_file_url", file_url), table_name="calls")
+    with DuckDBSink(databases) as sink:
+        sink.write_day(days[1])
+
+    assert _sunk_calls(databases["calls"], sink.load_id) == _expected_calls(days[1], sink.load_id)
+    with duckdb.connect(str(databases["calls"])) as con:
+        assert con.sql("SELECT count(*) FROM raw_calls.calls").fetchone()[0] == calls.num_rows + days[1].calls.num_rows
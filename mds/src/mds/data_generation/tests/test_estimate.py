@@ -0,0 +1,81 @@
+import datetime
+
+import pyarrow.parquet as pq
+import pytest
+
+from mds.data_generation import call_center_simulation
+from mds.data_generation.estimate import estimate_rows, estimate_run
+
+
+@pytest.mark.parametrize("engine", ["loop", "vectorized"])
+def test_estimated_rows_match_a_simulated_run(tmp_path, engine):
+    config = call_center_simulation.SimulationConfig(
+        global_start_date=datetime.date(2025, 1, 1),
+        global_end_date=datetime.date(2025, 1, 14),
+        customers_count=2_000,
+        agents_count=20,
+        managers_count=2,
+        engine=engine,
+        dimension_generator="bulk",
+    )
+    call_center_simulation.simulate_call_center(
+        config, parquet_output_dir=str(tmp_path / "data"), seed_output_dir=str(tmp_path)
+    )
+
+    estimated = estimate_rows(config)
+    for table in ("calls", "crm", "surveys"):
+        rows = sum(pq.ParquetFile(f).metadata.num_rows for f in (tmp_path / "data" / table).rglob("*.parquet"))
+        assert estimated[table] == pytest.approx(rows, rel=0.05)
+
+
+def test_scale_factor_scales_rows_linearly():
+    base = call_center_simulation.SimulationConfig.at_scale(1)
+    assert base == call_center_simulation.SimulationConfig()
+
+    scaled = call_center_simulation.SimulationConfig.at_scale(16, engine="vectorized")
+    assert (scaled.agents_count, scaled.managers_count, scaled.customers_count) == (200, 20, 240_000)
+    assert (scaled.global_end_date - scaled.global_start_date).days + 1 == 360
+    assert scaled.engine == "vectorized"
+    assert estimate_rows(scaled)["calls"] == pytest.approx(16 * estimate_rows(base)["calls"], rel=0.05)
+
+    # overrides win over the scaled values, and the horizon starts at an overridden start date
+    custom = call_center_simulation.SimulationConfig.at_scale(
+        4, agents_count=7, global_start_date=datetime.date(2026, 1, 1)
+    )
+    assert custom.agents_count == 7
+    assert custom.global_end_date == datetime.date(2026, 1, 1) + datetime.timedelta(days=179)
+
+    with pytest.raises(ValueError, match="scale_factor"):
+        call_center_simulation.SimulationConfig.at_scale(0)
+
+
+def test_runtime_projection_needs_matching_benchmark_cases():
+    config = call_center_simulation.SimulationConfig(engine="vectorized", dimension_generator="bulk")
+    assert estimate_run(config)["seconds"] is None
+
+    bench_results = {
+        "git_commit": "abc123",
+        "results": [
+            {
+                "benchmark": "simulate_call_center",
+                "params": {"engine": "vectorized", "sink": "parquet", "agents_count": 10, "customers_count": 1_000},
+                "metrics": {"seconds": 2.0, "calls": 1_000},
+            },
+            {
+                "benchmark": "generate_customers",
+                "params": {"dimension_generator": "faker", "customers_count": 1_000},
+                "metrics": {"rows": 1_000, "rows_per_sec": 1_000.0},
+            },
+            {
+                "benchmark": "generate_customers",
+                "params": {"dimension_generator": "bulk", "customers_count": 1_000},
+                "metrics": {"rows": 1_000, "rows_per_sec": 100_000.0},
+            },
+        ],
+    }
+    estimate = estimate_run(config, bench_results=bench_results)
+    # 1 ms per call once the benchmark's own 1 s of faker customers is taken out, plus the bulk customers
+    rows = estimate["rows"]
+    assert estimate["seconds"] == pytest.approx(rows["calls"] / 1_000 + rows["customers"] / 100_000)
+    assert estimate["bench_commit"] == "abc123"
+    assert estimate_run(config, sink="duckdb", bench_results=bench_results)["seconds"] is None
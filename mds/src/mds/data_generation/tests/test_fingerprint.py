@@ -0,0 +1,72 @@
+import datetime
+import os
+
+import pyarrow as pa
+
+from mds.data_generation import call_center_simulation
+from mds.data_generation.fingerprint import RunFingerprint, fingerprint_batches, read_manifest
+from mds.data_generation.writers import TABLE_SCHEMAS
+
+
+def test_fingerprint_depends_on_values_and_order_not_batching():
+    batch = pa.RecordBatch.from_pydict(
+        {
+            "crm_id": [1, 2, 3, 4],
+            "agent_id": [1, 1, 2, 2],
+            "call_id": [10, 11, 12, 13],
+            "customer_id": [5, 6, 7, 8],
+            "reason_code": ["billing", None, "tech", "tech"],
+            "sub_reason_code": ["a", "bb", "", "ccc"],
+            "previous_issue_flag": [True, False, None, True],
+            "created_ts": [0, 1_000_000, 2_000_000, None],
+        },
+        schema=TABLE_SCHEMAS["crm"],
+    )
+    rows, digest = fingerprint_batches([batch])
+    assert rows == 4
+    assert fingerprint_batches([batch.slice(0, 1), batch.slice(1, 0), batch.slice(1, 2), batch.slice(3)]) == (4, digest)
+    assert fingerprint_batches([batch.slice(2), batch.slice(0, 2)])[1] != digest
+
+    # moving bytes between adjacent strings, or a null, changes the fingerprint
+    shifted = batch.set_column(5, "sub_reason_code", pa.array(["ab", "b", "", "ccc"]))
+    assert fingerprint_batches([shifted])[1] != digest
+    null_moved = batch.set_column(4, "reason_code", pa.array(["billing", "tech", None, "tech"]))
+    assert fingerprint_batches([null_moved])[1] != digest
+
+
+def test_manifest_matches_across_sinks_and_worker_counts(tmp_path):
+    config = call_center_simulation.SimulationConfig(
+        global_start_date=datetime.date(2025, 1, 1),
+        global_end_date=datetime.date(2025, 1, 7),
+        customers_count=200,
+        agents_count=8,
+        managers_count=2,
+        rng_seed=123,
+        engine="vectorized",
+        shards=4,
+    )
+
+    def manifest(name, simulation_config, **kwargs):
+        os.makedirs(tmp_path / name / "seeds")
+        call_center_simulation.simulate_call_center(
+            simulation_config=simulation_config,
+            parquet_output_dir=str(tmp_path / name / "data"),
+            seed_output_dir=str(tmp_path / name / "seeds"),
+            **kwargs,
+        )
+        return read_manifest(tmp_path / name / "data")
+
+    parquet = manifest("parquet", config)
+    duckdb_databases = {table: tmp_path / f"ingest_{table}.duckdb" for table in ("calls", "crm", "surveys")}
+    assert manifest("duckdb", config, workers=2, sink="duckdb", duckdb_databases=duckdb_databases) == parquet
+    assert (parquet["first_day"], parquet["last_day"]) == ("2025-01-01", "2025-01-07")
+
+    expected = RunFingerprint()
+    for day in call_center_simulation.iter_call_center(config):
+        expected.add_day(day)
+    assert parquet["tables"] == expected.tables()
+    assert parquet["tables"]["calls"]["rows"] > 0
+
+    other_seed = manifest("other_seed", config.with_overrides(rng_seed=124))
+    for table in TABLE_SCHEMAS:
+        assert other_seed["tables"][table]["fingerprint"] != parquet["tables"][table]["fingerprint"]
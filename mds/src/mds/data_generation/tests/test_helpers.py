@@ -0,0 +1,45 @@
+import datetime
+
+import numpy as np
+
+from mds.data_generation.helpers import generate_csat_batch, generate_nps, generate_nps_batch, seconds_to_us
+
+
+def test_nps_batch_matches_scalar_distribution():
+    n = 20_000
+    rng = np.random.default_rng(3)
+    transfer = rng.random(n) < 0.1
+    hold_time = rng.integers(0, 300, size=n)
+    previous_issue = rng.random(n) < 0.4
+
+    batch = generate_nps_batch(np.random.default_rng(4), transfer, hold_time, previous_issue)
+    scalar_rng = np.random.default_rng(4)
+    scalar = np.array([
+        generate_nps(scalar_rng, bool(t), int(h), bool(p))
+        for t, h, p in zip(transfer, hold_time, previous_issue, strict=True)
+    ])
+
+    assert batch.dtype == np.int8
+    assert set(np.unique(batch)) == set(range(1, 11))
+    for lo, hi in [(1, 6), (7, 8), (9, 10)]:
+        batch_share = np.mean((batch >= lo) & (batch <= hi))
+        scalar_share = np.mean((scalar >= lo) & (scalar <= hi))
+        assert abs(batch_share - scalar_share) < 0.02
+
+
+def test_csat_batch_range_and_centers():
+    rng = np.random.default_rng(5)
+    transfer = np.array([False] * 5_000 + [True] * 5_000)
+    hold_time_during_call = np.full(10_000, 120)
+
+    csat = generate_csat_batch(rng, transfer, hold_time_during_call)
+    assert csat.dtype == np.int8
+    assert csat.min() >= 1 and csat.max() <= 5
+    assert csat[:5_000].mean() > csat[5_000:].mean()
+
+
+def test_seconds_to_us_rounds_like_timedelta():
+    rng = np.random.default_rng(6)
+    seconds = np.concatenate([rng.exponential(600, 50_000) + rng.integers(0, 300, 50_000), rng.random(10_000) * 1e-3])
+    for s in [*seconds.tolist(), 0.0, 0.5e-6, 1.5e-6, 2.5e-6, 12.0000005]:
+        assert seconds_to_us(s) == datetime.timedelta(seconds=s) // datetime.timedelta(microseconds=1)
@@ -0,0 +1,29 @@
+import datetime
+import json
+import pstats
+
+from mds.data_generation import call_center_simulation, profiling
+
+
+def test_run_writes_phase_report_and_cprofile_stats(tmp_path):
+    config = call_center_simulation.SimulationConfig(
+        global_start_date=datetime.date(2025, 1, 1),
+        global_end_date=datetime.date(2025, 1, 3),
+        customers_count=20,
+        agents_count=5,
+        managers_count=2,
+        background_writes=True,
+    )
+    call_center_simulation.simulate_call_center(
+        config, parquet_output_dir=str(tmp_path / "data"), seed_output_dir=str(tmp_path), profiler="cprofile"
+    )
+
+    report = json.loads((tmp_path / "data" / profiling.REPORT_FILE).read_text())
+    phases = report["phases"]
+    for phase in ["dimensions.customers", "assignments", "seeds.customers", "simulate", "write.calls", "write.surveys"]:
+        assert phases[phase]["count"] > 0
+    assert phases["dimensions.customers"]["rows"] == 20
+    assert phases["simulate"]["count"] == len(report["days"]) == 3
+    assert phases["simulate"]["rows"] == phases["write.calls"]["rows"] == sum(day["calls"] for day in report["days"])
+    assert phases["write.calls"]["bytes"] > 0
+    assert pstats.Stats(str(tmp_path / "data" / "_run_profile.pstats")).total_calls > 0
@@ -0,0 +1,32 @@
+import numpy as np
+
+from mds.data_generation.constants import PROGRAMS
+from mds.data_generation.sampling import ReasonSampler
+
+
+def test_sample_matches_nested_rng_choice():
+    """The two-stage sampler must consume the generator exactly like rng.choice over the PROGRAMS dicts."""
+    sampler = ReasonSampler(PROGRAMS)
+    rng_choice, rng_sampler = np.random.default_rng(42), np.random.default_rng(42)
+
+    for program_key, program in PROGRAMS.items():
+        for _ in range(200):
+            reasons = program["reasons"]
+            reason = rng_choice.choice(reasons, p=[r["prob"] for r in reasons])
+            sub_reason = rng_choice.choice(reason["sub_reasons"], p=[s["prob"] for s in reason["sub_reasons"]])
+
+            leaf = sampler.sample(sampler.program_codes[program_key], rng_sampler)
+            assert (sampler.reason_names[leaf], sampler.sub_reason_names[leaf]) == (reason["name"], sub_reason["name"])
+
+
+def test_sample_many_and_lookup():
+    sampler = ReasonSampler(PROGRAMS)
+    program_code = sampler.program_codes["Technical Support"]
+
+    leaves = sampler.sample_many(program_code, np.random.default_rng(1), size=50_000)
+    phone_share = np.mean(leaves == sampler.lookup(program_code, "Device Issue", "Phone"))
+    assert abs(phone_share - 0.5 * 0.55) < 0.01
+
+    leaf = sampler.lookup(program_code, "Login Issue", "Forgot Password")
+    assert (sampler.reason_names[leaf], sampler.sub_reason_names[leaf]) == ("Login Issue", "Forgot Password")
+    assert sampler.duration_mean[leaf] == 180
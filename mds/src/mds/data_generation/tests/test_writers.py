@@ -0,0 +1,121 @@
+import datetime
+import pathlib
+
+import pyarrow.parquet as pq
+import pytest
+
+from mds.data_generation import call_center_simulation
+from mds.data_generation.writers import SEED_SCHEMAS, TABLE_SCHEMAS, PartitionWriter, compact_partitions
+
+
+def _crm_rows(n: int) -> list[dict]:
+    created = datetime.datetime(2025, 1, 1, 9, tzinfo=datetime.UTC)
+    return [
+        {
+            "crm_id": i,
+            "agent_id": 1,
+            "call_id": i,
+            "customer_id": 2,
+            "reason_code": "Billing",
+            "sub_reason_code": "Refund",
+            "previous_issue_flag": False,
+            "created_ts": created,
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_part_numbers_continue_after_existing_files(tmp_path, background):
+    day = datetime.date(2025, 1, 1)
+    PartitionWriter(tmp_path).write("crm", day, _crm_rows(2))
+
+    with PartitionWriter(tmp_path, background=background) as writer:
+        writer.write("crm", day, _crm_rows(3))
+        writer.write("crm", day, _crm_rows(0))  # empty data writes nothing
+        writer.write("crm", day, _crm_rows(1))
+
+    day_dir = tmp_path / "crm" / "day=2025-01-01"
+    assert sorted(f.name for f in day_dir.iterdir()) == [f"part-{i:04d}-crm.parquet" for i in range(3)]
+    assert (writer.files_written, writer.rows_written) == (2, 4)
+    assert pq.read_schema(day_dir / "part-0001-crm.parquet").equals(TABLE_SCHEMAS["crm"])
+
+
+def test_unknown_compression_is_rejected_up_front():
+    assert call_center_simulation.SimulationConfig(parquet_compression="zstd").parquet_compression == "zstd"
+    with pytest.raises(ValueError, match="Unknown parquet compression"):
+        call_center_simulation.SimulationConfig(parquet_compression="zstandard")
+
+
+def test_background_errors_are_raised_on_close(tmp_path):
+    (tmp_path / "crm").write_text("not a directory")
+    writer = PartitionWriter(tmp_path, background=True)
+    writer.write("crm", datetime.date(2025, 1, 1), _crm_rows(1))
+    with pytest.raises(RuntimeError, match="Background parquet write failed"):
+        writer.close()
+
+
+def test_buffered_partitions_flush_as_one_file(tmp_path):
+    day = datetime.date(2025, 1, 1)
+    next_day = day + datetime.timedelta(days=1)
+    with PartitionWriter(tmp_path) as writer:
+        writer.buffer("crm", day, _crm_rows(2))
+        writer.buffer("crm", next_day, _crm_rows(1))
+        writer.buffer("crm", day, _crm_rows(3))
+        writer.flush(before=next_day)
+        assert writer.files_written == 1
+    assert writer.files_written == 2  # close flushes the rest
+    assert pq.read_table(tmp_path / "crm" / "day=2025-01-01" / "part-0000-crm.parquet").num_rows == 5
+
+
+def test_compact_partitions_skips_other_files(tmp_path):
+    day = datetime.date(2025, 1, 1)
+    with PartitionWriter(tmp_path) as writer:
+        for n in (1, 2, 3):
+            writer.write("crm", day, _crm_rows(n))
+    day_dir = tmp_path / "crm" / "day=2025-01-01"
+    dup = day_dir / "part-0000-crm_dup.parquet"
+    dup.write_bytes((day_dir / "part-0000-crm.parquet").read_bytes())
+
+    assert compact_partitions(tmp_path) == 1
+    assert sorted(f.name for f in day_dir.iterdir()) == ["part-0000-crm.parquet", "part-0000-crm_dup.parquet"]
+    assert pq.read_table(day_dir / "part-0000-crm.parquet").num_rows == 6
+    assert compact_partitions(tmp_path) == 0
+
+
+def test_interrupted_compaction_keeps_the_merged_rows(tmp_path, monkeypatch):
+    day = datetime.date(2025, 1, 1)
+    with PartitionWriter(tmp_path) as writer:
+        for n in (1, 2, 3):
+            writer.write("crm", day, _crm_rows(n))
+
+    def crash(path, missing_ok=False):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(pathlib.Path, "unlink", crash)
+    with pytest.raises(KeyboardInterrupt):
+        compact_partitions(tmp_path)
+    assert pq.read_table(tmp_path / "crm" / "day=2025-01-01" / "part-0000-crm.parquet").num_rows == 6
+
+
+@pytest.mark.parametrize("dimension_generator", ["faker", "bulk"])
+def test_parquet_seeds_are_typed(tmp_path, dimension_generator):
+    config = call_center_simulation.SimulationConfig(
+        global_start_date=datetime.date(2025, 1, 1),
+        global_end_date=datetime.date(2025, 1, 2),
+        customers_count=20,
+        agents_count=5,
+        managers_count=2,
+        dimension_generator=dimension_generator,
+        seed_format="parquet",
+    )
+    call_center_simulation.simulate_call_center(
+        config, parquet_output_dir=str(tmp_path / "data"), seed_output_dir=str(tmp_path)
+    )
+
+    assert not list(tmp_path.glob("*.csv"))
+    for name, schema in SEED_SCHEMAS.items():
+        assert pq.read_schema(tmp_path / f"{name}.parquet").equals(schema)
+    customers = pq.read_table(tmp_path / "customers.parquet")
+    assert customers.num_rows == 20
+    assert all(len(zip_code) == 5 for zip_code in customers["zip_code"].to_pylist())
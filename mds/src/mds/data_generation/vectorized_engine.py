@@ -0,0 +1,379 @@
+"""Vectorized simulation engine for ``simulate_call_center``.
+
+The reference ("loop") engine in ``call_center_simulation.py`` produces every call through a per-call Python loop.
+This engine instead draws every random variable for an entire day across all agents as NumPy arrays, computes
+start/end times with cumulative sums, and truncates each agent's day at ``workday_end`` with a vectorized mask.
+
+Determinism contract:
+    * For a given ``SimulationConfig`` (including ``rng_seed``) and NumPy version, the vectorized engine produces
+      identical output on every run and platform. All randomness comes from a single ``np.random.Generator`` seeded
+      with ``rng_seed`` and consumed one day at a time, in a fixed order of draws within each day.
+    * The output is statistically equivalent to, but NOT row-for-row identical with, the loop engine. Draws happen
+      per variable instead of per call, and customer availability is checked against the busy-until state at the
+      start of each workday rather than at each call's start time.
+    * NumPy does not guarantee ``Generator`` streams across versions, so a NumPy upgrade may change the output.
+
+Parallel mode (``SimulationConfig.shards > 1``):
+    * Agents and customers are split into ``shards`` contiguous, independent partitions. Each shard is simulated with
+      its own child stream from ``np.random.SeedSequence(rng_seed).spawn(shards)``. A customer is only ever called by
+      agents of their own shard, and callbacks are handed to another agent in the same shard.
+    * Shards are simulated in blocks of ``PARALLEL_BLOCK_DAYS`` days, one ``ProcessPoolExecutor`` task per shard and
+      block. Each task returns the shard's carry-over state (generator, customer availability, pending callbacks),
+      which seeds the shard's next block.
+    * Reconciliation happens per day in the parent process: shard outputs are concatenated in shard order (which is
+      agent order) and call/crm/survey ids are assigned sequentially from there.
+    * The output therefore depends on ``shards`` but is byte-identical for any number of workers, including the
+      in-process ``workers=1`` path.
+"""
+
+from __future__ import annotations
+
+import calendar
+import datetime
+import logging
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from mds.data_generation.customer_store import CustomerStore
+from mds.data_generation.helpers import (
+    US_PER_DAY,
+    US_PER_SECOND,
+    epoch_day_to_date,
+    epoch_us,
+    generate_csat_batch,
+    generate_nps_batch,
+)
+from mds.data_generation.writers import DayBatches, to_record_batch
+
+if TYPE_CHECKING:
+    from mds.data_generation.call_center_simulation import SimulationConfig
+
+logger = logging.getLogger(__name__)
+
+# Days simulated per shard task in parallel mode; bounds parent memory to one block of output
+PARALLEL_BLOCK_DAYS = 7
+
+
+@dataclass
+class ShardState:
+    """Carry-over state of one independently simulated (agents, customers) partition."""
+
+    agent_ids: np.ndarray
+    customer_store: CustomerStore
+    rng: np.random.Generator
+    # key = callback day ordinal, value = list of (agent position, customer position, leaf code) array triples
+    pending_callbacks: dict[int, list[tuple[np.ndarray, np.ndarray, np.ndarray]]] = field(default_factory=dict)
+
+
+@dataclass
+class VectorizedState:
+    """Carry-over state of the vectorized engine between days (checkpointed by ``simulate_call_center``).
+
+    ``next_day`` is the first day not yet reflected in ``shards``. In parallel mode shards advance a block at a time,
+    so it only equals "yielded day + 1" after the last day of each block.
+    """
+
+    next_day: datetime.date
+    shards: list[ShardState]
+    call_id: int = 0
+    crm_id: int = 0
+    survey_id: int = 0
+
+
+@dataclass
+class DayArrays:
+    """Columnar output of one shard-day, before ids are assigned.
+
+    ``calls`` holds one entry per call (the crm record shares the same row); ``surveys`` refers to its call through
+    ``call_row``, a row position into ``calls``.
+    """
+
+    calls: dict[str, np.ndarray]
+    surveys: dict[str, np.ndarray]
+
+
+def initial_vectorized_state(
+    simulation_config: SimulationConfig, agents: pd.DataFrame, customers: pd.DataFrame
+) -> VectorizedState:
+    program_codes = simulation_config.reason_sampler.program_codes
+    available_from_us = epoch_us(simulation_config.global_start_date)
+
+    if simulation_config.shards == 1:
+        rngs = [np.random.default_rng(simulation_config.rng_seed)]
+    else:
+        seed_sequences = np.random.SeedSequence(simulation_config.rng_seed).spawn(simulation_config.shards)
+        rngs = [np.random.default_rng(seed_sequence) for seed_sequence in seed_sequences]
+
+    agent_bounds = np.linspace(0, len(agents), simulation_config.shards + 1).astype(int)
+    customer_bounds = np.linspace(0, len(customers), simulation_config.shards + 1).astype(int)
+    shards = [
+        ShardState(
+            agent_ids=agents["agent_id"].iloc[agent_bounds[i] : agent_bounds[i + 1]].to_numpy(dtype=np.int64),
+            customer_store=CustomerStore.from_frame(
+                customers.iloc[customer_bounds[i] : customer_bounds[i + 1]],
+                program_codes=program_codes,
+                available_from_us=available_from_us,
+            ),
+            rng=rng,
+        )
+        for i, rng in enumerate(rngs)
+    ]
+    return VectorizedState(next_day=simulation_config.global_start_date, shards=shards)
+
+
+def simulate_day(simulation_config: SimulationConfig, state: ShardState, day_date: datetime.date) -> DayArrays:
+    """Simulate one day for one shard, advancing its state in place."""
+    rng, customer_store, pending_callbacks = state.rng, state.customer_store, state.pending_callbacks
+    sampler = simulation_config.reason_sampler
+    n_agents = len(state.agent_ids)
+    workday_start_us = simulation_config.workday_start * 3600 * US_PER_SECOND
+    midnight_us = epoch_us(day_date)
+    days_in_month = calendar.monthrange(day_date.year, day_date.month)[1]
+
+    weekday_mult = simulation_config.weekday_multipliers[day_date.weekday()]
+    seasonal_mult = 1 + simulation_config.seasonality_amplitude * np.cos(2 * np.pi * (day_date.day / days_in_month))
+    volume_mult = weekday_mult * seasonal_mult
+    n_calls = int(simulation_config.calls_per_agent_per_day * volume_mult)
+
+    # --- Work items: n_calls new calls per agent plus the callbacks scheduled for today ---
+    callbacks = pending_callbacks.pop(day_date.toordinal(), [])
+    cb_agents, cb_customers, cb_leaves = (
+        (np.concatenate(parts) for parts in zip(*callbacks, strict=True))
+        if callbacks
+        else (np.empty(0, dtype=np.int64) for _ in range(3))
+    )
+    n_new = n_agents * n_calls
+    item_agent = np.concatenate([np.repeat(np.arange(n_agents), n_calls), cb_agents])
+    is_callback = np.concatenate([np.zeros(n_new, dtype=bool), np.ones(len(cb_agents), dtype=bool)])
+
+    # Pick customers and call reasons for new calls; callbacks keep their customer and (reason, sub-reason)
+    new_customers = customer_store.draw_free(rng, size=n_new, at_us=midnight_us + workday_start_us)
+    new_leaves = sampler.sample_many(customer_store.program_codes[new_customers], rng)
+    item_customer = np.concatenate([new_customers, cb_customers])
+    item_leaf = np.concatenate([new_leaves, cb_leaves])
+
+    # Shuffle each agent's work items, then lay them out on an (agent, sequence) grid
+    order = np.lexsort((rng.random(len(item_agent)), item_agent))
+    item_agent, item_customer, item_leaf, is_callback = (
+        item_agent[order],
+        item_customer[order],
+        item_leaf[order],
+        is_callback[order],
+    )
+    items_per_agent = np.bincount(item_agent, minlength=n_agents)
+    row_start = np.concatenate([[0], np.cumsum(items_per_agent)[:-1]])
+    item_seq = np.arange(len(item_agent)) - row_start[item_agent]
+    grid_shape = (n_agents, int(items_per_agent.max(initial=0)))
+
+    # --- Per-item draws ---
+    n_items = len(item_agent)
+    queue_hold = np.clip(rng.normal(45, 20, size=n_items), 0, 300).astype(np.int64)
+    inter_arrival = rng.exponential(scale=simulation_config.mean_seconds_between_calls, size=n_items)
+    duration = sampler.durations(item_leaf, rng, simulation_config.min_call_length)
+    previous_issue = is_callback & (rng.random(n_items) < simulation_config.previous_issue_rate)
+
+    # --- Start/end times via cumulative sums along each agent's row ---
+    gap_grid = np.zeros(grid_shape)
+    gap_grid[item_agent, item_seq] = queue_hold + inter_arrival
+    duration_grid = np.zeros(grid_shape, dtype=np.int64)
+    duration_grid[item_agent, item_seq] = duration
+    start_offset_s = np.cumsum(gap_grid, axis=1) + np.cumsum(duration_grid, axis=1) - duration_grid
+    start_us = midnight_us + workday_start_us + np.round(start_offset_s * US_PER_SECOND).astype(np.int64)
+    end_us = start_us + duration_grid * US_PER_SECOND
+
+    # An agent stops taking work items at the first call that ends after the workday
+    in_workday = ((end_us - midnight_us) // (3600 * US_PER_SECOND)) % 24 < simulation_config.workday_end
+    keep_grid = np.logical_and.accumulate(in_workday, axis=1)
+    keep = keep_grid[item_agent, item_seq]
+
+    agent_pos = item_agent[keep]
+    customer_pos = item_customer[keep]
+    leaf = item_leaf[keep]
+    callback_item = is_callback[keep]
+    queue_hold, duration, previous_issue = queue_hold[keep], duration[keep], previous_issue[keep]
+    call_start_us = start_us[item_agent[keep], item_seq[keep]]
+    call_end_us = end_us[item_agent[keep], item_seq[keep]]
+    n_kept = len(agent_pos)
+
+    transfer = rng.random(n_kept) < simulation_config.transfer_rate
+    hold_time_during_call = rng.integers(0, duration // 2, endpoint=True)
+
+    calls = {
+        "agent_id": state.agent_ids[agent_pos],
+        "customer_id": customer_store.customer_ids[customer_pos],
+        "queue_hold_time": queue_hold,
+        "start_us": call_start_us,
+        "end_us": call_end_us,
+        "duration_s": duration,
+        "hold_time_during_call_s": hold_time_during_call,
+        "transfer_flag": transfer,
+        "leaf": leaf,
+        "previous_issue_flag": previous_issue,
+    }
+
+    # --- Surveys ---
+    surveyed = rng.random(n_kept) < simulation_config.survey_rate
+    n_surveys = int(surveyed.sum())
+    response_us = (
+        call_end_us[surveyed]
+        + rng.integers(15, 60, endpoint=True, size=n_surveys) * US_PER_SECOND
+        + rng.integers(0, 4, endpoint=True, size=n_surveys) * US_PER_DAY
+    )
+    csat = generate_csat_batch(rng, transfer[surveyed], hold_time_during_call[surveyed])
+    nps = generate_nps_batch(rng, transfer[surveyed], queue_hold[surveyed], previous_issue[surveyed])
+    surveys = {
+        "call_row": np.flatnonzero(surveyed),
+        "sent_us": call_end_us[surveyed] + 5 * US_PER_SECOND,
+        "response_us": response_us,
+        "csat": csat,
+        "nps": nps,
+    }
+
+    # --- Callbacks for new calls, handled by a random other agent ---
+    scheduled = ~callback_item & (rng.random(n_kept) < simulation_config.callback_rate)
+    days_out = rng.integers(1, 6, endpoint=True, size=int(scheduled.sum()))
+    other_agent = rng.integers(0, n_agents - 1, size=len(days_out))
+    other_agent += other_agent >= agent_pos[scheduled]
+    # scheduled even past global_end_date, so that extending the date range reproduces an uninterrupted run
+    future_day = day_date.toordinal() + days_out
+
+    customer_store.busy_until_us[customer_pos] = call_end_us
+    for callback_day in np.unique(future_day):
+        on_day = future_day == callback_day
+        pending_callbacks.setdefault(int(callback_day), []).append((
+            other_agent[on_day],
+            customer_pos[scheduled][on_day],
+            leaf[scheduled][on_day],
+        ))
+        # reserve the customer until the callback day starts (prevents being chosen before)
+        customer_store.busy_until_us[customer_pos[scheduled][on_day]] = epoch_us(
+            datetime.date.fromordinal(int(callback_day))
+        )
+
+    return DayArrays(calls=calls, surveys=surveys)
+
+
+def _simulate_shard_block(
+    simulation_config: SimulationConfig, state: ShardState, days: list[datetime.date]
+) -> tuple[ShardState, list[DayArrays]]:
+    """Process pool task: simulate consecutive days for one shard and hand back its carry-over state."""
+    return state, [simulate_day(simulation_config, state, day_date) for day_date in days]
+
+
+def _merge_shards(results: list[DayArrays]) -> DayArrays:
+    """Concatenate shard outputs for one day in shard order, re-pointing survey rows at the merged calls."""
+    if len(results) == 1:
+        return results[0]
+    call_offsets = np.cumsum([0] + [len(r.calls["agent_id"]) for r in results[:-1]])
+    calls = {key: np.concatenate([r.calls[key] for r in results]) for key in results[0].calls}
+    surveys = {key: np.concatenate([r.surveys[key] for r in results]) for key in results[0].surveys}
+    surveys["call_row"] = np.concatenate([
+        r.surveys["call_row"] + offset for r, offset in zip(results, call_offsets, strict=True)
+    ])
+    return DayArrays(calls=calls, surveys=surveys)
+
+
+def _iter_simulated_days(
+    simulation_config: SimulationConfig, state: VectorizedState, workers: int
+) -> Iterator[tuple[datetime.date, DayArrays]]:
+    days = [day.date() for day in pd.date_range(state.next_day, simulation_config.global_end_date)]
+    shards = state.shards
+
+    if workers <= 1 or len(shards) == 1:
+        for day_date in days:
+            merged = _merge_shards([simulate_day(simulation_config, shard, day_date) for shard in shards])
+            state.next_day = day_date + datetime.timedelta(days=1)
+            yield day_date, merged
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for block_start in range(0, len(days), PARALLEL_BLOCK_DAYS):
+            block = days[block_start : block_start + PARALLEL_BLOCK_DAYS]
+            futures = [executor.submit(_simulate_shard_block, simulation_config, shard, block) for shard in shards]
+            results = [future.result() for future in futures]
+            shards[:] = [shard for shard, _ in results]
+            state.next_day = block[-1] + datetime.timedelta(days=1)
+            for i, day_date in enumerate(block):
+                yield day_date, _merge_shards([day_results[i] for _, day_results in results])
+
+
+def iter_days_vectorized(
+    simulation_config: SimulationConfig, state: VectorizedState, workers: int = 1
+) -> Iterator[DayBatches]:
+    """Simulate the days from ``state.next_day`` to ``global_end_date``, yielding one day at a time.
+
+    ``state`` is advanced in place. Record batches are built straight from the NumPy columns (timestamps as epoch
+    microseconds), without a DataFrame in between. ``workers`` only controls how many processes simulate shards
+    concurrently; it never changes the output.
+    """
+    sampler = simulation_config.reason_sampler
+
+    for day_date, day in _iter_simulated_days(simulation_config, state, workers):
+        logger.info(f"Simulation start for day: {day_date}")
+        logger.info(f"calls: {state.call_id}")
+        logger.info(f"crm: {state.crm_id}")
+        logger.info(f"survey: {state.survey_id}")
+        calls, surveys = day.calls, day.surveys
+        n_calls, n_surveys = len(calls["agent_id"]), len(surveys["call_row"])
+
+        call_ids = state.call_id + 1 + np.arange(n_calls, dtype=np.int64)
+        crm_ids = state.crm_id + 1 + np.arange(n_calls, dtype=np.int64)
+        state.call_id += n_calls
+        state.crm_id += n_calls
+
+        call_row = surveys["call_row"]
+        survey_columns = {
+            "survey_id": state.survey_id + 1 + np.arange(n_surveys, dtype=np.int64),
+            "call_id": call_ids[call_row],
+            "agent_id": calls["agent_id"][call_row],
+            "customer_id": calls["customer_id"][call_row],
+            "sent_ts": surveys["sent_us"],
+            "response_ts": surveys["response_us"],
+            # scores are generated as int8; to_record_batch casts them to the int64 columns the loop engine writes
+            "csat": surveys["csat"],
+            "nps": surveys["nps"],
+        }
+        state.survey_id += n_surveys
+        response_day = surveys["response_us"] // US_PER_DAY
+
+        yield DayBatches(
+            date=day_date,
+            calls=to_record_batch(
+                "calls",
+                {
+                    "call_id": call_ids,
+                    "agent_id": calls["agent_id"],
+                    "customer_id": calls["customer_id"],
+                    "queue_hold_time": calls["queue_hold_time"],
+                    "start_ts": calls["start_us"],
+                    "end_ts": calls["end_us"],
+                    "duration_s": calls["duration_s"],
+                    "hold_time_during_call_s": calls["hold_time_during_call_s"],
+                    "transfer_flag": calls["transfer_flag"],
+                },
+            ),
+            crm=to_record_batch(
+                "crm",
+                {
+                    "crm_id": crm_ids,
+                    "agent_id": calls["agent_id"],
+                    "call_id": call_ids,
+                    "customer_id": calls["customer_id"],
+                    "reason_code": sampler.reason_names[calls["leaf"]],
+                    "sub_reason_code": sampler.sub_reason_names[calls["leaf"]],
+                    "previous_issue_flag": calls["previous_issue_flag"],
+                    "created_ts": calls["start_us"],
+                },
+            ),
+            surveys={
+                epoch_day_to_date(survey_day): to_record_batch(
+                    "surveys", {name: values[response_day == survey_day] for name, values in survey_columns.items()}
+                )
+                for survey_day in np.unique(response_day)
+            },
+        )
@@ -0,0 +1,352 @@
+"""Parquet partition writer for the simulated source tables.
+
+Source data is laid out as ``<output_dir>/<table>/day=YYYY-MM-DD/part-NNNN-<table>.parquet``. ``PartitionWriter``
+owns an explicit Arrow schema per table (no per-file schema inference), keeps part counters in memory (each
+partition directory is listed at most once, the first time the writer touches it) and can hand the actual file
+writes to a background thread so that I/O overlaps with the simulation. Partitions that receive rows from several
+simulated days (surveys, by response date) can be buffered and flushed as a single file once they are complete.
+
+``DayBatches`` is the unit of the in-process stream (``iter_call_center``): one simulated day as record batches, and
+``PartitionWriter.write_day`` is the file-writing consumer of that stream.
+
+``compact_partitions`` merges the part files already on disk into one file per partition.
+
+``write_seed`` writes the dimension tables for dbt: CSV seeds, or typed parquet files (``SEED_SCHEMAS``) that the dbt
+project reads in place as the ``dimensions`` source.
+"""
+
+from __future__ import annotations
+
+import datetime
+import os
+import queue
+import threading
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+if TYPE_CHECKING:
+    from mds.data_generation.profiling import RunProfile
+
+TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+TABLE_SCHEMAS: dict[str, pa.Schema] = {
+    "calls": pa.schema([
+        ("call_id", pa.int64()),
+        ("agent_id", pa.int64()),
+        ("customer_id", pa.int64()),
+        ("queue_hold_time", pa.int64()),
+        ("start_ts", TIMESTAMP),
+        ("end_ts", TIMESTAMP),
+        ("duration_s", pa.int64()),
+        ("hold_time_during_call_s", pa.int64()),
+        ("transfer_flag", pa.bool_()),
+    ]),
+    "crm": pa.schema([
+        ("crm_id", pa.int64()),
+        ("agent_id", pa.int64()),
+        ("call_id", pa.int64()),
+        ("customer_id", pa.int64()),
+        ("reason_code", pa.string()),
+        ("sub_reason_code", pa.string()),
+        ("previous_issue_flag", pa.bool_()),
+        ("created_ts", TIMESTAMP),
+    ]),
+    "surveys": pa.schema([
+        ("survey_id", pa.int64()),
+        ("call_id", pa.int64()),
+        ("agent_id", pa.int64()),
+        ("customer_id", pa.int64()),
+        ("sent_ts", TIMESTAMP),
+        ("response_ts", TIMESTAMP),
+        ("csat", pa.int64()),
+        ("nps", pa.int64()),
+    ]),
+}
+
+# Dimension tables, typed as declared in call_center/seeds/properties.yml
+SEED_SCHEMAS: dict[str, pa.Schema] = {
+    "agents": pa.schema([("agent_id", pa.int64()), ("agent_name", pa.string())]),
+    "managers": pa.schema([("manager_id", pa.int64()), ("manager_name", pa.string())]),
+    "customers": pa.schema([
+        ("customer_id", pa.int64()),
+        ("first_name", pa.string()),
+        ("last_name", pa.string()),
+        ("birth_date", pa.date32()),
+        ("state", pa.string()),
+        ("zip_code", pa.string()),
+        ("program", pa.string()),
+    ]),
+    "agent_assignments": pa.schema([
+        ("agent_id", pa.int64()),
+        ("manager_id", pa.int64()),
+        ("effective_start", TIMESTAMP),
+        ("effective_end", TIMESTAMP),
+    ]),
+}
+
+# "csv" = dbt seeds; "parquet" = typed files read by dbt with read_parquet (for millions of customers)
+SEED_FORMATS = ("csv", "parquet")
+
+# Codecs pyarrow can write parquet with ("none" = uncompressed)
+PARQUET_COMPRESSIONS = ("snappy", "zstd", "gzip", "brotli", "lz4", "none")
+
+TableData = pa.RecordBatch | Sequence[Mapping[str, Any]] | Mapping[str, Any]
+
+
+def to_record_batch(table: str, data: TableData) -> pa.RecordBatch:
+    """Build a RecordBatch with the table's schema from row dicts or column buffers (lists / NumPy arrays).
+
+    Timestamp columns accept timezone-aware datetimes or int64 epoch microseconds.
+    """
+    schema = TABLE_SCHEMAS[table]
+    if isinstance(data, pa.RecordBatch):
+        return data if data.schema.equals(schema) else data.select(schema.names).cast(schema)
+    if isinstance(data, Mapping):
+        return pa.RecordBatch.from_arrays([pa.array(data[f.name], type=f.type) for f in schema], schema=schema)
+    return pa.RecordBatch.from_pylist(list(data), schema=schema)
+
+
+class ColumnBuffer:
+    """Builds a table's columns one row at a time, as Python lists that ``to_record_batch`` turns into a batch.
+
+    Keeps no per-row objects alive: a day of rows costs one list slot per value.
+    """
+
+    def __init__(self, table: str) -> None:
+        self.table = table
+        self.columns: dict[str, list] = {name: [] for name in TABLE_SCHEMAS[table].names}
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values())))
+
+    def append(self, **row: Any) -> None:
+        for name, values in self.columns.items():
+            values.append(row[name])
+
+    def to_record_batch(self) -> pa.RecordBatch:
+        return to_record_batch(self.table, self.columns)
+
+
+@dataclass(frozen=True)
+class DayBatches:
+    """Output of one simulated day, with ``TABLE_SCHEMAS`` schemas.
+
+    Surveys are partitioned by response date, which is the call date or up to four days later, so they are keyed by
+    response date. A response date can therefore appear in several consecutive days' batches.
+    """
+
+    date: datetime.date
+    calls: pa.RecordBatch
+    crm: pa.RecordBatch
+    surveys: dict[datetime.date, pa.RecordBatch]
+
+    @property
+    def num_rows(self) -> int:
+        return self.calls.num_rows + self.crm.num_rows + sum(batch.num_rows for batch in self.surveys.values())
+
+
+def write_seed(df: pd.DataFrame, seed_output_dir: str | Path, name: str, seed_format: str = "csv") -> Path:
+    """Write a dimension table to ``<seed_output_dir>/<name>.<seed_format>``."""
+    path = Path(seed_output_dir) / f"{name}.{seed_format}"
+    if seed_format == "csv":
+        df.to_csv(path, index=False, header=True)
+    elif seed_format == "parquet":
+        schema = SEED_SCHEMAS[name]
+        columns = [pa.array(df[f.name], from_pandas=True).cast(f.type) for f in schema]
+        pq.write_table(pa.Table.from_arrays(columns, schema=schema), path)
+    else:
+        raise ValueError(f"Unknown seed format {seed_format!r}. Expected one of {SEED_FORMATS}")
+    return path
+
+
+def partition_dir(output_dir: str | Path, table: str, date: datetime.date) -> Path:
+    return Path(output_dir) / table / f"day={date.strftime('%Y-%m-%d')}"
+
+
+def existing_part_numbers(day_dir: Path, table: str) -> list[int]:
+    """Part numbers of the ``part-NNNN-<table>.parquet`` files already in a partition directory."""
+    if not day_dir.exists():
+        return []
+    return [
+        int(f.name.split("-")[1])
+        for f in day_dir.glob(f"part-*-{table}.parquet")
+        if f.name.startswith("part-") and f.name.split("-")[1].isdigit()
+    ]
+
+
+class PartitionWriter:
+    """Appends record batches to day-partitioned parquet files, one new part file per ``write`` call.
+
+    Args:
+        output_dir: Root directory; files go to ``<output_dir>/<table>/day=YYYY-MM-DD/``.
+        compression: Parquet compression codec (e.g. "snappy", "zstd", "none").
+        row_group_size: Maximum rows per parquet row group (None = one row group per file).
+        background: Write files on a background thread. Errors are re-raised on the next ``write`` or ``close``.
+        max_pending: Maximum number of batches queued for the background thread before ``write`` blocks.
+        profile: Records the time, rows and bytes of every file write as phase ``write.<table>``.
+    """
+
+    def __init__(
+        self,
+        output_dir: str | Path,
+        compression: str = "snappy",
+        row_group_size: int | None = None,
+        background: bool = False,
+        max_pending: int = 8,
+        profile: RunProfile | None = None,
+    ) -> None:
+        self.output_dir = Path(output_dir)
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.profile = profile
+        self.files_written = 0
+        self.rows_written = 0
+        self.bytes_written = 0
+        self._next_part: dict[tuple[str, datetime.date], int] = {}
+        self._buffered: dict[tuple[str, datetime.date], list[pa.RecordBatch]] = {}
+        self._error: BaseException | None = None
+        self._queue: queue.Queue | None = None
+        self._thread: threading.Thread | None = None
+        if background:
+            self._queue = queue.Queue(maxsize=max_pending)
+            self._thread = threading.Thread(target=self._drain, name="parquet-partition-writer", daemon=True)
+            self._thread.start()
+
+    def __enter__(self) -> PartitionWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, table: str, date: datetime.date, data: TableData) -> Path | None:
+        """Write ``data`` as the next part file of the (table, date) partition. Empty data writes nothing."""
+        self._raise_pending_error()
+        batch = to_record_batch(table, data)
+        if batch.num_rows == 0:
+            return None
+        return self._write_part(table, date, pa.Table.from_batches([batch]))
+
+    def write_day(self, day: DayBatches) -> None:
+        """Write one simulated day: calls and crm as that day's part files, surveys buffered by response date."""
+        # responses are never dated before their call, so survey partitions before this day are complete
+        self.flush(before=day.date)
+        self.write("calls", day.date, day.calls)
+        self.write("crm", day.date, day.crm)
+        for response_date, surveys in day.surveys.items():
+            self.buffer("surveys", response_date, surveys)
+
+    def buffer(self, table: str, date: datetime.date, data: TableData) -> None:
+        """Hold ``data`` for the (table, date) partition until ``flush``, which writes it all as one part file."""
+        batch = to_record_batch(table, data)
+        if batch.num_rows > 0:
+            self._buffered.setdefault((table, date), []).append(batch)
+
+    def flush(self, before: datetime.date | None = None) -> None:
+        """Write the buffered partitions dated strictly before ``before`` (all of them if None), one file each."""
+        self._raise_pending_error()
+        for key in sorted(k for k in self._buffered if before is None or k[1] < before):
+            table, date = key
+            self._write_part(table, date, pa.Table.from_batches(self._buffered.pop(key)))
+
+    def buffered(self) -> dict[tuple[str, datetime.date], list[pa.RecordBatch]]:
+        """Batches held by ``buffer`` and not flushed yet, keyed by (table, date)."""
+        return {key: list(batches) for key, batches in self._buffered.items()}
+
+    def sync(self) -> None:
+        """Block until every file handed to the background thread so far is on disk."""
+        if self._queue is not None:
+            self._queue.join()
+        self._raise_pending_error()
+
+    def close(self) -> None:
+        """Flush buffered partitions and queued background writes, then stop the writer thread."""
+        self.flush()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._raise_pending_error()
+
+    def _write_part(self, table: str, date: datetime.date, data: pa.Table) -> Path:
+        day_dir = partition_dir(self.output_dir, table, date)
+        key = (table, date)
+        if key not in self._next_part:
+            self._next_part[key] = max(existing_part_numbers(day_dir, table), default=-1) + 1
+        part = self._next_part[key]
+        self._next_part[key] += 1
+        path = day_dir / f"part-{part:04d}-{table}.parquet"
+
+        if self._queue is not None:
+            self._queue.put((table, path, data))
+        else:
+            self._write_file(table, path, data)
+        return path
+
+    def _write_file(self, table: str, path: Path, data: pa.Table) -> None:
+        start = time.perf_counter()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(data, path, compression=self.compression, row_group_size=self.row_group_size)
+        size = path.stat().st_size
+        self.files_written += 1
+        self.rows_written += data.num_rows
+        self.bytes_written += size
+        if self.profile is not None:
+            self.profile.record(f"write.{table}", time.perf_counter() - start, rows=data.num_rows, bytes=size)
+
+    def _drain(self) -> None:
+        while (item := self._queue.get()) is not None:
+            if self._error is None:
+                try:
+                    self._write_file(*item)
+                except BaseException as e:  # surfaced to the simulation thread on its next call
+                    self._error = e
+            self._queue.task_done()
+        self._queue.task_done()
+
+    def _raise_pending_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("Background parquet write failed") from error
+
+
+def compact_partitions(
+    output_dir: str | Path,
+    tables: Sequence[str] = tuple(TABLE_SCHEMAS),
+    compression: str = "snappy",
+) -> int:
+    """Merge the ``part-NNNN-<table>.parquet`` files of each partition into a single ``part-0000`` file.
+
+    Other files in the partition (e.g. the ``_dup`` copies made by ``mds inject-duplicates``) are left alone. The
+    merged file is written under a temporary name first and only replaces the parts once it is complete: it is
+    moved over ``part-0000`` before the other parts are removed, so an interrupted compaction can leave parts whose
+    rows are also in the merged file, but never loses a partition's data.
+
+    Returns:
+        The number of partitions that were compacted.
+    """
+    compacted = 0
+    for table in tables:
+        table_dir = Path(output_dir) / table
+        if not table_dir.exists():
+            continue
+        for day_dir in sorted(d for d in table_dir.iterdir() if d.is_dir() and d.name.startswith("day=")):
+            parts = [day_dir / f"part-{n:04d}-{table}.parquet" for n in sorted(existing_part_numbers(day_dir, table))]
+            if len(parts) < 2:
+                continue
+            merged = pa.concat_tables([pq.read_table(p, schema=TABLE_SCHEMAS.get(table)) for p in parts])
+            tmp_path = day_dir / f".compact-{table}.parquet.tmp"
+            pq.write_table(merged, tmp_path, compression=compression)
+            first = day_dir / f"part-0000-{table}.parquet"
+            os.replace(tmp_path, first)
+            for p in parts:
+                if p != first:
+                    p.unlink()
+            compacted += 1
+    return compacted